@@ -1,23 +1,48 @@
+import asyncio
 import json
 import os
 from pathlib import Path
-from sqlmodel import Session, select
+from sqlmodel.ext.asyncio.session import AsyncSession
 from fastapi import HTTPException, status, BackgroundTasks
 
-from src.models.video import Video
 from src.models.transcript import Transcript
 from src.models.audio import Audio
 from src.utils.filesystem import (
     get_transcript_path, get_audio_path, get_ko_audio_path,
-    get_video_transcript_dir, get_video_audio_dir
+    get_video_transcript_dir, get_video_audio_dir, read_json, write_json
 )
-from src.utils.media import extract_audio, get_audio_duration
-from src.services.openai_service import transcribe_audio, translate_text, answer_question
-from src.services.tts_service import generate_tts, generate_tts_for_segments
+from src.utils.media import extract_audio
+from src.services.openai_service import (
+    transcribe_audio, translate_text, answer_question, model_tag, WHISPER_MODEL, CHAT_MODEL
+)
+from src.services.tts_service import generate_tts, generate_tts_for_segments, engine_tag
+from src.services.artifact_cache import (
+    artifact_cache, artifact_key, hash_json, AUDIO, TRANSCRIPT, TRANSLATION, TTS
+)
+from src.services.search_index import search_indexer
+from src.services.media_probe import media_probe
 from src.controllers.video_controller import update_video_processing_status
+from src.core.settings import settings
+from src.db.database import session_scope
+from src.repositories.common import save
+from src.repositories.videos import get_video
+from src.repositories.transcripts import get_transcript
+from src.repositories.audios import get_audio
 
 
-async def process_video_audio(db: Session, video_id: int) -> Audio:
+async def run_media_task(task, video_id: int, *args):
+    """
+    백그라운드 작업 실행 - 응답 후 닫히는 요청 세션 대신 작업 전용 세션을 사용합니다.
+
+    Args:
+        task: (db, video_id, *args)를 받는 처리 함수
+        video_id: 비디오 ID
+    """
+    async with session_scope() as db:
+        return await task(db, video_id, *args)
+
+
+async def process_video_audio(db: AsyncSession, video_id: int) -> Audio:
     """
     비디오에서 오디오를 추출하여 저장합니다.
 
@@ -29,8 +54,7 @@ async def process_video_audio(db: Session, video_id: int) -> Audio:
         Audio: 저장된 오디오 객체
     """
     # 비디오 정보 가져오기
-    statement = select(Video).where(Video.id == video_id)
-    video = db.execute(statement).scalars().first()
+    video = await get_video(db, video_id)
 
     if not video:
         raise HTTPException(
@@ -39,55 +63,48 @@ async def process_video_audio(db: Session, video_id: int) -> Audio:
         )
 
     # 이미 처리된 오디오가 있는지 확인
-    audio_statement = select(Audio).where(
-        Audio.video_id == video_id,
-        Audio.language == "ko"
-    )
-    existing_audio = db.execute(audio_statement).scalars().first()
+    existing_audio = await get_audio(db, video_id, "ko")
 
     if existing_audio and existing_audio.is_processed:
+        # 이전 버전에서 만든 행은 길이 정보가 없으므로 처음 한 번만 채움 (이후에는 stat만 비교)
+        if await media_probe.probe_audio(existing_audio):
+            return await save(db, existing_audio)
         return existing_audio
 
-    # 오디오 파일 경로 설정
-    audio_path = str(get_ko_audio_path(video_id))
+    # 오디오 파일 경로 설정 (음성 인식이 다시 디코딩하기 쉬운 무손실 모노 형식)
+    audio_path = str(get_ko_audio_path(video_id, settings.stt_audio_format))
 
-    # 비디오에서 오디오 추출
-    success = extract_audio(video.url, audio_path)
-
-    if not success:
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="오디오 추출에 실패했습니다."
-        )
-
-    # 오디오 길이 가져오기
-    duration = get_audio_duration(audio_path)
-
-    # DB에 오디오 정보 저장
-    if existing_audio:
-        # 기존 오디오 정보 업데이트
-        existing_audio.file_path = audio_path
-        existing_audio.duration = duration
-        existing_audio.is_processed = True
-        db.add(existing_audio)
-        db.commit()
-        db.refresh(existing_audio)
-        return existing_audio
-    else:
-        # 새 오디오 정보 생성
-        new_audio = Audio(
-            video_id=video_id,
-            language="ko",
-            file_path=audio_path,
-            duration=duration,
-            is_processed=True
+    # 같은 내용의 영상 파일(다른 URL/강의로 올린 경우 포함)에서 추출한 오디오가 있으면 복사해 재사용
+    video_hash = await artifact_cache.content_hash(
+        video, video.url, lambda row: media_probe.probe_video(row, video.url)
+    )
+    audio_key = video_hash and artifact_key(
+        AUDIO, video_hash, audio_format=settings.stt_audio_format, sample_rate=settings.stt_sample_rate
+    )
+    if not (audio_key and await artifact_cache.fetch_file(AUDIO, audio_key, audio_path)):
+        # 비디오에서 오디오 추출 (ffmpeg 서브프로세스, 시간 초과/취소 시 프로세스 종료)
+        success = await extract_audio(
+            video.url, audio_path, settings.stt_sample_rate, timeout=settings.audio_extract_timeout
         )
-        db.add(new_audio)
-        db.commit()
-        db.refresh(new_audio)
-        return new_audio
 
-async def process_video_transcript(db: Session, video_id: int, language: str = "ko") -> Transcript:
+        if not success:
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail="오디오 추출에 실패했습니다."
+            )
+        if audio_key:
+            await artifact_cache.store_file(AUDIO, audio_key, audio_path)
+
+    # DB에 오디오 정보 저장 (영상 행의 내용 해시/길이 정보도 함께 커밋)
+    db.add(video)
+    audio = existing_audio or Audio(video_id=video_id, language="ko", file_path=audio_path)
+    audio.file_path = audio_path
+    audio.is_processed = True
+    # 길이/코덱은 헤더에서 읽어 파일 크기·수정 시각과 함께 저장
+    await media_probe.probe_audio(audio)
+    return await save(db, audio)
+
+async def process_video_transcript(db: AsyncSession, video_id: int, language: str = "ko") -> Transcript:
     """
     비디오 자막을 생성하여 저장합니다.
 
@@ -103,11 +120,7 @@ async def process_video_transcript(db: Session, video_id: int, language: str = "
     audio = await process_video_audio(db, video_id)
 
     # 이미 처리된 자막이 있는지 확인
-    transcript_statement = select(Transcript).where(
-        Transcript.video_id == video_id,
-        Transcript.language == language
-    )
-    existing_transcript = db.execute(transcript_statement).scalars().first()
+    existing_transcript = await get_transcript(db, video_id, language)
 
     if existing_transcript and existing_transcript.is_processed:
         return existing_transcript
@@ -115,45 +128,53 @@ async def process_video_transcript(db: Session, video_id: int, language: str = "
     # 자막 파일 경로 설정
     transcript_path = str(get_transcript_path(video_id, language))
 
-    # Whisper API로 자막 생성
-    whisper_result = await transcribe_audio(audio.file_path, language if language != "ko" else None)
+    whisper_language = language if language != "ko" else None
 
-    # 자막 파일 저장
-    os.makedirs(os.path.dirname(transcript_path), exist_ok=True)
-    with open(transcript_path, "w", encoding="utf-8") as f:
-        json.dump({
+    # 같은 오디오 내용의 자막이 캐시에 있으면 Whisper를 호출하지 않음
+    audio_hash = await artifact_cache.content_hash(audio, audio.file_path, media_probe.probe_audio)
+    transcript_key = audio_hash and artifact_key(
+        TRANSCRIPT, audio_hash, model=model_tag(WHISPER_MODEL), language=whisper_language
+    )
+    transcript_data = transcript_key and await artifact_cache.fetch_json(TRANSCRIPT, transcript_key)
+    if not transcript_data:
+        # Whisper API로 자막 생성
+        whisper_result = await transcribe_audio(audio.file_path, whisper_language)
+        transcript_data = {
             "text": whisper_result.text,
             "segments": whisper_result.segments,
             "language": whisper_result.language
-        }, f, ensure_ascii=False, indent=2)
+        }
+        if transcript_key:
+            await artifact_cache.store_json(TRANSCRIPT, transcript_key, transcript_data)
 
-    # DB에 자막 정보 저장
+    # 자막 파일 저장
+    await write_json(transcript_path, transcript_data)
+
+    # 검색 색인 (백그라운드 배치로 기록)
+    search_indexer.index_transcript(video_id, language, transcript_data["segments"])
+
+    # DB에 자막 정보 저장 (오디오 행의 내용 해시도 함께 커밋)
+    db.add(audio)
     if existing_transcript:
         # 기존 자막 정보 업데이트
-        existing_transcript.content = whisper_result.text
-        existing_transcript.timestamps = json.dumps(whisper_result.segments)
+        existing_transcript.content = transcript_data["text"]
+        existing_transcript.timestamps = json.dumps(transcript_data["segments"])
         existing_transcript.file_path = transcript_path
         existing_transcript.is_processed = True
-        db.add(existing_transcript)
-        db.commit()
-        db.refresh(existing_transcript)
-        return existing_transcript
+        return await save(db, existing_transcript)
     else:
         # 새 자막 정보 생성
         new_transcript = Transcript(
             video_id=video_id,
             language=language,
-            content=whisper_result.text,
-            timestamps=json.dumps(whisper_result.segments),
+            content=transcript_data["text"],
+            timestamps=json.dumps(transcript_data["segments"]),
             file_path=transcript_path,
             is_processed=True
         )
-        db.add(new_transcript)
-        db.commit()
-        db.refresh(new_transcript)
-        return new_transcript
+        return await save(db, new_transcript)
 
-async def translate_video_transcript(db: Session, video_id: int, source_lang: str, target_lang: str) -> Transcript:
+async def translate_video_transcript(db: AsyncSession, video_id: int, source_lang: str, target_lang: str) -> Transcript:
     """
     비디오 자막을 번역하여 저장합니다.
 
@@ -167,75 +188,80 @@ async def translate_video_transcript(db: Session, video_id: int, source_lang: st
         Transcript: 번역된 자막 객체
     """
     # 원본 자막 가져오기
-    source_transcript_statement = select(Transcript).where(
-        Transcript.video_id == video_id,
-        Transcript.language == source_lang
-    )
-    source_transcript = db.execute(source_transcript_statement).scalars().first()
+    source_transcript = await get_transcript(db, video_id, source_lang)
 
     if not source_transcript or not source_transcript.is_processed:
         # 원본 자막이 없으면 생성
         source_transcript = await process_video_transcript(db, video_id, source_lang)
 
     # 이미 번역된 자막이 있는지 확인
-    target_transcript_statement = select(Transcript).where(
-        Transcript.video_id == video_id,
-        Transcript.language == target_lang
-    )
-    target_transcript = db.execute(target_transcript_statement).scalars().first()
+    target_transcript = await get_transcript(db, video_id, target_lang)
 
     if target_transcript and target_transcript.is_processed:
         return target_transcript
 
     # 자막 파일 로드
-    with open(source_transcript.file_path, "r", encoding="utf-8") as f:
-        transcript_data = json.load(f)
-
-    # 원본 자막 텍스트
-    source_text = transcript_data.get("text", "")
-    source_segments = transcript_data.get("segments", [])
+    transcript_data = await read_json(source_transcript.file_path)
 
-    # 전체 텍스트 번역 (기존 방식)
-    translated_text = await translate_text(source_text, "한국어" if target_lang == "ko" else "영어")
-
-    # 세그먼트별 번역 (개선된 방식)
-    translated_segments = []
-    try:
-        print(f"세그먼트별 번역 시작 - 총 {len(source_segments)}개 세그먼트")
-        for i, segment in enumerate(source_segments):
-            segment_text = segment.get("text", "").strip()
-            if segment_text:  # 비어있지 않은 세그먼트만 번역
-                translated_segment_text = await translate_text(
-                    segment_text,
-                    "한국어" if target_lang == "ko" else "영어"
-                )
-                # 타임스탬프와 ID 유지하면서 세그먼트 복사
-                translated_segment = segment.copy()
-                translated_segment["text"] = translated_segment_text
-                translated_segments.append(translated_segment)
-                print(f"세그먼트 {i+1}/{len(source_segments)} 번역 완료")
-            else:
-                # 비어있는 세그먼트는 그대로 유지
-                translated_segments.append(segment)
-        print("모든 세그먼트 번역 완료")
-    except Exception as e:
-        print(f"세그먼트별 번역 중 오류 발생: {str(e)}")
-        print("전체 텍스트 번역만 사용합니다.")
-        # 오류 발생 시 원본 세그먼트 재사용
-        translated_segments = source_segments
-
-    translated_data = {
-        "text": translated_text,
-        "segments": translated_segments,
-        "language": target_lang
-    }
+    # 같은 원본 자막의 번역이 캐시에 있으면 번역 API를 호출하지 않음
+    translation_key = artifact_key(
+        TRANSLATION, hash_json(transcript_data), model=model_tag(CHAT_MODEL), target_language=target_lang
+    )
+    translated_data = await artifact_cache.fetch_json(TRANSLATION, translation_key)
+    if not translated_data:
+        # 원본 자막 텍스트
+        source_text = transcript_data.get("text", "")
+        source_segments = transcript_data.get("segments", [])
+
+        # 전체 텍스트 번역 (기존 방식)
+        translated_text = await translate_text(source_text, "한국어" if target_lang == "ko" else "영어")
+
+        # 세그먼트별 번역 (개선된 방식)
+        translated_segments = []
+        segments_translated = True
+        try:
+            print(f"세그먼트별 번역 시작 - 총 {len(source_segments)}개 세그먼트")
+            for i, segment in enumerate(source_segments):
+                segment_text = segment.get("text", "").strip()
+                if segment_text:  # 비어있지 않은 세그먼트만 번역
+                    translated_segment_text = await translate_text(
+                        segment_text,
+                        "한국어" if target_lang == "ko" else "영어"
+                    )
+                    # 타임스탬프와 ID 유지하면서 세그먼트 복사
+                    translated_segment = segment.copy()
+                    translated_segment["text"] = translated_segment_text
+                    translated_segments.append(translated_segment)
+                    print(f"세그먼트 {i+1}/{len(source_segments)} 번역 완료")
+                else:
+                    # 비어있는 세그먼트는 그대로 유지
+                    translated_segments.append(segment)
+            print("모든 세그먼트 번역 완료")
+        except Exception as e:
+            print(f"세그먼트별 번역 중 오류 발생: {str(e)}")
+            print("전체 텍스트 번역만 사용합니다.")
+            # 오류 발생 시 원본 세그먼트 재사용
+            translated_segments = source_segments
+            segments_translated = False
+
+        translated_data = {
+            "text": translated_text,
+            "segments": translated_segments,
+            "language": target_lang
+        }
+        # 원문 세그먼트로 대체한 결과는 캐시하지 않음 (다음 요청에서 다시 번역)
+        if segments_translated:
+            await artifact_cache.store_json(TRANSLATION, translation_key, translated_data)
+
+    translated_text = translated_data["text"]
+    translated_segments = translated_data["segments"]
 
     # 번역된 자막 파일 저장
     target_transcript_path = str(get_transcript_path(video_id, target_lang))
-    os.makedirs(os.path.dirname(target_transcript_path), exist_ok=True)
+    await write_json(target_transcript_path, translated_data)
 
-    with open(target_transcript_path, "w", encoding="utf-8") as f:
-        json.dump(translated_data, f, ensure_ascii=False, indent=2)
+    # 번역 자막도 검색 색인 (백그라운드 배치로 기록)
+    search_indexer.index_transcript(video_id, target_lang, translated_segments)
 
     # DB에 번역된 자막 정보 저장
     if target_transcript:
@@ -244,10 +270,7 @@ async def translate_video_transcript(db: Session, video_id: int, source_lang: st
         target_transcript.timestamps = json.dumps(translated_data.get("segments", []))
         target_transcript.file_path = target_transcript_path
         target_transcript.is_processed = True
-        db.add(target_transcript)
-        db.commit()
-        db.refresh(target_transcript)
-        return target_transcript
+        return await save(db, target_transcript)
     else:
         # 새 자막 정보 생성
         new_transcript = Transcript(
@@ -258,12 +281,9 @@ async def translate_video_transcript(db: Session, video_id: int, source_lang: st
             file_path=target_transcript_path,
             is_processed=True
         )
-        db.add(new_transcript)
-        db.commit()
-        db.refresh(new_transcript)
-        return new_transcript
+        return await save(db, new_transcript)
 
-async def generate_audio_from_transcript(db: Session, video_id: int, language: str) -> Audio:
+async def generate_audio_from_transcript(db: AsyncSession, video_id: int, language: str) -> Audio:
     """
     자막에서 TTS로 오디오를 생성합니다.
 
@@ -276,11 +296,7 @@ async def generate_audio_from_transcript(db: Session, video_id: int, language: s
         Audio: 생성된 오디오 객체
     """
     # 자막 가져오기
-    transcript_statement = select(Transcript).where(
-        Transcript.video_id == video_id,
-        Transcript.language == language
-    )
-    transcript = db.execute(transcript_statement).scalars().first()
+    transcript = await get_transcript(db, video_id, language)
 
     if not transcript or not transcript.is_processed:
         # 자막이 없으면 번역 또는 생성
@@ -290,63 +306,49 @@ async def generate_audio_from_transcript(db: Session, video_id: int, language: s
             transcript = await translate_video_transcript(db, video_id, "ko", language)
 
     # 이미 생성된 TTS가 있는지 확인
-    audio_statement = select(Audio).where(
-        Audio.video_id == video_id,
-        Audio.language == language
-    )
-    existing_audio = db.execute(audio_statement).scalars().first()
+    existing_audio = await get_audio(db, video_id, language)
 
     if existing_audio and existing_audio.is_processed and os.path.exists(existing_audio.file_path):
+        if await media_probe.probe_audio(existing_audio):
+            return await save(db, existing_audio)
         return existing_audio
 
     # 자막 데이터 로드
-    with open(transcript.file_path, "r", encoding="utf-8") as f:
-        transcript_data = json.load(f)
+    transcript_data = await read_json(transcript.file_path)
 
     # TTS 오디오 파일 경로
     tts_audio_path = str(get_audio_path(video_id, language))
 
-    # TTS 생성
-    success = generate_tts_for_segments(
-        transcript_data.get("segments", []),
-        language,
-        tts_audio_path
+    # 합성할 문장이 같으면 (다른 영상/강의의 같은 자막 포함) 캐시된 음성 재사용
+    segments = transcript_data.get("segments", [])
+    tts_key = artifact_key(
+        TTS, hash_json([segment.get("text", "") for segment in segments]), engine=engine_tag(), language=language
     )
-
-    if not success:
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="TTS 생성에 실패했습니다."
+    if not await artifact_cache.fetch_file(TTS, tts_key, tts_audio_path):
+        # TTS 생성 (합성/인코딩은 스레드에서 실행)
+        success = await asyncio.to_thread(
+            generate_tts_for_segments,
+            segments,
+            language,
+            tts_audio_path
         )
 
-    # 오디오 길이 가져오기
-    duration = get_audio_duration(tts_audio_path)
+        if not success:
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail="TTS 생성에 실패했습니다."
+            )
+        await artifact_cache.store_file(TTS, tts_key, tts_audio_path)
 
     # DB에 오디오 정보 저장
-    if existing_audio:
-        # 기존 오디오 정보 업데이트
-        existing_audio.file_path = tts_audio_path
-        existing_audio.duration = duration
-        existing_audio.is_processed = True
-        db.add(existing_audio)
-        db.commit()
-        db.refresh(existing_audio)
-        return existing_audio
-    else:
-        # 새 오디오 정보 생성
-        new_audio = Audio(
-            video_id=video_id,
-            language=language,
-            file_path=tts_audio_path,
-            duration=duration,
-            is_processed=True
-        )
-        db.add(new_audio)
-        db.commit()
-        db.refresh(new_audio)
-        return new_audio
-
-async def ask_video_question(db: Session, video_id: int, question: str, language: str = "ko") -> dict:
+    audio = existing_audio or Audio(video_id=video_id, language=language, file_path=tts_audio_path)
+    audio.file_path = tts_audio_path
+    audio.is_processed = True
+    # 길이/코덱은 헤더에서 읽어 파일 크기·수정 시각과 함께 저장
+    await media_probe.probe_audio(audio)
+    return await save(db, audio)
+
+async def ask_video_question(db: AsyncSession, video_id: int, question: str, language: str = "ko") -> dict:
     """
     비디오 내용에 대한 질문에 답변합니다.
 
@@ -360,11 +362,7 @@ async def ask_video_question(db: Session, video_id: int, question: str, language
         dict: 답변 정보
     """
     # 자막 가져오기
-    transcript_statement = select(Transcript).where(
-        Transcript.video_id == video_id,
-        Transcript.language == language
-    )
-    transcript = db.execute(transcript_statement).scalars().first()
+    transcript = await get_transcript(db, video_id, language)
 
     if not transcript or not transcript.is_processed:
         # 자막이 없으면 번역 또는 생성
@@ -374,8 +372,7 @@ async def ask_video_question(db: Session, video_id: int, question: str, language
             transcript = await translate_video_transcript(db, video_id, "ko", language)
 
     # 자막 데이터 로드
-    with open(transcript.file_path, "r", encoding="utf-8") as f:
-        transcript_data = json.load(f)
+    transcript_data = await read_json(transcript.file_path)
 
     # 질문에 답변
     answer_text = await answer_question(transcript_data.get("text", ""), question)
@@ -386,7 +383,7 @@ async def ask_video_question(db: Session, video_id: int, question: str, language
         "language": language
     }
 
-async def process_video_complete(db: Session, video_id: int, target_language: str = "ko"):
+async def process_video_complete(db: AsyncSession, video_id: int, target_language: str = "ko"):
     """
     비디오의 모든 AI 처리를 순차적으로 진행합니다.
 
@@ -417,12 +414,14 @@ async def process_video_complete(db: Session, video_id: int, target_language: st
             print(f"비디오 {video_id} {target_language} TTS 생성 완료")
 
         # 처리 완료 상태 업데이트
-        update_video_processing_status(db, video_id, True)
+        await update_video_processing_status(db, video_id, True)
         print(f"비디오 {video_id} 모든 처리 완료")
 
     except Exception as e:
         # 오류 발생 시 상태 업데이트
         error_msg = str(e)
         print(f"비디오 {video_id} 처리 중 오류 발생: {error_msg}")
-        update_video_processing_status(db, video_id, False, error_msg)
+        # 실패한 작업의 트랜잭션을 정리한 뒤 상태 기록
+        await db.rollback()
+        await update_video_processing_status(db, video_id, False, error_msg)
         raise
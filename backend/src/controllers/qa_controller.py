@@ -1,17 +1,16 @@
-from sqlmodel import Session, select
+from sqlmodel.ext.asyncio.session import AsyncSession
 from fastapi import HTTPException, status
 
 from src.models.qa_pair import QAPair, QACreate
-from src.models.video import Video
 from src.services.ai import answer_question
+from src.repositories.common import save
+from src.repositories.videos import get_video
+from src.repositories.qa_pairs import list_user_qa_pairs, list_video_qa_pairs
 
 # 질문 등록 및 AI 답변 생성
-async def create_qa(db: Session, qa_data: QACreate, user_id: int):
+async def create_qa(db: AsyncSession, qa_data: QACreate, user_id: int):
     # 영상 존재 확인
-    statement = select(Video).where(Video.id == qa_data.video_id)
-    # 동기적으로 쿼리 실행
-    results = db.execute(statement)
-    video = results.scalars().first()
+    video = await get_video(db, qa_data.video_id)
 
     if not video:
         raise HTTPException(
@@ -35,31 +34,17 @@ async def create_qa(db: Session, qa_data: QACreate, user_id: int):
         video_id=qa_data.video_id
     )
 
-    db.add(db_qa)
-    db.commit()
-    db.refresh(db_qa)
-
-    return db_qa
+    return await save(db, db_qa)
 
 # 사용자의 질문-답변 목록 가져오기
-async def get_user_qa_pairs(db: Session, user_id: int, video_id: int = None, skip: int = 0, limit: int = 100):
-    query = select(QAPair).where(QAPair.user_id == user_id)
-
-    if video_id:
-        query = query.where(QAPair.video_id == video_id)
-
-    query = query.order_by(QAPair.timestamp.desc()).offset(skip).limit(limit)
-    # 동기적으로 쿼리 실행
-    results = db.execute(query)
-    return results.scalars().all()
+async def get_user_qa_pairs(db: AsyncSession, user_id: int, video_id: int = None, skip: int = 0, limit: int = 100):
+    return await list_user_qa_pairs(db, user_id, video_id, skip, limit)
 
 # 특정 영상의 모든 질문-답변 목록 가져오기
-async def get_video_qa_pairs(db: Session, video_id: int, skip: int = 0, limit: int = 100):
+async def get_video_qa_pairs(db: AsyncSession, video_id: int, skip: int = 0, limit: int = 100):
     try:
         # 영상 존재 확인
-        video_statement = select(Video).where(Video.id == video_id)
-        video_result = db.execute(video_statement)
-        video = video_result.scalars().first()
+        video = await get_video(db, video_id)
 
         if not video:
             raise HTTPException(
@@ -68,12 +53,9 @@ async def get_video_qa_pairs(db: Session, video_id: int, skip: int = 0, limit: i
             )
 
         # 영상에 대한 모든 질문-답변 조회
-        query = select(QAPair).where(QAPair.video_id == video_id)
-        query = query.order_by(QAPair.timestamp.desc()).offset(skip).limit(limit)
-
-        # 동기적으로 쿼리 실행
-        results = db.execute(query)
-        return results.scalars().all()
+        return await list_video_qa_pairs(db, video_id, skip, limit)
+    except HTTPException:
+        raise
     except Exception as e:
         print(f"get_video_qa_pairs 오류: {str(e)}")
         raise HTTPException(
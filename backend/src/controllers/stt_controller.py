@@ -11,11 +11,20 @@ from fastapi.responses import JSONResponse
 import logging
 import threading
 import queue
-import json
 from datetime import datetime
 import subprocess
 import speech_recognition as sr
 
+from src.core.settings import settings
+from src.services.heartbeat import heartbeat_scheduler
+from src.services.replay_buffer import replay_buffer, CAPTION_TYPES
+from src.services.rate_limit import reject_connection
+from src.services.sharding import shard_router, WRONG_SHARD_CLOSE_CODE
+from src.services.caption_persister import caption_persister
+from src.services.ws_codec import (
+    event_encoder, negotiate_encoding, is_deflate_offered, send_payload, encoding_ack, JSON_ENCODING
+)
+
 # 로깅 설정 - 더 상세한 포맷과 색상 코딩
 logging.basicConfig(
     level=logging.INFO,
@@ -362,10 +371,13 @@ class LectureRecorder:
             logger.info(f"📊 [STT] 길이: {text_length} chars, 단어수: {word_count}, "
                        f"총 결과수: {self.metrics['total_text_results']}")
             
+            # 자막 로그는 write-behind 큐로 저장 (내보내기용)
+            caption_persister.enqueue(self.lecture_id, text)
+            
             try:
                 await self.connection_manager.broadcast_to_lecture(
                     self.lecture_id,
-                    {
+                    replay_buffer.append(self.lecture_id, {
                         "type": "subtitle",
                         "text": text.strip(),
                         "timestamp": datetime.now().isoformat(),
@@ -376,7 +388,7 @@ class LectureRecorder:
                             "word_count": word_count,
                             "sequence_number": self.metrics["total_text_results"]
                         }
-                    }
+                    })
                 )
                 
                 callback_time = time.time() - callback_start
@@ -592,6 +604,8 @@ recorder_lock = threading.Lock()
 class ConnectionManager:
     def __init__(self):
         self.active_connections: dict[str, list[WebSocket]] = {}
+        # WebSocket별 협상된 인코딩
+        self.encodings: dict[WebSocket, str] = {}
         # 연결 메트릭
         self.connection_metrics = {
             "total_connections": 0,
@@ -599,11 +613,13 @@ class ConnectionManager:
             "start_time": datetime.now().isoformat()
         }
 
-    async def connect(self, websocket: WebSocket, lecture_id: str):
+    async def connect(self, websocket: WebSocket, lecture_id: str, encoding: str = JSON_ENCODING):
         await websocket.accept()
         if lecture_id not in self.active_connections:
             self.active_connections[lecture_id] = []
         self.active_connections[lecture_id].append(websocket)
+        self.encodings[websocket] = encoding
+        heartbeat_scheduler.register(websocket, lambda ws: self.disconnect(ws, lecture_id), encoding)
         
         self.connection_metrics["total_connections"] += 1
         
@@ -615,6 +631,8 @@ class ConnectionManager:
         if lecture_id in self.active_connections:
             if websocket in self.active_connections[lecture_id]:
                 self.active_connections[lecture_id].remove(websocket)
+                self.encodings.pop(websocket, None)
+                heartbeat_scheduler.unregister(websocket)
                 logger.info(f"❌ [STT] WebSocket 연결 해제 - lecture_id: {lecture_id}")
                 logger.info(f"📊 [STT] 남은 연결 - 강의별: {len(self.active_connections[lecture_id])}")
 
@@ -628,9 +646,14 @@ class ConnectionManager:
             
             logger.info(f"📢 [STT] 자막 브로드캐스트 시작 - lecture_id: {lecture_id}, 대상: {len(connections)}명")
             
+            # 인코딩별로 한 번만 직렬화
+            payloads = event_encoder.encode_for(
+                message, (self.encodings.get(connection, JSON_ENCODING) for connection in connections)
+            )
+            
             for connection in connections:
                 try:
-                    await connection.send_text(json.dumps(message))
+                    await send_payload(connection, payloads[self.encodings.get(connection, JSON_ENCODING)])
                     success_count += 1
                 except Exception as e:
                     logger.error(f"❌ [STT] 개별 전송 실패: {e}")
@@ -639,6 +662,8 @@ class ConnectionManager:
             # 끊어진 연결 제거
             for conn in disconnected:
                 self.active_connections[lecture_id].remove(conn)
+                self.encodings.pop(conn, None)
+                heartbeat_scheduler.unregister(conn)
             
             broadcast_time = time.time() - broadcast_start
             self.connection_metrics["total_messages"] += 1
@@ -654,11 +679,30 @@ class ConnectionManager:
             "active_lectures": len(self.active_connections),
             "total_connections_created": self.connection_metrics["total_connections"],
             "total_messages_sent": self.connection_metrics["total_messages"],
+            "encoding_stats": event_encoder.get_stats(),
+            "replay": replay_buffer.get_stats(),
+            "sharding": shard_router.get_stats(),
             "uptime": (datetime.now() - datetime.fromisoformat(self.connection_metrics["start_time"])).total_seconds()
         }
 
 manager = ConnectionManager()
 
+
+async def _broadcast_caption(lecture_id: str, message: dict):
+    """완성된 자막 - 자막 로그/리플레이 버퍼에 기록 후 브로드캐스트"""
+    caption_persister.enqueue(lecture_id, message.get("text", ""))
+    await manager.broadcast_to_lecture(lecture_id, replay_buffer.append(lecture_id, message))
+
+
+async def _broadcast_subtitle(lecture_id: str, message: dict):
+    """테스트/안내용 자막 - 기록 없이 브로드캐스트"""
+    await manager.broadcast_to_lecture(lecture_id, message)
+
+
+# REST 요청을 받은 샤드가 강의 소유 샤드가 아니면 큐로 전달됨
+shard_router.register("caption", _broadcast_caption)
+shard_router.register("subtitle", _broadcast_subtitle)
+
 def get_or_create_recorder(lecture_id: str) -> LectureRecorder:
     """강의별 레코더 가져오기 또는 생성"""
     with recorder_lock:
@@ -674,6 +718,11 @@ def get_or_create_recorder(lecture_id: str) -> LectureRecorder:
 @router.websocket("/ws/audio/{lecture_id}")
 async def websocket_audio_endpoint(websocket: WebSocket, lecture_id: str, token: str = Query(None)):
     """실시간 오디오 스트리밍 WebSocket"""
+    # 레코더와 자막 연결은 강의 소유 샤드에만 존재
+    if not shard_router.owns(lecture_id):
+        await reject_connection(websocket, WRONG_SHARD_CLOSE_CODE, shard_router.wrong_shard_reason(lecture_id))
+        return
+    
     # 토큰 검증 (선택적)
     if token:
         from ..services.auth import decode_token
@@ -810,8 +859,18 @@ async def websocket_audio_endpoint(websocket: WebSocket, lecture_id: str, token:
         logger.info(f"🏁 [STT] 오디오 WebSocket 세션 종료 - lecture_id: {lecture_id}")
 
 @router.websocket("/ws/{lecture_id}")
-async def websocket_subtitle_endpoint(websocket: WebSocket, lecture_id: str, token: str = Query(None)):
+async def websocket_subtitle_endpoint(
+    websocket: WebSocket,
+    lecture_id: str,
+    token: str = Query(None),
+    encoding: str = Query(None),
+    since: int = Query(None)
+):
     """자막 브로드캐스트 WebSocket (기존 유지)"""
+    if not shard_router.owns(lecture_id):
+        await reject_connection(websocket, WRONG_SHARD_CLOSE_CODE, shard_router.wrong_shard_reason(lecture_id))
+        return
+    
     # 토큰 검증 (선택적)
     if token:
         from ..services.auth import decode_token
@@ -826,22 +885,25 @@ async def websocket_subtitle_endpoint(websocket: WebSocket, lecture_id: str, tok
     else:
         logger.warning("⚠️ [STT] 자막 토큰 없음 - 테스트 모드로 연결 허용")
     
-    await manager.connect(websocket, lecture_id)
-    ping_count = 0
+    negotiated_encoding = negotiate_encoding(encoding)
+    await manager.connect(websocket, lecture_id, negotiated_encoding)
+    if encoding:
+        deflate = settings.ws_per_message_deflate and is_deflate_offered(websocket)
+        await websocket.send_text(encoding_ack(negotiated_encoding, deflate))
     
+    # 최근 자막을 한 프레임으로 전송 (since 이후만)
+    replay = replay_buffer.replay_frame(lecture_id, since, CAPTION_TYPES)
     try:
+        await send_payload(websocket, event_encoder.encode(replay, negotiated_encoding))
+        logger.info(f"⏪ [STT] 자막 리플레이 전송 - lecture_id: {lecture_id}, since: {since}, 이벤트: {len(replay['events'])}개")
+    except Exception as e:
+        logger.error(f"❌ [STT] 자막 리플레이 전송 실패: {e}")
+    
+    try:
+        # ping 전송과 끊어진 연결 정리는 heartbeat_scheduler가 담당
         while True:
-            try:
-                await asyncio.wait_for(websocket.receive_text(), timeout=30.0)
-            except asyncio.TimeoutError:
-                # 30초마다 핑 메시지 전송
-                ping_count += 1
-                logger.debug(f"🏓 [STT] Ping #{ping_count} 전송 - lecture_id: {lecture_id}")
-                await websocket.send_text(json.dumps({
-                    "type": "ping",
-                    "timestamp": datetime.now().isoformat(),
-                    "ping_count": ping_count
-                }))
+            await websocket.receive_text()
+            heartbeat_scheduler.touch(websocket)
     except WebSocketDisconnect:
         logger.info(f"🔌 [STT] 자막 WebSocket 연결 해제 - lecture_id: {lecture_id}")
         manager.disconnect(websocket, lecture_id)
@@ -895,7 +957,7 @@ async def realtime_transcribe(
                     logger.info(f"🕐 [STT] 시간 - 변환: {conversion_time:.3f}s, 처리: {processing_time:.3f}s, 총: {total_time:.3f}s")
                     
                     # 자막 브로드캐스트
-                    await manager.broadcast_to_lecture(lecture_id, {
+                    await shard_router.dispatch("caption", lecture_id, {
                         "type": "subtitle",
                         "text": result_text.strip(),
                         "timestamp": datetime.now().isoformat(),
@@ -1065,7 +1127,7 @@ async def test_subtitle(lecture_id: str):
         results = []
         for i, message in enumerate(test_messages):
             try:
-                await manager.broadcast_to_lecture(lecture_id, {
+                await shard_router.dispatch("subtitle", lecture_id, {
                     "type": "subtitle",
                     "text": message,
                     "timestamp": datetime.now().isoformat(),
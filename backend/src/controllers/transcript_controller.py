@@ -1,19 +1,21 @@
 from fastapi import HTTPException, status
-from sqlmodel import Session, select
+from sqlmodel.ext.asyncio.session import AsyncSession
+import json
 import os
 import pathlib
 from datetime import datetime
 
 from src.models.transcript import Transcript, TranscriptCreate
-from src.models.video import Video
 from src.services.transcript import generate_transcript, translate_transcript
+from src.repositories.common import save
+from src.repositories.videos import get_video
+from src.repositories.transcripts import get_transcript, get_transcript_by_id, list_video_transcripts
+from src.utils.filesystem import read_json
 
 # 영상에서 자막 생성
-async def create_transcript(db: Session, video_id: int, language: str = "ko"):
+async def create_transcript(db: AsyncSession, video_id: int, language: str = "ko"):
     # 영상 존재 확인
-    statement = select(Video).where(Video.id == video_id)
-    results = await db.execute(statement)
-    video = results.scalars().first()
+    video = await get_video(db, video_id)
 
     if not video:
         raise HTTPException(
@@ -22,11 +24,7 @@ async def create_transcript(db: Session, video_id: int, language: str = "ko"):
         )
 
     # 해당 언어로 이미 생성된 자막이 있는지 확인
-    transcript_statement = select(Transcript).where(
-        Transcript.video_id == video_id,
-        Transcript.language == language
-    )
-    existing_transcript = db.exec(transcript_statement).first()
+    existing_transcript = await get_transcript(db, video_id, language)
 
     if existing_transcript:
         return existing_transcript
@@ -51,11 +49,7 @@ async def create_transcript(db: Session, video_id: int, language: str = "ko"):
             timestamps=transcript_data.get("timestamps", None)
         )
 
-        db.add(db_transcript)
-        db.commit()
-        db.refresh(db_transcript)
-
-        return db_transcript
+        return await save(db, db_transcript)
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -63,11 +57,9 @@ async def create_transcript(db: Session, video_id: int, language: str = "ko"):
         )
 
 # 자막 번역
-async def translate_video_transcript(db: Session, transcript_id: int, target_language: str):
+async def translate_video_transcript(db: AsyncSession, transcript_id: int, target_language: str):
     # 자막 존재 확인
-    statement = select(Transcript).where(Transcript.id == transcript_id)
-    results = await db.execute(statement)
-    source_transcript = results.scalars().first()
+    source_transcript = await get_transcript_by_id(db, transcript_id)
 
     if not source_transcript:
         raise HTTPException(
@@ -76,11 +68,7 @@ async def translate_video_transcript(db: Session, transcript_id: int, target_lan
         )
 
     # 이미 번역된 자막이 있는지 확인
-    translated_statement = select(Transcript).where(
-        Transcript.video_id == source_transcript.video_id,
-        Transcript.language == target_language
-    )
-    existing_translation = db.exec(translated_statement).first()
+    existing_translation = await get_transcript(db, source_transcript.video_id, target_language)
 
     if existing_translation:
         return existing_translation
@@ -101,11 +89,7 @@ async def translate_video_transcript(db: Session, transcript_id: int, target_lan
             timestamps=source_transcript.timestamps  # 타임스탬프는 원본과 동일하게 유지
         )
 
-        db.add(db_translated)
-        db.commit()
-        db.refresh(db_translated)
-
-        return db_translated
+        return await save(db, db_translated)
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -113,11 +97,9 @@ async def translate_video_transcript(db: Session, transcript_id: int, target_lan
         )
 
 # 비디오의 자막 목록 조회
-async def get_video_transcripts(db: Session, video_id: int):
+async def get_video_transcripts(db: AsyncSession, video_id: int):
     # 데이터베이스에서 자막 조회
-    statement = select(Transcript).where(Transcript.video_id == video_id)
-    results = db.execute(statement)
-    transcripts = results.scalars().all()
+    transcripts = list(await list_video_transcripts(db, video_id))
 
     # 파일 시스템에서 자막 파일을 직접 확인 (데이터베이스에 없는 자막도 포함)
     transcripts_dir = pathlib.Path(f"static/transcripts/{video_id}")
@@ -138,9 +120,7 @@ async def get_video_transcripts(db: Session, video_id: int):
             if not db_transcript:
                 # DB에 없는 자막이라면 파일 내용을 읽어서 임시 객체 생성
                 try:
-                    with open(json_file, "r", encoding="utf-8") as f:
-                        import json
-                        transcript_data = json.load(f)
+                    transcript_data = await read_json(json_file)
 
                     # 파일 경로를 저장
                     file_path = str(json_file)
@@ -165,9 +145,7 @@ async def get_video_transcripts(db: Session, video_id: int):
             elif not db_transcript.is_processed or not db_transcript.content:
                 # DB에 있지만 처리되지 않았거나 내용이 없는 경우 파일에서 내용 업데이트
                 try:
-                    with open(json_file, "r", encoding="utf-8") as f:
-                        import json
-                        transcript_data = json.load(f)
+                    transcript_data = await read_json(json_file)
 
                     # DB의 트랜스크립트 업데이트
                     db_transcript.content = transcript_data.get("text", "")
@@ -176,9 +154,7 @@ async def get_video_transcripts(db: Session, video_id: int):
                     db_transcript.is_processed = True
 
                     # 변경사항 저장
-                    db.add(db_transcript)
-                    db.commit()
-                    db.refresh(db_transcript)
+                    await save(db, db_transcript)
                     print(f"DB 자막 업데이트됨: {language}")
                 except Exception as e:
                     print(f"자막 DB 업데이트 오류: {str(e)}")
@@ -1,4 +1,4 @@
-from sqlmodel import Session, select
+from sqlmodel.ext.asyncio.session import AsyncSession
 from fastapi import HTTPException, status
 import os
 import pathlib
@@ -6,14 +6,22 @@ from typing import List, Optional
 
 from src.models.video import Video, VideoCreate, VideoRead, VideoReadDetailed
 from src.models.user import User
-from src.services.youtube import extract_video_id, get_video_info, get_video_transcript, extract_thumbnail_from_video
+from src.services.youtube import extract_video_id, get_video_info, get_video_transcript
+from src.services.static_library import static_ingestor
+from src.services.thumbnails import thumbnail_pool
+from src.services.media_probe import media_probe
 from src.services.ai import summarize_text
+from src.repositories.common import save
+from src.repositories.videos import (
+    get_video, get_video_by_url, list_user_videos, list_public_videos, list_videos_by_ids
+)
+from src.services.response_cache import AVAILABLE_VIDEOS, response_cache
 
 # YouTube API 키 (실제 프로젝트에서는 환경변수로 관리)
 YOUTUBE_API_KEY = os.environ.get("YOUTUBE_API_KEY", "your-youtube-api-key")
 
 # 영상 추가
-async def add_video(db: Session, video_data: VideoCreate, user_id: int):
+async def add_video(db: AsyncSession, video_data: VideoCreate, user_id: int):
     # 유튜브 URL에서 영상 ID 추출
     video_id = extract_video_id(video_data.url)
     if not video_id:
@@ -27,10 +35,10 @@ async def add_video(db: Session, video_data: VideoCreate, user_id: int):
             thumbnail_dir = pathlib.Path('backend/static/thumbnails')
             thumbnail_dir.mkdir(parents=True, exist_ok=True)
             thumbnail_path = thumbnail_dir / f"{video_path.stem}.jpg"
-            try:
-                extract_thumbnail_from_video(str(video_path), str(thumbnail_path), time=5)
+            # 썸네일 추출은 이벤트 루프를 막지 않도록 프로세스 풀에서 실행
+            if await thumbnail_pool.extract(str(video_path), str(thumbnail_path), 5):
                 thumbnail_url = f"static/thumbnails/{video_path.stem}.jpg"
-            except Exception as e:
+            else:
                 thumbnail_url = ""
         else:
             raise HTTPException(
@@ -49,14 +57,12 @@ async def add_video(db: Session, video_data: VideoCreate, user_id: int):
             user_id=user_id,
             is_public=False
         )
-        db.add(db_video)
-        db.commit()
-        db.refresh(db_video)
-        return db_video
+        # 헤더에서 재생 시간/오디오 정보를 읽어 저장 (YouTube 영상은 API의 duration 사용)
+        await media_probe.probe_video(db_video, str(video_path))
+        return await save(db, db_video)
 
     # 기존 영상 확인
-    statement = select(Video).where(Video.url == video_data.url)
-    existing_video = db.exec(statement).first()
+    existing_video = await get_video_by_url(db, video_data.url)
     if existing_video:
         return existing_video
 
@@ -94,26 +100,16 @@ async def add_video(db: Session, video_data: VideoCreate, user_id: int):
         is_public=False  # 기본적으로 비공개
     )
 
-    db.add(db_video)
-    db.commit()
-    db.refresh(db_video)
-
-    return db_video
+    return await save(db, db_video)
 
 # 사용자의 영상 목록 가져오기
-async def get_user_videos(db: Session, user_id: int, skip: int = 0, limit: int = 100):
-    statement = select(Video).where(Video.user_id == user_id).offset(skip).limit(limit)
-    # 동기적으로 쿼리 실행
-    results = db.execute(statement)
-    return results.scalars().all()
+async def get_user_videos(db: AsyncSession, user_id: int, skip: int = 0, limit: int = 100):
+    return await list_user_videos(db, user_id, skip, limit)
 
 # 모든 공개 영상 목록 가져오기
-async def get_available_videos(db: Session, skip: int = 0, limit: int = 100):
+async def get_available_videos(db: AsyncSession, skip: int = 0, limit: int = 100):
     try:
-        statement = select(Video).where(Video.is_public == True).offset(skip).limit(limit)
-        # 동기적으로 쿼리 실행
-        results = db.execute(statement)
-        return results.scalars().all()
+        return await list_public_videos(db, skip, limit)
     except Exception as e:
         # 디버깅용 예외 출력
         print(f"get_available_videos 오류: {str(e)}")
@@ -123,11 +119,8 @@ async def get_available_videos(db: Session, skip: int = 0, limit: int = 100):
         )
 
 # 특정 영상 세부 정보 가져오기
-async def get_video_detail(db: Session, video_id: int, user_id: int):
-    statement = select(Video).where(Video.id == video_id)
-    # 동기적으로 쿼리 실행
-    results = db.execute(statement)
-    video = results.scalars().first()
+async def get_video_detail(db: AsyncSession, video_id: int, user_id: int):
+    video = await get_video(db, video_id)
 
     if not video:
         raise HTTPException(
@@ -145,7 +138,7 @@ async def get_video_detail(db: Session, video_id: int, user_id: int):
     return video
 
 # static 폴더의 영상 목록화
-async def initialize_static_videos(db: Session, admin_user_id: int):
+async def initialize_static_videos(db: AsyncSession, admin_user_id: int):
     # static 폴더 경로
     static_folder = pathlib.Path("static")
 
@@ -153,54 +146,13 @@ async def initialize_static_videos(db: Session, admin_user_id: int):
     if not static_folder.exists() or not static_folder.is_dir():
         return []
 
-    videos = []
-
-    # 지원하는 비디오 확장자
-    video_extensions = ['.mp4', '.avi', '.mov', '.mkv']
-
-    # static 폴더의 모든 파일을 확인
-    for file_path in static_folder.iterdir():
-        if file_path.is_file() and file_path.suffix.lower() in video_extensions:
-            url = f"static/{file_path.name}"
-            statement = select(Video).where(Video.url == url)
-            existing_video = db.exec(statement).first()
-            if existing_video:
-                videos.append(existing_video)
-                continue
-            # 썸네일 생성
-            thumbnail_dir = pathlib.Path('static/thumbnails')
-            thumbnail_dir.mkdir(parents=True, exist_ok=True)
-            thumbnail_path = thumbnail_dir / f"{file_path.stem}.jpg"
-            try:
-                extract_thumbnail_from_video(str(file_path), str(thumbnail_path), time=5)
-                thumbnail_url = f"static/thumbnails/{file_path.stem}.jpg"
-            except Exception as e:
-                thumbnail_url = ""
-            # 새 비디오 생성
-            db_video = Video(
-                url=url,
-                title=file_path.stem,  # 파일 이름을 제목으로 사용
-                thumbnail_url=thumbnail_url,
-                description=f"{file_path.name} 영상입니다.",
-                transcript="",  # 자막 정보 (실제로는 자막 추출 로직 필요)
-                summary="",  # 요약 정보 (실제로는 AI 요약 생성 필요)
-                user_id=admin_user_id,
-                is_public=True,  # 공개 비디오로 설정
-                duration="00:00"  # 기본 duration 추가
-            )
-            db.add(db_video)
-            db.commit()
-            db.refresh(db_video)
-            videos.append(db_video)
-
-    return videos
+    # 새로 생기거나 바뀐 파일만 일괄 등록하고 썸네일은 프로세스 풀에서 생성 (캐시 무효화 포함)
+    video_ids = await static_ingestor.ingest(static_folder, owner_id=admin_user_id)
+    return await list_videos_by_ids(db, video_ids)
 
 # 영상 공개/비공개 설정 변경
-async def update_video_visibility(db: Session, video_id: int, user_id: int, is_public: bool):
-    statement = select(Video).where(Video.id == video_id)
-    # 동기적으로 쿼리 실행
-    results = db.execute(statement)
-    video = results.scalars().first()
+async def update_video_visibility(db: AsyncSession, video_id: int, user_id: int, is_public: bool):
+    video = await get_video(db, video_id)
 
     if not video:
         raise HTTPException(
@@ -216,13 +168,11 @@ async def update_video_visibility(db: Session, video_id: int, user_id: int, is_p
         )
 
     video.is_public = is_public
-    db.add(video)
-    db.commit()
-    db.refresh(video)
-
+    video = await save(db, video)
+    await response_cache.invalidate(AVAILABLE_VIDEOS)
     return video
 
-def update_video_processing_status(db: Session, video_id: int, is_processed: bool, error: str = None):
+async def update_video_processing_status(db: AsyncSession, video_id: int, is_processed: bool, error: str = None):
     """
     비디오의 AI 처리 상태를 업데이트합니다.
 
@@ -232,7 +182,7 @@ def update_video_processing_status(db: Session, video_id: int, is_processed: boo
         is_processed: 처리 완료 여부
         error: 오류 메시지 (실패 시)
     """
-    video = db.get(Video, video_id)
+    video = await get_video(db, video_id)
     if not video:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -242,8 +192,4 @@ def update_video_processing_status(db: Session, video_id: int, is_processed: boo
     video.is_processed = is_processed
     video.processing_error = error
 
-    db.add(video)
-    db.commit()
-    db.refresh(video)
-
-    return video
+    return await save(db, video)
@@ -0,0 +1,122 @@
+"""자주 쓰는 조회가 인덱스를 타는지 EXPLAIN QUERY PLAN으로 확인하는 회귀 검사
+
+모델 + 마이그레이션으로 만든 스키마(기본: 메모리 DB)에서 각 쿼리의 실행 계획을 뽑아
+기대한 인덱스를 쓰지 않거나 정렬용 임시 B-tree가 생기면 실패(종료 코드 1)한다.
+
+    python -m src.db.check_query_plans
+    python -m src.db.check_query_plans --database ./studytube.db
+"""
+from typing import List, Tuple
+import argparse
+import sys
+
+from sqlalchemy import create_engine, text
+from sqlalchemy.dialects import sqlite
+from sqlmodel import SQLModel, select
+
+from src.models import Audio, ChatMessage, LectureCaption, LectureParticipant, QAPair, Transcript
+from src.db.migrations import apply_migrations
+
+# (설명, 쿼리, 허용 인덱스들, 정렬이 인덱스로 해결돼야 하는지)
+CHECKS = [
+    (
+        "transcript by video/language",
+        select(Transcript).where(Transcript.video_id == 1, Transcript.language == "ko"),
+        ("ix_transcripts_video_id_language",),
+        False
+    ),
+    (
+        "processed audio by video/language",
+        select(Audio).where(Audio.video_id == 1, Audio.language == "ko", Audio.is_processed == True),
+        ("ix_audios_video_id_language_is_processed",),
+        False
+    ),
+    (
+        "active participants of a lecture",
+        select(LectureParticipant.id).where(LectureParticipant.lecture_id == 1, LectureParticipant.is_active == True),
+        ("ix_lecture_participants_lecture_id_is_active",),
+        False
+    ),
+    (
+        "participant row of a student",
+        select(LectureParticipant).where(
+            LectureParticipant.lecture_id == 1,
+            LectureParticipant.student_id == 1,
+            LectureParticipant.is_active == True
+        ),
+        ("ix_lecture_participants_lecture_id_student_id_is_active",),
+        False
+    ),
+    (
+        "video QA, newest first",
+        select(QAPair).where(QAPair.video_id == 1).order_by(QAPair.timestamp.desc()).limit(100),
+        ("ix_qa_pairs_video_id_timestamp",),
+        True
+    ),
+    (
+        "user QA, newest first",
+        select(QAPair).where(QAPair.user_id == 1).order_by(QAPair.timestamp.desc()).limit(100),
+        ("ix_qa_pairs_user_id_timestamp",),
+        True
+    ),
+    (
+        "chat history page",
+        select(ChatMessage).where(ChatMessage.lecture_id == 1, ChatMessage.id < 1000).order_by(ChatMessage.id.desc()).limit(50),
+        ("ix_chat_messages_lecture_id_id",),
+        True
+    ),
+    (
+        "chat by time",
+        select(ChatMessage).where(ChatMessage.lecture_id == 1).order_by(ChatMessage.created_at),
+        ("ix_chat_messages_lecture_id_created_at",),
+        True
+    ),
+    (
+        "caption export batch",
+        select(LectureCaption).where(LectureCaption.lecture_id == 1, LectureCaption.id > 0).order_by(LectureCaption.id).limit(1000),
+        ("ix_lecture_captions_lecture_id_id",),
+        True
+    ),
+]
+
+
+def _compile(statement) -> str:
+    return str(statement.compile(dialect=sqlite.dialect(), compile_kwargs={"literal_binds": True}))
+
+
+def check_plans(connection) -> List[Tuple[str, bool, str]]:
+    """(설명, 통과 여부, 실행 계획) 목록 반환"""
+    results = []
+    for description, statement, indexes, ordered in CHECKS:
+        plan = " | ".join(row[-1] for row in connection.execute(text("EXPLAIN QUERY PLAN " + _compile(statement))))
+        uses_index = any(f"INDEX {name} " in plan + " " for name in indexes)
+        sorts = "TEMP B-TREE" in plan
+        results.append((description, uses_index and not (ordered and sorts), plan))
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="조회 쿼리 실행 계획 회귀 검사")
+    parser.add_argument("--database", help="검사할 SQLite 파일 (기본: 현재 모델로 만든 메모리 DB)")
+    args = parser.parse_args()
+
+    if args.database:
+        engine = create_engine(f"sqlite:///file:{args.database}?mode=ro&uri=true")
+    else:
+        engine = create_engine("sqlite://")
+        with engine.begin() as connection:
+            SQLModel.metadata.create_all(connection)
+            apply_migrations(connection)
+
+    with engine.connect() as connection:
+        results = check_plans(connection)
+
+    for description, passed, plan in results:
+        print(f"{'OK  ' if passed else 'FAIL'} {description}: {plan}")
+    failed = sum(1 for _, passed, _ in results if not passed)
+    print(f"{len(results) - failed}/{len(results)} 통과")
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,22 +1,165 @@
+from contextlib import asynccontextmanager
 from sqlmodel import SQLModel
 from sqlmodel.ext.asyncio.session import AsyncSession
+from pathlib import Path
+from sqlalchemy import event
+from sqlalchemy.engine import make_url
 from sqlalchemy.ext.asyncio import create_async_engine
+import logging
 
-# SQLite 연결 URL (async 버전)
-DATABASE_URL = "sqlite+aiosqlite:///./studytube.db"
+from src.core.settings import settings
+from src.db.migrations import apply_migrations
 
-# 비동기 엔진 생성
-engine = create_async_engine(
-    DATABASE_URL, 
-    echo=True  # SQL 쿼리 로깅 (개발 시 유용)
-)
+logger = logging.getLogger(__name__)
+
+# 설정의 URL에서 드라이버를 생략하면 비동기/동기 기본 드라이버로 채움
+ASYNC_DRIVERS = {"sqlite": "sqlite+aiosqlite", "postgresql": "postgresql+asyncpg"}
+SYNC_DRIVERS = {"sqlite": "sqlite", "postgresql": "postgresql+psycopg"}
+
+
+def _with_driver(url: str, drivers: dict) -> str:
+    parsed = make_url(url)
+    backend = parsed.get_backend_name()
+    if backend not in drivers:
+        raise ValueError(f"지원하지 않는 DB입니다: {backend} (sqlite, postgresql만 지원)")
+    if parsed.drivername == backend or parsed.drivername in ASYNC_DRIVERS.values():
+        parsed = parsed.set(drivername=drivers[backend])
+    return parsed.render_as_string(hide_password=False)
+
+
+# 비동기 연결 URL (sqlite:///./studytube.db -> sqlite+aiosqlite, postgresql://... -> postgresql+asyncpg)
+DATABASE_URL = _with_driver(settings.database_url, ASYNC_DRIVERS)
+# 테스트 데이터 생성 등 동기 작업용 URL
+SYNC_DATABASE_URL = _with_driver(settings.database_url, SYNC_DRIVERS)
+IS_SQLITE = make_url(DATABASE_URL).get_backend_name() == "sqlite"
+# SQLite 파일 경로 (PostgreSQL이면 None)
+SQLITE_PATH = Path(make_url(DATABASE_URL).database) if IS_SQLITE else None
+
+# 읽기 전용 연결 URL (SQLite는 같은 파일을 mode=ro로 열기, PostgreSQL은 읽기 전용 세션으로 같은 서버 사용)
+READ_DATABASE_URL = f"sqlite+aiosqlite:///file:{SQLITE_PATH.as_posix()}?mode=ro&uri=true" if IS_SQLITE else DATABASE_URL
+
+
+def _sqlite_pragmas(read_only: bool = False) -> list:
+    pragmas = [
+        f"synchronous={settings.sqlite_synchronous}",
+        f"cache_size=-{settings.sqlite_cache_size_kib}",  # 음수 = KiB 단위
+        f"mmap_size={settings.sqlite_mmap_size}",
+        f"busy_timeout={settings.sqlite_busy_timeout_ms}",
+        f"temp_store={settings.sqlite_temp_store}",
+        "foreign_keys=ON"
+    ]
+    if read_only:
+        # journal_mode는 파일에 기록되는 설정이라 쓰기 연결에서만 지정
+        pragmas.append("query_only=ON")
+    else:
+        pragmas.insert(0, f"journal_mode={settings.sqlite_journal_mode}")
+    return pragmas
+
+
+def _pragma_listener(read_only: bool = False):
+    pragmas = _sqlite_pragmas(read_only)
+
+    def apply_pragmas(dbapi_connection, connection_record):
+        # 풀에서 새 연결이 만들어질 때 한 번만 적용
+        cursor = dbapi_connection.cursor()
+        for pragma in pragmas:
+            cursor.execute(f"PRAGMA {pragma}")
+        cursor.close()
+
+    return apply_pragmas
+
+
+def _postgres_engine_options(pool_size: int, read_only: bool = False) -> dict:
+    """asyncpg 풀/문장 캐시 옵션 - 동시에 쓰는 작업(채팅/자막 저장, 참여자, 처리 상태)이 연결을 나눠 쓰도록 크기 조정"""
+    server_settings = {"application_name": settings.db_application_name}
+    if read_only:
+        server_settings["default_transaction_read_only"] = "on"
+    return {
+        "pool_size": pool_size,
+        "max_overflow": settings.db_max_overflow,
+        "pool_timeout": settings.db_pool_timeout,
+        "pool_recycle": settings.db_pool_recycle,
+        # 끊긴 연결(DB 재시작, 유휴 연결 정리)을 체크아웃 시 걸러냄
+        "pool_pre_ping": True,
+        "connect_args": {
+            # asyncpg 연결별 prepared statement 캐시 (PgBouncer transaction 모드에서는 0)
+            "statement_cache_size": settings.db_statement_cache_size,
+            # SQLAlchemy 쪽 prepared statement 캐시
+            "prepared_statement_cache_size": settings.db_statement_cache_size,
+            "command_timeout": settings.db_command_timeout,
+            "server_settings": server_settings
+        }
+    }
+
+
+# 비동기 엔진 생성 (SQL 로깅은 db_echo로 켤 때만)
+if IS_SQLITE:
+    engine = create_async_engine(
+        DATABASE_URL,
+        echo=settings.db_echo
+    )
+    event.listen(engine.sync_engine, "connect", _pragma_listener())
+else:
+    engine = create_async_engine(
+        DATABASE_URL,
+        echo=settings.db_echo,
+        **_postgres_engine_options(settings.db_pool_size)
+    )
+
+# 읽기 전용 풀 (비활성화 시 쓰기 엔진을 그대로 사용)
+if settings.db_read_pool_enabled and IS_SQLITE:
+    read_engine = create_async_engine(
+        READ_DATABASE_URL,
+        echo=settings.db_echo,
+        pool_size=settings.db_read_pool_size
+    )
+    event.listen(read_engine.sync_engine, "connect", _pragma_listener(read_only=True))
+elif settings.db_read_pool_enabled:
+    read_engine = create_async_engine(
+        READ_DATABASE_URL,
+        echo=settings.db_echo,
+        **_postgres_engine_options(settings.db_read_pool_size, read_only=True)
+    )
+else:
+    read_engine = engine
 
 # DB 종속성 주입 함수 (비동기)
+# 커밋 후에도 객체 속성을 읽을 수 있도록 만료시키지 않음 (async 세션은 lazy 재조회 불가)
 async def get_db():
-    async with AsyncSession(engine) as session:
+    async with AsyncSession(engine, expire_on_commit=False) as session:
+        yield session
+
+# 조회 전용 종속성 (읽기 전용 풀 사용)
+async def get_read_db():
+    async with AsyncSession(read_engine, expire_on_commit=False) as session:
+        yield session
+
+# 요청 밖(백그라운드 작업 등)에서 쓰는 세션 - 요청 세션은 응답 후 닫히므로 재사용하지 않음
+@asynccontextmanager
+async def session_scope(read_only: bool = False):
+    async with AsyncSession(read_engine if read_only else engine, expire_on_commit=False) as session:
         yield session
 
-# 데이터베이스 초기화 함수 (비동기)
+# 개발용 초기화 - SQLite는 파일(-wal/-shm 포함) 삭제, PostgreSQL은 모든 테이블 삭제
+async def reset_db():
+    if IS_SQLITE:
+        # 새 DB에 이전 WAL 로그가 적용되지 않도록 -wal/-shm 파일까지 삭제
+        for path in (SQLITE_PATH, Path(f"{SQLITE_PATH}-wal"), Path(f"{SQLITE_PATH}-shm")):
+            if path.exists():
+                try:
+                    path.unlink()
+                    logger.info(f"기존 데이터베이스 파일 {path} 삭제됨")
+                except Exception as e:
+                    logger.error(f"DB 파일 삭제 실패: {e}")
+        return
+
+    async with engine.begin() as conn:
+        await conn.run_sync(SQLModel.metadata.drop_all)
+        await conn.exec_driver_sql("DROP TABLE IF EXISTS schema_migrations")
+    logger.info("기존 데이터베이스 테이블 삭제됨")
+
+# 데이터베이스 초기화 함수 (비동기) - 없는 테이블 생성 후 대기 중인 마이그레이션 적용
 async def init_db():
     async with engine.begin() as conn:
-        await conn.run_sync(SQLModel.metadata.create_all) 
\ No newline at end of file
+        await conn.run_sync(SQLModel.metadata.create_all)
+        await conn.run_sync(apply_migrations)
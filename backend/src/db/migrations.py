@@ -0,0 +1,169 @@
+"""기존 DB를 다시 만들지 않고 스키마를 올리는 간단한 마이그레이션 실행기
+
+새 DB는 init_db의 create_all이 현재 모델대로 만들고, 이미 있는 DB는 아래 MIGRATIONS 중
+schema_migrations에 기록되지 않은 항목만 순서대로 적용한다. 각 마이그레이션은 이미 반영된
+스키마에서도 안전하도록(IF NOT EXISTS, 컬럼 존재 확인) 작성한다.
+새 마이그레이션은 목록 끝에 다음 버전 번호로 추가하고, 적용된 항목은 수정하지 않는다.
+
+    python -m src.db.migrations            # 대기 중인 마이그레이션 적용
+    python -m src.db.migrations --status   # 적용 현황 출력
+"""
+from typing import Callable, List, Tuple
+from datetime import datetime
+import argparse
+import asyncio
+import logging
+
+from sqlalchemy import inspect, text
+from sqlalchemy.engine import Connection
+
+logger = logging.getLogger(__name__)
+
+
+def _add_column(connection: Connection, table: str, column: str, ddl: str) -> bool:
+    columns = {c["name"] for c in inspect(connection).get_columns(table)}
+    if column in columns:
+        return False
+    connection.execute(text(f"ALTER TABLE {table} ADD COLUMN {column} {ddl}"))
+    return True
+
+
+def _create_indexes(connection: Connection, indexes: List[Tuple[str, str, Tuple[str, ...]]]):
+    for name, table, columns in indexes:
+        connection.execute(text(f"CREATE INDEX IF NOT EXISTS {name} ON {table} ({', '.join(columns)})"))
+
+
+def _lecture_participant_counter(connection: Connection):
+    if _add_column(connection, "lectures", "active_participant_count", "INTEGER NOT NULL DEFAULT 0"):
+        connection.execute(text(
+            "UPDATE lectures SET active_participant_count = ("
+            "SELECT COUNT(*) FROM lecture_participants "
+            "WHERE lecture_participants.lecture_id = lectures.id AND lecture_participants.is_active)"
+        ))
+
+
+def _hot_path_indexes(connection: Connection):
+    _create_indexes(connection, [
+        ("ix_transcripts_video_id_language", "transcripts", ("video_id", "language")),
+        ("ix_audios_video_id_language_is_processed", "audios", ("video_id", "language", "is_processed")),
+        ("ix_lecture_participants_lecture_id_is_active", "lecture_participants", ("lecture_id", "is_active")),
+        ("ix_lecture_participants_lecture_id_student_id", "lecture_participants", ("lecture_id", "student_id")),
+        ("ix_qa_pairs_video_id_timestamp", "qa_pairs", ("video_id", "timestamp")),
+        ("ix_qa_pairs_user_id_timestamp", "qa_pairs", ("user_id", "timestamp")),
+        ("ix_chat_messages_lecture_id_id", "chat_messages", ("lecture_id", "id")),
+        ("ix_chat_messages_lecture_id_created_at", "chat_messages", ("lecture_id", "created_at")),
+        ("ix_lecture_captions_lecture_id_id", "lecture_captions", ("lecture_id", "id")),
+    ])
+
+
+def _media_probe_columns(connection: Connection):
+    for table, columns in (
+        ("audios", ("codec VARCHAR", "sample_rate INTEGER", "channels INTEGER",
+                    "file_size BIGINT", "file_mtime_ns BIGINT")),
+        ("videos", ("duration_seconds FLOAT", "audio_codec VARCHAR", "sample_rate INTEGER", "channels INTEGER",
+                    "file_size BIGINT", "file_mtime_ns BIGINT")),
+    ):
+        for column in columns:
+            name, ddl = column.split(" ", 1)
+            _add_column(connection, table, name, ddl)
+    if connection.dialect.name == "postgresql":
+        # 나노초 수정 시각은 INTEGER(32비트)를 넘으므로 BIGINT로 변경 (SQLite는 정수 크기 구분 없음)
+        connection.execute(text(
+            "ALTER TABLE static_files ALTER COLUMN size TYPE BIGINT, ALTER COLUMN mtime_ns TYPE BIGINT"
+        ))
+
+
+def _content_hash_columns(connection: Connection):
+    for table in ("videos", "audios"):
+        _add_column(connection, table, "content_hash", "VARCHAR")
+
+
+def _chat_message_username(connection: Connection):
+    # ChatMessage 모델에는 있지만 마이그레이션 없이 추가되어 기존 DB에 없던 컬럼 - 기존 메시지는 작성자의 현재 이름으로 채움
+    if _add_column(connection, "chat_messages", "username", "VARCHAR"):
+        connection.execute(text(
+            "UPDATE chat_messages SET username = ("
+            "SELECT users.username FROM users WHERE users.id = chat_messages.user_id)"
+        ))
+
+
+def _participant_student_index(connection: Connection):
+    # (lecture_id, is_active)와 같은 수의 등호 조건이라 SQLite가 그쪽을 고르던 문제 - is_active까지 포함해 대체
+    connection.execute(text("DROP INDEX IF EXISTS ix_lecture_participants_lecture_id_student_id"))
+    _create_indexes(connection, [
+        ("ix_lecture_participants_lecture_id_student_id_is_active", "lecture_participants",
+         ("lecture_id", "student_id", "is_active")),
+    ])
+
+
+# (버전, 설명, 적용 함수) - 버전은 1부터 빈틈없이 증가
+MIGRATIONS: List[Tuple[int, str, Callable[[Connection], None]]] = [
+    (1, "lectures.active_participant_count", _lecture_participant_counter),
+    (2, "composite indexes for hot query shapes", _hot_path_indexes),
+    (3, "cached media probe columns on audios/videos", _media_probe_columns),
+    (4, "content hash columns for the artifact cache", _content_hash_columns),
+    (5, "chat_messages.username", _chat_message_username),
+    (6, "lecture participant lookup index includes is_active", _participant_student_index),
+]
+
+
+def _ensure_version_table(connection: Connection):
+    connection.execute(text(
+        "CREATE TABLE IF NOT EXISTS schema_migrations ("
+        "version INTEGER PRIMARY KEY, description VARCHAR NOT NULL, applied_at VARCHAR NOT NULL)"
+    ))
+
+
+def applied_versions(connection: Connection) -> set:
+    _ensure_version_table(connection)
+    return {row[0] for row in connection.execute(text("SELECT version FROM schema_migrations"))}
+
+
+def apply_migrations(connection: Connection) -> List[int]:
+    """대기 중인 마이그레이션을 적용하고 적용한 버전 목록 반환 (동기 연결, 호출자의 트랜잭션 안에서 실행)"""
+    done = applied_versions(connection)
+    applied = []
+    for version, description, upgrade in MIGRATIONS:
+        if version in done:
+            continue
+        upgrade(connection)
+        connection.execute(
+            text("INSERT INTO schema_migrations (version, description, applied_at) VALUES (:v, :d, :t)"),
+            {"v": version, "d": description, "t": datetime.utcnow().isoformat()}
+        )
+        applied.append(version)
+        logger.info(f"🧱 [DB] 마이그레이션 적용 - {version}: {description}")
+    return applied
+
+
+async def run_migrations() -> List[int]:
+    from src.db.database import engine
+
+    async with engine.begin() as conn:
+        return await conn.run_sync(apply_migrations)
+
+
+async def _print_status():
+    from src.db.database import engine
+
+    async with engine.begin() as conn:
+        done = await conn.run_sync(applied_versions)
+    for version, description, _ in MIGRATIONS:
+        print(f"{'✔' if version in done else ' '} {version:>3}  {description}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="DB 스키마 마이그레이션")
+    parser.add_argument("--status", action="store_true", help="적용 현황만 출력")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    if args.status:
+        asyncio.run(_print_status())
+        return
+    applied = asyncio.run(run_migrations())
+    print(f"적용된 마이그레이션: {applied or '없음'}")
+
+
+if __name__ == "__main__":
+    main()
@@ -3,26 +3,35 @@ from fastapi.middleware.cors import CORSMiddleware
 from fastapi.security import OAuth2PasswordBearer
 from fastapi.staticfiles import StaticFiles
 from contextlib import asynccontextmanager
-import sqlite3
-import os
+import asyncio
 import pathlib
 import random
+import time
 from datetime import datetime, timedelta
-from sqlmodel.ext.asyncio.session import AsyncSession
 from sqlmodel import select
 import logging
 import logging.config
 
-from src.db.database import init_db, get_db, DATABASE_URL, engine
+from src.db.database import init_db, get_db, reset_db, SYNC_DATABASE_URL
 from src.core.settings import settings
-from src.views import auth, videos, qa, transcript, audio, lectures, websocket
+from src.views import auth, videos, qa, transcript, audio, lectures, websocket, search
 from src.controllers import stt_controller, stt_controller_fixed
 from src.services.auth import get_current_user, get_password_hash
 from src.controllers.video_controller import initialize_static_videos
 from src.models.user import User, UserRole
-from src.models.video import Video
 from src.models.lecture import Lecture, LectureStatus, LectureParticipant
-from src.services.youtube import extract_thumbnail_from_video
+from src.services.heartbeat import heartbeat_scheduler
+from src.services.loop_monitor import loop_lag_monitor
+from src.services.response_cache import response_cache
+from src.services.participant_counter import participant_counter
+from src.services.static_library import static_ingestor, backfill_static_transcripts
+from src.services.thumbnails import thumbnail_pool
+from src.services.media_probe import media_probe
+from src.services.artifact_cache import artifact_cache
+from src.services.sharding import shard_router
+from src.services.chat_persister import chat_persister
+from src.services.caption_persister import caption_persister
+from src.services.search_index import search_indexer
 
 # 로깅 설정
 logging.config.dictConfig({
@@ -109,9 +118,8 @@ def create_test_data_sync():
     """동기 방식으로 테스트 데이터 생성"""
     from sqlmodel import Session, create_engine
 
-    # 동기 엔진 생성
-    sync_db_url = DATABASE_URL.replace("sqlite+aiosqlite://", "sqlite://")
-    sync_engine = create_engine(sync_db_url)
+    # 동기 엔진 생성 (PostgreSQL이면 psycopg 드라이버 사용)
+    sync_engine = create_engine(SYNC_DATABASE_URL)
 
     with Session(sync_engine) as session:
         instructor_user_id = None
@@ -151,6 +159,14 @@ def create_test_data_sync():
         # 테스트 강의 데이터 생성
         if instructor_user_id and student_ids:
             for lecture_data in TEST_LECTURES:
+                # DB를 유지하므로 이미 만든 테스트 강의는 다시 만들지 않음
+                existing_lecture = session.exec(select(Lecture.id).where(
+                    Lecture.title == lecture_data["title"],
+                    Lecture.instructor_id == instructor_user_id
+                )).first()
+                if existing_lecture:
+                    continue
+
                 lecture = Lecture(
                     title=lecture_data["title"],
                     description=lecture_data["description"],
@@ -177,107 +193,89 @@ def create_test_data_sync():
                     )
                     session.add(participant)
 
+                lecture.active_participant_count = num_participants
+                session.add(lecture)
                 session.commit()
                 logger.info(f"강의 '{lecture.title}'에 {num_participants}명의 참여자 추가됨")
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     logger.info("애플리케이션 시작 중...")
+
+    # WebSocket 하트비트 스케줄러 및 샤드 이벤트 수신 시작
+    heartbeat_scheduler.start()
+    loop_lag_monitor.start()
+    shard_router.start()
+    chat_persister.start()
+    caption_persister.start()
+    search_indexer.start()
     
-    # 기존 DB 파일 삭제 (있으면)
-    db_path_str = DATABASE_URL.replace("sqlite+aiosqlite:///", "").replace("./", "")
-    db_file_path = pathlib.Path(db_path_str)
-    if db_file_path.exists():
-        try:
-            os.remove(db_file_path)
-            logger.info(f"기존 데이터베이스 파일 {db_file_path} 삭제됨")
-        except Exception as e:
-            logger.error(f"DB 파일 삭제 실패: {e}")
+    if not shard_router.is_primary:
+        # 보조 샤드는 주 샤드가 DB를 초기화한 뒤 시작되므로 초기화를 건너뜀
+        logger.info(f"샤드 {shard_router.index} 시작 - DB 초기화 생략")
+        await search_indexer.ensure_schema()
+        participant_counter.start()
+        yield
+        thumbnail_pool.shutdown()
+        await participant_counter.stop()
+        await chat_persister.stop()
+        await caption_persister.stop()
+        await search_indexer.stop()
+        await shard_router.stop()
+        await heartbeat_scheduler.stop()
+        await loop_lag_monitor.stop()
+        return
+    
+    if settings.db_reset_on_startup:
+        await reset_db()
 
-    # 애플리케이션 시작 시 DB 초기화
+    # 애플리케이션 시작 시 DB 준비 (없는 테이블 생성 + 대기 중인 마이그레이션 적용, 기존 데이터 유지)
+    backfill_task = None
     try:
+        startup_start = time.perf_counter()
         await init_db()
-        logger.info("데이터베이스 새로 초기화됨")
-
-        # 테스트 데이터를 동기 방식으로 생성
-        create_test_data_sync()
-        logger.info("테스트 데이터 생성 완료")
-
-        # static 폴더의 영상을 DB에 등록 (비동기 방식)
-        async with AsyncSession(engine) as db:
-            static_folder = pathlib.Path("static")
-            thumbnail_dir = static_folder / "thumbnails"
-            thumbnail_dir.mkdir(parents=True, exist_ok=True)
-            if static_folder.exists() and static_folder.is_dir():
-                video_extensions = ['.mp4', '.avi', '.mov', '.mkv']
-
-                # 첫 번째 사용자(교수)를 기본 사용자로 설정
-                result = await db.exec(select(User).where(User.username == "professor"))
-                default_user = result.first()
-                if not default_user:
-                    logger.warning("기본 사용자를 찾을 수 없습니다.")
-                    yield
-                    return
-
-                # ID를 별도 변수로 저장하여 lazy loading 문제 회피
-                default_user_id = default_user.id
-
-                for file_path in static_folder.iterdir():
-                    if file_path.is_file() and file_path.suffix.lower() in video_extensions:
-                        url = f"static/{file_path.name}"
-
-                        # URL로 이미 존재하는 비디오 확인
-                        result = await db.exec(select(Video).where(Video.url == url))
-                        existing_video = result.first()
-                        
-                        if existing_video:
-                            logger.info(f"이미 등록된 비디오 스킵: {file_path.name} (id={existing_video.id})")
-                            db_video = existing_video
-                        else:
-                            # 새 비디오 등록 (썸네일 없이)
-                            db_video = Video(
-                                url=url,
-                                title=file_path.stem,  # 파일 이름을 제목으로 사용
-                                thumbnail_url="",  # 일단 빈 값
-                                description=f"{file_path.name} 영상입니다.",
-                                transcript="",
-                                summary="",
-                                user_id=default_user_id,  # 별도 변수 사용
-                                is_public=True,  # 공개 비디오로 설정
-                                duration="00:00"  # 기본 값
-                            )
-                            db.add(db_video)
-                            await db.commit()
-                            await db.refresh(db_video)
-                            logger.info(f"비디오 등록됨: {file_path.name} (id={db_video.id})")
-                        # 2. 썸네일 생성 (video_id 기준)
-                        thumbnail_path = thumbnail_dir / f"{db_video.id}.jpg"
-                        if not thumbnail_path.exists():
-                            try:
-                                logger.info(f"썸네일 생성: {file_path} -> {thumbnail_path}")
-                                extract_thumbnail_from_video(str(file_path), str(thumbnail_path), time=5)
-                                logger.info(f"썸네일 생성 성공: {thumbnail_path}")
-                                # 3. DB에 썸네일 경로 업데이트
-                                db_video.thumbnail_url = f"static/thumbnails/{db_video.id}.jpg"
-                                db.add(db_video)
-                                await db.commit()
-                            except Exception as e:
-                                logger.error(f"썸네일 생성 실패: {e}")
-                        elif not db_video.thumbnail_url:
-                            # 썸네일이 이미 존재하지만 DB에 경로가 없는 경우 경로 업데이트
-                            logger.info(f"기존 썸네일 발견, DB 경로 업데이트: {thumbnail_path}")
-                            db_video.thumbnail_url = f"static/thumbnails/{db_video.id}.jpg"
-                            db.add(db_video)
-                            await db.commit()
+        logger.info("데이터베이스 준비 완료")
+
+        # 검색 색인 준비 후 바뀐 자막 파일만 백그라운드에서 색인
+        await search_indexer.ensure_schema()
+        backfill_task = asyncio.create_task(backfill_static_transcripts(pathlib.Path("static/transcripts")))
+
+        if settings.seed_test_data:
+            # 테스트 데이터를 동기 방식으로 생성 (bcrypt 해싱은 스레드에서)
+            await asyncio.to_thread(create_test_data_sync)
+            logger.info("테스트 데이터 생성 완료")
+
+        # static 폴더의 새로 생기거나 바뀐 영상만 백그라운드에서 등록 (진행 상황: /health/ingest)
+        if settings.static_sync_on_startup:
+            static_ingestor.start(pathlib.Path("static"))
+        logger.info(f"⏱️ 시작 준비 소요시간: {(time.perf_counter() - startup_start) * 1000:.1f}ms")
     except Exception as e:
         logger.critical(f"애플리케이션 초기화 실패: {e}", exc_info=True)
         raise
 
     logger.info("애플리케이션 초기화 완료")
+    # 시드 데이터가 들어간 뒤 참여자 카운터 대조 시작 (첫 실행에서 미러를 채움)
+    participant_counter.start()
+    shard_router.mark_ready()
     yield
 
     # 애플리케이션 종료 시 필요한 정리 작업
     logger.info("애플리케이션 종료 중...")
+    if backfill_task is not None and not backfill_task.done():
+        # 자막 색인이 끝나지 않았으면 중단 (매니페스트는 갱신되지 않아 다음 시작 때 다시 색인)
+        backfill_task.cancel()
+        try:
+            await backfill_task
+        except asyncio.CancelledError:
+            pass
+    await static_ingestor.stop()
+    await participant_counter.stop()
+    await chat_persister.stop()
+    await caption_persister.stop()
+    await search_indexer.stop()
+    await shard_router.stop()
+    await heartbeat_scheduler.stop()
+    await loop_lag_monitor.stop()
 
 app = FastAPI(
     title="StudyTube API",
@@ -308,6 +306,7 @@ app.include_router(transcript.router)
 app.include_router(audio.router)
 app.include_router(lectures.router)
 app.include_router(websocket.router)
+app.include_router(search.router)
 
 # STT 및 번역 라우터 추가
 app.include_router(stt_controller.router, prefix="/api/stt", tags=["STT"])
@@ -320,6 +319,36 @@ def read_root():
     return {"message": "StudyTube 백엔드 서버 동작 중!"}
 
 
+@app.get("/health/loop")
+def get_loop_health():
+    """이벤트 루프 지연 통계 반환"""
+    return loop_lag_monitor.get_stats()
+
+
+@app.get("/health/cache")
+def get_cache_health():
+    """응답 캐시 적중률/절약 바이트 통계 반환"""
+    return response_cache.get_stats()
+
+
+@app.get("/health/ingest")
+def get_ingest_health():
+    """static/ 영상 등록/썸네일 생성 진행 상황 반환"""
+    return static_ingestor.get_stats()
+
+
+@app.get("/health/probe")
+def get_probe_health():
+    """미디어 길이 조회 통계 (헤더 파싱/ffprobe 보충/행 캐시 적중) 반환"""
+    return media_probe.get_stats()
+
+
+@app.get("/health/artifacts")
+def get_artifact_health():
+    """처리 결과 캐시 단계별 적중률/재사용 바이트/삭제 통계 반환"""
+    return artifact_cache.get_stats()
+
+
 @app.get("/test-accounts")
 def get_test_accounts():
     """테스트 계정 목록 반환"""
@@ -340,3 +369,15 @@ def get_test_accounts():
 async def read_users_me(current_user = Depends(get_current_user)):
     logger.debug(f"현재 사용자 정보 요청: {current_user.username}")
     return current_user
+
+
+if __name__ == "__main__":
+    import uvicorn
+
+    uvicorn.run(
+        "src.main:app",
+        host=settings.host,
+        port=settings.port,
+        reload=settings.debug,
+        ws_per_message_deflate=settings.ws_per_message_deflate
+    )
@@ -5,6 +5,9 @@ from src.models.transcript import Transcript, TranscriptBase, TranscriptCreate,
 from src.models.audio import Audio, AudioBase, AudioCreate, AudioRead
 from src.models.lecture import Lecture, LectureBase, LectureCreate, LectureRead, LectureUpdate, LectureParticipant
 from src.models.chat import ChatMessage, ChatMessageBase
+from src.models.caption import LectureCaption
+from src.models.static_file import StaticFile
+from src.models.artifact import Artifact
 
 # 모든 모델을 가져와서 DB 초기화 시 사용할 수 있도록 함 
 
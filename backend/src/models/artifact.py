@@ -0,0 +1,15 @@
+from datetime import datetime
+from sqlalchemy import BigInteger
+from sqlmodel import Field, SQLModel
+
+class Artifact(SQLModel, table=True):
+    """처리 결과 캐시 색인 - 입력 내용 해시와 단계별 파라미터로 만든 키 -> 저장된 결과 파일"""
+    __tablename__ = "artifacts"
+
+    key: str = Field(primary_key=True)  # blake2b(단계, 입력 해시, 파라미터)
+    stage: str = Field(index=True)  # audio / transcript / translation / tts
+    path: str  # 캐시 폴더 기준 상대 경로
+    size: int = Field(sa_type=BigInteger)
+    hits: int = 0
+    created_at: datetime = Field(default_factory=datetime.utcnow)
+    last_used_at: datetime = Field(default_factory=datetime.utcnow, index=True)  # 용량 초과 시 오래 안 쓴 것부터 삭제
@@ -1,5 +1,6 @@
 from typing import Optional
 from datetime import datetime
+from sqlalchemy import BigInteger, Index
 from sqlmodel import Field, SQLModel, Relationship
 
 class AudioBase(SQLModel):
@@ -8,10 +9,20 @@ class AudioBase(SQLModel):
 
 class Audio(AudioBase, table=True):
     __tablename__ = "audios"
+    __table_args__ = (
+        Index("ix_audios_video_id_language_is_processed", "video_id", "language", "is_processed"),
+    )
     
     id: Optional[int] = Field(default=None, primary_key=True)
     file_path: str  # 오디오 파일 경로
     duration: Optional[float] = None  # 오디오 길이 (초)
+    # 헤더 조회 결과 캐시 - file_size/file_mtime_ns가 파일과 같으면 다시 조회하지 않음
+    codec: Optional[str] = None
+    sample_rate: Optional[int] = None
+    channels: Optional[int] = None
+    file_size: Optional[int] = Field(default=None, sa_type=BigInteger)
+    file_mtime_ns: Optional[int] = Field(default=None, sa_type=BigInteger)
+    content_hash: Optional[str] = None  # 파일 내용 해시 - 자막 결과 캐시 키
     is_processed: bool = Field(default=False)  # 처리 완료 여부
     created_at: datetime = Field(default_factory=datetime.utcnow)
     
@@ -25,5 +36,8 @@ class AudioRead(AudioBase):
     id: int
     file_path: str
     duration: Optional[float] = None
+    codec: Optional[str] = None
+    sample_rate: Optional[int] = None
+    channels: Optional[int] = None
     is_processed: bool
     created_at: datetime 
\ No newline at end of file
@@ -0,0 +1,18 @@
+from typing import Optional
+from datetime import datetime
+from sqlalchemy import Index
+from sqlmodel import Field, SQLModel
+
+class LectureCaption(SQLModel, table=True):
+    __tablename__ = "lecture_captions"
+    # 강의별 커서(id) 페이지네이션/내보내기용 복합 인덱스
+    __table_args__ = (
+        Index("ix_lecture_captions_lecture_id_id", "lecture_id", "id"),
+    )
+
+    id: Optional[int] = Field(default=None, primary_key=True)
+    lecture_id: int = Field(foreign_key="lectures.id")
+    text: str
+    translated_text: Optional[str] = Field(default=None)
+    language: Optional[str] = Field(default=None)
+    created_at: datetime = Field(default_factory=datetime.utcnow)
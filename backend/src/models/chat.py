@@ -1,5 +1,6 @@
 from typing import Optional
 from datetime import datetime
+from sqlalchemy import Index
 from sqlmodel import Field, SQLModel, Relationship
 
 class ChatMessageBase(SQLModel):
@@ -8,12 +9,19 @@ class ChatMessageBase(SQLModel):
 
 class ChatMessage(ChatMessageBase, table=True):
     __tablename__ = "chat_messages"
-    
+    # 강의별 커서(id) 페이지네이션용 복합 인덱스
+    __table_args__ = (
+        Index("ix_chat_messages_lecture_id_id", "lecture_id", "id"),
+        Index("ix_chat_messages_lecture_id_created_at", "lecture_id", "created_at"),
+    )
+
     id: Optional[int] = Field(default=None, primary_key=True)
     lecture_id: int = Field(foreign_key="lectures.id")
     user_id: int = Field(foreign_key="users.id")
+    # 작성 시점의 사용자 이름 (히스토리 조회 시 users 조인 제거)
+    username: Optional[str] = Field(default=None)
     created_at: datetime = Field(default_factory=datetime.utcnow)
-    
+
     # Relationships
     lecture: "Lecture" = Relationship(back_populates="chat_messages")
-    user: "User" = Relationship(back_populates="chat_messages") 
\ No newline at end of file
+    user: "User" = Relationship(back_populates="chat_messages")
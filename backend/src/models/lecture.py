@@ -1,5 +1,6 @@
 from typing import Optional, List
 from datetime import datetime
+from sqlalchemy import Index
 from sqlmodel import Field, SQLModel, Relationship
 from enum import Enum
 
@@ -28,6 +29,8 @@ class Lecture(LectureBase, table=True):
     actual_start: Optional[datetime] = None
     actual_end: Optional[datetime] = None
     created_at: datetime = Field(default_factory=datetime.utcnow)
+    # 활성 참여자 수 (참석/퇴장 시 원자적으로 증감, 주기적으로 lecture_participants와 대조)
+    active_participant_count: int = Field(default=0)
     
     # 관계 설정
     instructor: "User" = Relationship(back_populates="lectures")
@@ -53,6 +56,10 @@ class LectureUpdate(SQLModel):
 
 class LectureParticipant(SQLModel, table=True):
     __tablename__ = "lecture_participants"
+    __table_args__ = (
+        Index("ix_lecture_participants_lecture_id_is_active", "lecture_id", "is_active"),
+        Index("ix_lecture_participants_lecture_id_student_id_is_active", "lecture_id", "student_id", "is_active"),
+    )
 
     id: Optional[int] = Field(default=None, primary_key=True)
     lecture_id: int = Field(foreign_key="lectures.id")
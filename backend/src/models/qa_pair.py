@@ -1,5 +1,6 @@
 from typing import Optional
 from datetime import datetime
+from sqlalchemy import Index
 from sqlmodel import Field, SQLModel, Relationship
 
 class QABase(SQLModel):
@@ -8,6 +9,11 @@ class QABase(SQLModel):
 
 class QAPair(QABase, table=True):
     __tablename__ = "qa_pairs"
+    # 영상별/사용자별 최신순 목록용 복합 인덱스
+    __table_args__ = (
+        Index("ix_qa_pairs_video_id_timestamp", "video_id", "timestamp"),
+        Index("ix_qa_pairs_user_id_timestamp", "user_id", "timestamp"),
+    )
 
     id: Optional[int] = Field(default=None, primary_key=True)
     answer: str
@@ -0,0 +1,14 @@
+from typing import Optional
+from datetime import datetime
+from sqlalchemy import BigInteger
+from sqlmodel import Field, SQLModel
+
+class StaticFile(SQLModel, table=True):
+    """static/ 파일 매니페스트 - 크기/수정 시각이 그대로면 시작 시 다시 처리하지 않음"""
+    __tablename__ = "static_files"
+
+    path: str = Field(primary_key=True)  # static/ 기준 상대 경로
+    size: int = Field(sa_type=BigInteger)
+    mtime_ns: int = Field(sa_type=BigInteger)  # 나노초 - PostgreSQL INTEGER 범위를 넘음
+    video_id: Optional[int] = Field(default=None, foreign_key="videos.id")
+    synced_at: datetime = Field(default_factory=datetime.utcnow)
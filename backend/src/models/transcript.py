@@ -1,5 +1,6 @@
 from typing import Optional
 from datetime import datetime
+from sqlalchemy import Index
 from sqlmodel import Field, SQLModel, Relationship
 
 class TranscriptBase(SQLModel):
@@ -9,6 +10,9 @@ class TranscriptBase(SQLModel):
 
 class Transcript(TranscriptBase, table=True):
     __tablename__ = "transcripts"
+    __table_args__ = (
+        Index("ix_transcripts_video_id_language", "video_id", "language"),
+    )
 
     id: Optional[int] = Field(default=None, primary_key=True)
     timestamps: Optional[str] = None  # JSON 형식의 타임스탬프 정보
@@ -1,5 +1,6 @@
 from typing import Optional, List
 from datetime import datetime
+from sqlalchemy import BigInteger
 from sqlmodel import Field, SQLModel, Relationship
 
 
@@ -22,6 +23,14 @@ class Video(VideoBase, table=True):
     is_public: bool = Field(default=False)  # 공개 여부
     is_processed: bool = Field(default=False)  # AI 처리 완료 여부
     processing_error: Optional[str] = None  # 처리 중 발생한 오류
+    # 로컬 영상 파일 헤더 조회 결과 캐시 (duration 문자열과 함께 갱신)
+    duration_seconds: Optional[float] = None
+    audio_codec: Optional[str] = None
+    sample_rate: Optional[int] = None
+    channels: Optional[int] = None
+    file_size: Optional[int] = Field(default=None, sa_type=BigInteger)
+    file_mtime_ns: Optional[int] = Field(default=None, sa_type=BigInteger)
+    content_hash: Optional[str] = None  # 파일 내용 해시 - 처리 결과 캐시 키 (크기/수정 시각이 바뀌면 다시 계산)
     
     # 관계 설정
     user: Optional["User"] = Relationship(back_populates="videos")
@@ -0,0 +1 @@
+# 집계(aggregate)별 비동기 조회/저장 함수 모음 - 컨트롤러는 세션을 직접 다루지 않고 이 함수들을 사용
@@ -0,0 +1,35 @@
+from typing import Iterable, List, Optional
+from datetime import datetime
+from sqlalchemy import delete, func, update
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from src.models.artifact import Artifact
+
+
+async def get_artifact(db: AsyncSession, key: str) -> Optional[Artifact]:
+    return await db.get(Artifact, key)
+
+
+async def touch_artifact(db: AsyncSession, key: str):
+    """적중 횟수/마지막 사용 시각 갱신 (조건부 UPDATE 한 문장, 커밋은 호출자가 수행)"""
+    await db.execute(
+        update(Artifact).where(Artifact.key == key)
+        .values(hits=Artifact.hits + 1, last_used_at=datetime.utcnow())
+    )
+
+
+async def get_artifact_total_size(db: AsyncSession) -> int:
+    result = await db.exec(select(func.coalesce(func.sum(Artifact.size), 0)))
+    return int(result.one())
+
+
+async def list_least_recently_used(db: AsyncSession, limit: int) -> List[Artifact]:
+    result = await db.exec(select(Artifact).order_by(Artifact.last_used_at).limit(limit))
+    return list(result.all())
+
+
+async def delete_artifacts(db: AsyncSession, keys: Iterable[str]):
+    keys = list(keys)
+    if keys:
+        await db.execute(delete(Artifact).where(Artifact.key.in_(keys)))
@@ -0,0 +1,13 @@
+from typing import Optional
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from src.models.audio import Audio
+
+
+async def get_audio(db: AsyncSession, video_id: int, language: str, processed_only: bool = False) -> Optional[Audio]:
+    statement = select(Audio).where(Audio.video_id == video_id, Audio.language == language)
+    if processed_only:
+        statement = statement.where(Audio.is_processed == True)
+    result = await db.exec(statement)
+    return result.first()
@@ -0,0 +1,9 @@
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+
+async def save(db: AsyncSession, instance):
+    """추가/수정한 객체를 커밋하고 DB 값으로 갱신"""
+    db.add(instance)
+    await db.commit()
+    await db.refresh(instance)
+    return instance
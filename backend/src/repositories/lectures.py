@@ -0,0 +1,111 @@
+from typing import List, Optional, Tuple
+from datetime import datetime
+from sqlalchemy import func, update
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from src.models.lecture import Lecture, LectureParticipant
+from src.models.user import User
+
+
+async def get_lecture(db: AsyncSession, lecture_id: int) -> Optional[Lecture]:
+    return await db.get(Lecture, lecture_id)
+
+
+async def get_lecture_capacity(db: AsyncSession, lecture_id: int) -> Optional[Tuple[int, int]]:
+    """입장 제어용 (max_participants, instructor_id) - 강의 전체 행을 로드하지 않음"""
+    result = await db.exec(
+        select(Lecture.max_participants, Lecture.instructor_id).where(Lecture.id == lecture_id)
+    )
+    return result.first()
+
+
+async def is_lecture_participant(db: AsyncSession, lecture_id: int, user_id: int) -> bool:
+    """강의에 참석한 적이 있는지 (퇴장한 기록 포함)"""
+    result = await db.exec(
+        select(LectureParticipant.id).where(
+            LectureParticipant.lecture_id == lecture_id,
+            LectureParticipant.student_id == user_id
+        ).limit(1)
+    )
+    return result.first() is not None
+
+
+def _lecture_summary_query():
+    # 강의 + 강사 이름 (참여자 수는 강의 행의 active_participant_count 사용)
+    return select(Lecture, User.username).outerjoin(User, User.id == Lecture.instructor_id)
+
+
+async def list_lecture_summaries(db: AsyncSession, skip: int = 0, limit: int = 100) -> List[Tuple[Lecture, Optional[str]]]:
+    """(강의, 강사 이름) 목록 - id 순 페이지네이션"""
+    result = await db.exec(_lecture_summary_query().order_by(Lecture.id).offset(skip).limit(limit))
+    return result.all()
+
+
+async def get_lecture_summary(db: AsyncSession, lecture_id: int) -> Optional[Tuple[Lecture, Optional[str]]]:
+    result = await db.exec(_lecture_summary_query().where(Lecture.id == lecture_id))
+    return result.first()
+
+
+async def increment_participant_count(db: AsyncSession, lecture_id: int, enforce_capacity: bool = True) -> Optional[int]:
+    """
+    활성 참여자 수를 1 늘리고 새 값을 반환합니다.
+
+    정원 검사와 증가를 조건부 UPDATE 한 문장으로 처리하므로 동시 참석 요청이 정원을 넘길 수 없습니다.
+    정원이 찼거나 강의가 없으면 None을 반환합니다. (커밋은 호출자가 수행)
+    """
+    statement = update(Lecture).where(Lecture.id == lecture_id)
+    if enforce_capacity:
+        statement = statement.where(Lecture.active_participant_count < Lecture.max_participants)
+    result = await db.execute(
+        statement
+        .values(active_participant_count=Lecture.active_participant_count + 1)
+        .returning(Lecture.active_participant_count)
+        .execution_options(synchronize_session=False)
+    )
+    return result.scalar_one_or_none()
+
+
+async def decrement_participant_count(db: AsyncSession, lecture_id: int) -> Optional[int]:
+    """활성 참여자 수를 1 줄이고 새 값을 반환 (0 아래로 내려가지 않음, 커밋은 호출자가 수행)"""
+    result = await db.execute(
+        update(Lecture)
+        .where(Lecture.id == lecture_id, Lecture.active_participant_count > 0)
+        .values(active_participant_count=Lecture.active_participant_count - 1)
+        .returning(Lecture.active_participant_count)
+        .execution_options(synchronize_session=False)
+    )
+    return result.scalar_one_or_none()
+
+
+async def deactivate_participant(db: AsyncSession, participant_id: int, left_at: datetime) -> bool:
+    """참석 기록을 비활성화 - 동시 퇴장 요청 중 실제로 바꾼 한 건만 True (커밋은 호출자가 수행)"""
+    result = await db.execute(
+        update(LectureParticipant)
+        .where(LectureParticipant.id == participant_id, LectureParticipant.is_active == True)
+        .values(is_active=False, left_at=left_at)
+        .execution_options(synchronize_session=False)
+    )
+    return result.rowcount == 1
+
+
+async def reconcile_participant_counts(db: AsyncSession) -> List[Tuple[int, int]]:
+    """lecture_participants 기준으로 어긋난 카운터만 다시 계산 - 고쳐진 (lecture_id, 새 값) 목록 반환"""
+    active_count = (
+        select(func.count(LectureParticipant.id))
+        .where(LectureParticipant.lecture_id == Lecture.id, LectureParticipant.is_active == True)
+        .scalar_subquery()
+    )
+    result = await db.execute(
+        update(Lecture)
+        .where(Lecture.active_participant_count != active_count)
+        .values(active_participant_count=active_count)
+        .returning(Lecture.id, Lecture.active_participant_count)
+        .execution_options(synchronize_session=False)
+    )
+    return result.all()
+
+
+async def list_participant_counts(db: AsyncSession) -> List[Tuple[int, int]]:
+    result = await db.exec(select(Lecture.id, Lecture.active_participant_count))
+    return result.all()
@@ -0,0 +1,25 @@
+from typing import List, Optional
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from src.models.qa_pair import QAPair
+
+
+async def list_user_qa_pairs(db: AsyncSession, user_id: int, video_id: Optional[int] = None,
+                             skip: int = 0, limit: int = 100) -> List[QAPair]:
+    statement = select(QAPair).where(QAPair.user_id == user_id)
+    if video_id:
+        statement = statement.where(QAPair.video_id == video_id)
+    result = await db.exec(statement.order_by(QAPair.timestamp.desc()).offset(skip).limit(limit))
+    return result.all()
+
+
+async def list_video_qa_pairs(db: AsyncSession, video_id: int, skip: int = 0, limit: int = 100) -> List[QAPair]:
+    result = await db.exec(
+        select(QAPair)
+        .where(QAPair.video_id == video_id)
+        .order_by(QAPair.timestamp.desc())
+        .offset(skip)
+        .limit(limit)
+    )
+    return result.all()
@@ -0,0 +1,20 @@
+from typing import Dict, Iterable
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from src.models.static_file import StaticFile
+
+
+async def load_static_manifest(db: AsyncSession, prefix: str) -> Dict[str, StaticFile]:
+    """prefix로 시작하는 매니페스트 항목 전체를 경로 기준 dict로 반환"""
+    result = await db.exec(select(StaticFile).where(StaticFile.path.startswith(prefix)))
+    return {entry.path: entry for entry in result.all()}
+
+
+async def get_static_files(db: AsyncSession, paths: Iterable[str]) -> Dict[str, StaticFile]:
+    """지정한 경로의 매니페스트 항목 (없는 경로는 결과에 없음)"""
+    paths = list(paths)
+    if not paths:
+        return {}
+    result = await db.exec(select(StaticFile).where(StaticFile.path.in_(paths)))
+    return {entry.path: entry for entry in result.all()}
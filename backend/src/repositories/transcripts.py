@@ -0,0 +1,21 @@
+from typing import List, Optional
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from src.models.transcript import Transcript
+
+
+async def get_transcript(db: AsyncSession, video_id: int, language: str) -> Optional[Transcript]:
+    result = await db.exec(
+        select(Transcript).where(Transcript.video_id == video_id, Transcript.language == language)
+    )
+    return result.first()
+
+
+async def get_transcript_by_id(db: AsyncSession, transcript_id: int) -> Optional[Transcript]:
+    return await db.get(Transcript, transcript_id)
+
+
+async def list_video_transcripts(db: AsyncSession, video_id: int) -> List[Transcript]:
+    result = await db.exec(select(Transcript).where(Transcript.video_id == video_id))
+    return result.all()
@@ -0,0 +1,82 @@
+from typing import Dict, Iterable, List, Optional
+from sqlalchemy import insert, update
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+from sqlalchemy.orm import selectinload
+
+from src.models.video import Video
+
+
+async def get_video(db: AsyncSession, video_id: int) -> Optional[Video]:
+    return await db.get(Video, video_id)
+
+
+async def get_video_by_url(db: AsyncSession, url: str) -> Optional[Video]:
+    result = await db.exec(select(Video).where(Video.url == url))
+    return result.first()
+
+
+async def get_video_with_media(db: AsyncSession, video_id: int) -> Optional[Video]:
+    """자막/오디오 관계를 함께 로드 (async 세션에서는 lazy loading 불가)"""
+    result = await db.exec(
+        select(Video)
+        .where(Video.id == video_id)
+        .options(selectinload(Video.transcripts), selectinload(Video.audios))
+    )
+    return result.first()
+
+
+async def list_user_videos(db: AsyncSession, user_id: int, skip: int = 0, limit: int = 100) -> List[Video]:
+    result = await db.exec(select(Video).where(Video.user_id == user_id).offset(skip).limit(limit))
+    return result.all()
+
+
+async def list_public_videos(db: AsyncSession, skip: int = 0, limit: int = 100) -> List[Video]:
+    result = await db.exec(select(Video).where(Video.is_public == True).offset(skip).limit(limit))
+    return result.all()
+
+
+# SQLite 바인드 변수 제한을 넘지 않도록 IN 목록을 나눠 조회
+IN_CHUNK_SIZE = 500
+
+
+async def get_video_ids_by_url(db: AsyncSession, urls: Iterable[str]) -> Dict[str, int]:
+    """url -> id (등록되지 않은 url은 빠짐)"""
+    urls = list(urls)
+    found = {}
+    for start in range(0, len(urls), IN_CHUNK_SIZE):
+        result = await db.exec(select(Video.url, Video.id).where(Video.url.in_(urls[start:start + IN_CHUNK_SIZE])))
+        found.update(result.all())
+    return found
+
+
+async def list_videos_by_ids(db: AsyncSession, video_ids: Iterable[int]) -> List[Video]:
+    video_ids = list(video_ids)
+    videos = []
+    for start in range(0, len(video_ids), IN_CHUNK_SIZE):
+        result = await db.exec(select(Video).where(Video.id.in_(video_ids[start:start + IN_CHUNK_SIZE])))
+        videos.extend(result.all())
+    return sorted(videos, key=lambda video: video.id)
+
+
+async def insert_videos(db: AsyncSession, rows: List[dict]) -> Dict[str, int]:
+    """영상 여러 개를 INSERT 한 문장(executemany)으로 등록하고 url -> id 반환 (커밋은 호출자가 수행)"""
+    if not rows:
+        return {}
+    result = await db.execute(insert(Video).returning(Video.url, Video.id), rows)
+    return dict(result.all())
+
+
+async def set_thumbnail_urls(db: AsyncSession, thumbnail_urls: Dict[int, str]):
+    """id -> thumbnail_url 일괄 갱신 (기본 키 기준 bulk UPDATE, 커밋은 호출자가 수행)"""
+    if thumbnail_urls:
+        await db.execute(
+            update(Video),
+            [{"id": video_id, "thumbnail_url": url} for video_id, url in thumbnail_urls.items()]
+        )
+
+
+async def set_media_fields(db: AsyncSession, fields_by_id: Dict[int, dict]):
+    """id -> 길이/코덱 등 미디어 정보 일괄 갱신 (기본 키 기준 bulk UPDATE, 커밋은 호출자가 수행)"""
+    if fields_by_id:
+        await db.execute(update(Video), [{"id": video_id, **fields} for video_id, fields in fields_by_id.items()])
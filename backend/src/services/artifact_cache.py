@@ -0,0 +1,273 @@
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Optional
+from datetime import datetime
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import shutil
+import tempfile
+
+from sqlalchemy.exc import IntegrityError
+
+from src.core.settings import settings
+from src.db.database import session_scope
+from src.models.artifact import Artifact
+from src.repositories.artifacts import (
+    delete_artifacts, get_artifact, get_artifact_total_size, list_least_recently_used, touch_artifact
+)
+
+logger = logging.getLogger(__name__)
+
+# 처리 단계 (키와 통계의 단위)
+AUDIO = "audio"
+TRANSCRIPT = "transcript"
+TRANSLATION = "translation"
+TTS = "tts"
+STAGES = (AUDIO, TRANSCRIPT, TRANSLATION, TTS)
+
+# 한 번에 지우는 최대 항목 수
+EVICT_BATCH = 100
+
+# mkstemp는 0600으로 만들므로 일반 파일 생성과 같은 권한(umask 적용)으로 맞춤
+_UMASK = os.umask(0)
+os.umask(_UMASK)
+FILE_MODE = 0o666 & ~_UMASK
+
+
+def hash_file(path: str) -> str:
+    """파일 내용 해시 (1MiB씩 읽어 메모리 사용 일정)"""
+    digest = hashlib.blake2b(digest_size=32)
+    with open(path, "rb") as f:
+        while chunk := f.read(1024 * 1024):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def hash_json(data: Any) -> str:
+    """키 순서/공백과 상관없이 같은 값이면 같은 해시"""
+    body = json.dumps(data, ensure_ascii=False, sort_keys=True, separators=(",", ":")).encode("utf-8")
+    return hashlib.blake2b(body, digest_size=32).hexdigest()
+
+
+def artifact_key(stage: str, source_hash: str, **params) -> str:
+    """단계 + 입력 내용 해시 + 결과에 영향을 주는 파라미터(모델, 언어, 음성 등) -> 캐시 키"""
+    return hash_json({"stage": stage, "source": source_hash, "params": params})
+
+
+def _replace_atomic(destination: Path, write: Callable[[Any], None]):
+    # 같은 디렉토리의 고유한 임시 파일에 쓴 뒤 교체 - 읽는 쪽이 반쯤 쓴 파일을 보지 않고,
+    # 같은 키를 동시에 쓰는 작업끼리도 임시 파일을 공유하지 않음
+    destination.parent.mkdir(parents=True, exist_ok=True)
+    fd, partial = tempfile.mkstemp(dir=destination.parent, prefix=f".{destination.name}.", suffix=".part")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            os.fchmod(f.fileno(), FILE_MODE)
+            write(f)
+        os.replace(partial, destination)
+    except BaseException:
+        try:
+            os.unlink(partial)
+        except FileNotFoundError:
+            pass
+        raise
+
+
+def _copy_atomic(source: Path, destination: Path):
+    def write(f):
+        with open(source, "rb") as src:
+            shutil.copyfileobj(src, f)
+    _replace_atomic(destination, write)
+
+
+def _write_json_atomic(data: Any, destination: Path) -> int:
+    body = json.dumps(data, ensure_ascii=False).encode("utf-8")
+    _replace_atomic(destination, lambda f: f.write(body))
+    return len(body)
+
+
+def _unlink(paths):
+    for path in paths:
+        try:
+            path.unlink()
+        except FileNotFoundError:
+            pass
+
+
+class ArtifactCache:
+    """
+    내용 기반 처리 결과 캐시
+
+    영상 파일/추출 오디오/자막의 내용 해시와 단계별 파라미터로 키를 만들어,
+    다른 URL로 올린 같은 파일이나 여러 강의에서 재사용한 같은 영상은 추출/Whisper/번역/TTS를 다시 하지 않습니다.
+    결과 파일은 cache_dir에 두고 색인은 DB(artifacts)에 두어 여러 프로세스가 공유하며,
+    전체 크기가 max_bytes를 넘으면 마지막 사용이 오래된 항목부터 지웁니다.
+    캐시 실패는 처리 실패로 이어지지 않고 미스로 처리됩니다.
+    """
+
+    def __init__(self, cache_dir: Path, max_bytes: int, enabled: bool = True):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.enabled = enabled
+        # 같은 프로세스에서 삭제가 겹치지 않도록 직렬화
+        self.evict_lock = asyncio.Lock()
+        self.metrics = {
+            "hits": {stage: 0 for stage in STAGES},
+            "misses": {stage: 0 for stage in STAGES},
+            "stores": 0,
+            "bytes_reused": 0,
+            "evictions": 0,
+            "evicted_bytes": 0,
+            "errors": 0,
+            "start_time": datetime.now().isoformat()
+        }
+
+    def _path(self, stage: str, key: str, suffix: str) -> Path:
+        return self.cache_dir / stage / key[:2] / f"{key}{suffix}"
+
+    async def _lookup(self, stage: str, key: str) -> Optional[Path]:
+        """적중하면 결과 파일 경로 (색인만 있고 파일이 없으면 색인 삭제 후 미스)"""
+        if not self.enabled:
+            return None
+        try:
+            async with session_scope() as db:
+                artifact = await get_artifact(db, key)
+                if artifact is not None:
+                    path = self.cache_dir / artifact.path
+                    if await asyncio.to_thread(path.is_file):
+                        await touch_artifact(db, key)
+                        await db.commit()
+                        self.metrics["hits"][stage] += 1
+                        self.metrics["bytes_reused"] += artifact.size
+                        return path
+                    await delete_artifacts(db, [key])
+                    await db.commit()
+        except Exception as e:
+            self.metrics["errors"] += 1
+            logger.warning(f"⚠️ [결과 캐시] 조회 실패 - {stage}: {e}")
+        self.metrics["misses"][stage] += 1
+        return None
+
+    async def _store(self, stage: str, key: str, suffix: str, write: Callable[[Path], Awaitable[int]]):
+        if not self.enabled:
+            return
+        path = self._path(stage, key, suffix)
+        try:
+            size = await write(path)
+            async with session_scope() as db:
+                db.add(Artifact(key=key, stage=stage, path=path.relative_to(self.cache_dir).as_posix(), size=size))
+                try:
+                    await db.commit()
+                except IntegrityError:
+                    # 다른 요청/프로세스가 같은 키를 먼저 저장 (내용은 같음)
+                    await db.rollback()
+                    return
+            self.metrics["stores"] += 1
+            logger.debug(f"💾 [결과 캐시] 저장 - {stage} {key[:12]}: {size / 1024:.1f}KB")
+            await self.evict()
+        except Exception as e:
+            self.metrics["errors"] += 1
+            logger.warning(f"⚠️ [결과 캐시] 저장 실패 - {stage}: {e}")
+
+    async def fetch_file(self, stage: str, key: str, destination: str) -> bool:
+        """캐시된 결과 파일을 destination에 복사 (미스면 False)"""
+        path = await self._lookup(stage, key)
+        if path is None:
+            return False
+        try:
+            await asyncio.to_thread(_copy_atomic, path, Path(destination))
+        except OSError as e:
+            # 복사 도중 다른 프로세스가 지운 경우 등 - 새로 처리
+            self.metrics["errors"] += 1
+            logger.warning(f"⚠️ [결과 캐시] 복사 실패 - {stage}: {e}")
+            return False
+        return True
+
+    async def fetch_json(self, stage: str, key: str) -> Optional[Any]:
+        path = await self._lookup(stage, key)
+        if path is None:
+            return None
+        try:
+            return await asyncio.to_thread(lambda: json.loads(path.read_bytes()))
+        except (OSError, ValueError) as e:
+            self.metrics["errors"] += 1
+            logger.warning(f"⚠️ [결과 캐시] 읽기 실패 - {stage}: {e}")
+            return None
+
+    async def store_file(self, stage: str, key: str, source: str):
+        """처리 결과 파일을 캐시에 복사 (원본은 이후 덮어써도 캐시에 영향 없음)"""
+        async def write(path: Path) -> int:
+            await asyncio.to_thread(_copy_atomic, Path(source), path)
+            return path.stat().st_size
+        await self._store(stage, key, Path(source).suffix, write)
+
+    async def store_json(self, stage: str, key: str, data: Any):
+        async def write(path: Path) -> int:
+            return await asyncio.to_thread(_write_json_atomic, data, path)
+        await self._store(stage, key, ".json", write)
+
+    async def evict(self) -> int:
+        """전체 크기가 max_bytes 이하가 될 때까지 마지막 사용이 오래된 항목부터 삭제"""
+        removed = 0
+        async with self.evict_lock:
+            async with session_scope() as db:
+                total = await get_artifact_total_size(db)
+                while total > self.max_bytes:
+                    victims = await list_least_recently_used(db, EVICT_BATCH)
+                    if not victims:
+                        break
+                    selected = []
+                    for artifact in victims:
+                        if total <= self.max_bytes:
+                            break
+                        selected.append(artifact)
+                        total -= artifact.size
+                    # 색인을 먼저 지워 다른 요청이 지워질 파일을 적중으로 보지 않게 함
+                    await delete_artifacts(db, [artifact.key for artifact in selected])
+                    await db.commit()
+                    await asyncio.to_thread(_unlink, [self.cache_dir / artifact.path for artifact in selected])
+                    removed += len(selected)
+                    self.metrics["evicted_bytes"] += sum(artifact.size for artifact in selected)
+        if removed:
+            self.metrics["evictions"] += removed
+            logger.info(f"🧹 [결과 캐시] 용량 초과로 {removed}개 삭제 - 남은 크기 {total / 1024 / 1024:.1f}MB")
+        return removed
+
+    async def content_hash(self, row, path: str, refresh_stat: Callable[[Any], Awaitable[bool]]) -> Optional[str]:
+        """
+        Video/Audio 행의 파일 내용 해시 - 크기/수정 시각이 그대로면 행에 저장된 값을 사용합니다.
+
+        Args:
+            row: content_hash/file_size/file_mtime_ns 컬럼이 있는 행 (저장은 호출자가 수행)
+            path: 파일 경로 (로컬 파일이 아니면 None 반환)
+            refresh_stat: 행의 크기/수정 시각 컬럼을 파일과 맞추는 함수 (media_probe)
+        """
+        if not self.enabled or not await asyncio.to_thread(os.path.isfile, path):
+            return None
+        stat = (row.file_size, row.file_mtime_ns)
+        await refresh_stat(row)
+        if row.content_hash is None or stat != (row.file_size, row.file_mtime_ns):
+            row.content_hash = await asyncio.to_thread(hash_file, path)
+        return row.content_hash
+
+    def get_stats(self) -> dict:
+        hits = sum(self.metrics["hits"].values())
+        lookups = hits + sum(self.metrics["misses"].values())
+        return {
+            "enabled": self.enabled,
+            "max_bytes": self.max_bytes,
+            "hit_rate": hits / lookups if lookups else 0,
+            "hit_rate_by_stage": {
+                stage: self.metrics["hits"][stage] / (self.metrics["hits"][stage] + self.metrics["misses"][stage])
+                if self.metrics["hits"][stage] + self.metrics["misses"][stage] else 0
+                for stage in STAGES
+            },
+            **self.metrics
+        }
+
+
+# 전역 처리 결과 캐시
+artifact_cache = ArtifactCache(
+    Path(settings.artifact_cache_dir), settings.artifact_cache_max_bytes, settings.artifact_cache_enabled
+)
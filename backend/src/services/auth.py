@@ -1,15 +1,19 @@
 from passlib.context import CryptContext
 from jose import JWTError, jwt
 from datetime import datetime, timedelta
-from typing import Optional
+from typing import Dict, Optional
 from fastapi import Depends, HTTPException, status, Request
 from fastapi.security import OAuth2PasswordBearer
 from sqlmodel.ext.asyncio.session import AsyncSession
 from sqlmodel import select
+import asyncio
 import logging
+import time
 
-from src.db.database import get_db
+from src.core.settings import settings
+from src.db.database import get_db, read_engine
 from src.models.user import User, TokenData
+from src.services.sharding import shard_router
 
 # 로거 설정
 logger = logging.getLogger(__name__)
@@ -136,3 +140,112 @@ async def get_current_user(
         
     logger.info(f"현재 사용자 검증 성공: {user.username}, ID: {user.id}, 역할: {user.role}")
     return user
+
+
+class UserPrincipal:
+    """WebSocket 연결에 필요한 최소 사용자 정보"""
+
+    __slots__ = ("user_id", "username", "role")
+
+    def __init__(self, user_id: int, username: str, role: str):
+        self.user_id = user_id
+        self.username = username
+        self.role = role
+
+
+# 다른 샤드에 사용자 캐시 무효화를 알리는 채널
+PRINCIPAL_INVALIDATE_CHANNEL = "cache:principal"
+
+
+class PrincipalCache:
+    """WebSocket 핸드셰이크용 사용자 조회 캐시 - 공유 async 엔진 사용, 같은 사용자의 동시 조회는 한 번만 실행"""
+
+    def __init__(self, ttl: float, max_entries: int = 10000):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.entries: Dict[int, tuple] = {}
+        self.inflight: Dict[int, asyncio.Future] = {}
+        self.metrics = {
+            "hits": 0,
+            "misses": 0,
+            "coalesced": 0,
+            "db_lookups": 0,
+            "start_time": datetime.now().isoformat()
+        }
+
+    async def _load(self, user_id: int) -> Optional[UserPrincipal]:
+        self.metrics["db_lookups"] += 1
+        async with AsyncSession(read_engine) as session:
+            user = await session.get(User, user_id)
+        if user is None:
+            return None
+        return UserPrincipal(user.id, user.username, user.role)
+
+    async def get(self, user_id: int) -> Optional[UserPrincipal]:
+        """사용자 정보 조회 (없는 사용자도 TTL 동안 캐시)"""
+        entry = self.entries.get(user_id)
+        if entry is not None and entry[0] > time.monotonic():
+            self.metrics["hits"] += 1
+            return entry[1]
+
+        while (pending := self.inflight.get(user_id)) is not None:
+            # 재접속 폭주 시 같은 사용자의 조회는 진행 중인 조회 결과를 공유
+            self.metrics["coalesced"] += 1
+            try:
+                return await asyncio.shield(pending)
+            except asyncio.CancelledError:
+                # 먼저 조회하던 연결이 취소된 경우만 직접 조회 (이 연결이 취소됐으면 전파)
+                if not pending.cancelled():
+                    raise
+
+        self.metrics["misses"] += 1
+        future = asyncio.get_running_loop().create_future()
+        self.inflight[user_id] = future
+        try:
+            principal = await self._load(user_id)
+        except Exception as e:
+            future.set_exception(e)
+            # 대기자가 없을 때 "exception was never retrieved" 경고 방지
+            future.exception()
+            raise
+        else:
+            self._store(user_id, principal)
+            future.set_result(principal)
+            return principal
+        finally:
+            # 조회 중 취소되면 기다리던 연결이 멈추지 않도록 future도 취소
+            if not future.done():
+                future.cancel()
+            del self.inflight[user_id]
+
+    def _store(self, user_id: int, principal: Optional[UserPrincipal]):
+        now = time.monotonic()
+        if len(self.entries) >= self.max_entries:
+            # 만료 항목 정리 후에도 가득 차면 가장 오래된 항목부터 제거
+            self.entries = {key: entry for key, entry in self.entries.items() if entry[0] > now}
+            while len(self.entries) >= self.max_entries:
+                self.entries.pop(next(iter(self.entries)))
+        self.entries.pop(user_id, None)
+        self.entries[user_id] = (now + self.ttl, principal)
+
+    def invalidate(self, user_id: int):
+        """사용자 이름/역할이 바뀐 뒤 호출 - 다른 샤드의 캐시도 무효화"""
+        self.entries.pop(user_id, None)
+        shard_router.broadcast(PRINCIPAL_INVALIDATE_CHANNEL, user_id, {})
+
+    async def on_shard_invalidate(self, user_id: int, message: dict):
+        self.entries.pop(user_id, None)
+
+    def get_stats(self) -> dict:
+        lookups = self.metrics["hits"] + self.metrics["misses"] + self.metrics["coalesced"]
+        return {
+            "cached_users": len(self.entries),
+            "ttl": self.ttl,
+            "hit_rate": (self.metrics["hits"] + self.metrics["coalesced"]) / lookups if lookups else 0,
+            **self.metrics
+        }
+
+
+# 전역 WebSocket 사용자 캐시
+principal_cache = PrincipalCache(ttl=settings.ws_principal_cache_ttl)
+shard_router.register(PRINCIPAL_INVALIDATE_CHANNEL, principal_cache.on_shard_invalidate)
@@ -0,0 +1,50 @@
+from typing import Optional, Union
+from datetime import datetime
+import logging
+
+from src.core.settings import settings
+from src.models.caption import LectureCaption
+from src.services.search_index import search_indexer
+from src.services.write_behind import WriteBehindPersister
+
+logger = logging.getLogger(__name__)
+
+
+class CaptionPersister(WriteBehindPersister):
+    """완성된 자막 write-behind 저장 - 강의 종료 후 자막 로그 내보내기/검색용"""
+
+    def __init__(self, flush_interval: float, batch_size: int, max_buffer: int,
+                 max_retries: int = 5, dead_letter_limit: int = 1000):
+        super().__init__(
+            LectureCaption, "자막", flush_interval, batch_size, max_buffer,
+            on_commit=search_indexer.index_captions, max_retries=max_retries, dead_letter_limit=dead_letter_limit
+        )
+
+    def enqueue(self, lecture_id: Union[int, str], text: str, translated_text: Optional[str] = None,
+                language: Optional[str] = None, created_at: datetime = None) -> bool:
+        """자막 한 건을 저장 대기열에 추가 (강의 존재 여부는 연결 시 입장 제어에서 확인, 이후 삭제된 강의는 flush에서 dead letter 처리)"""
+        text = (text or "").strip()
+        if not text:
+            return False
+        try:
+            lecture_id = int(lecture_id)
+        except (TypeError, ValueError):
+            return False
+
+        return self.submit({
+            "lecture_id": lecture_id,
+            "text": text,
+            "translated_text": translated_text or None,
+            "language": language,
+            "created_at": created_at or datetime.utcnow()
+        })
+
+
+# 전역 자막 저장 작업 (lifespan에서 시작/종료)
+caption_persister = CaptionPersister(
+    flush_interval=settings.chat_flush_interval_ms / 1000,
+    batch_size=settings.chat_flush_batch_size,
+    max_buffer=settings.chat_buffer_limit,
+    max_retries=settings.chat_flush_max_retries,
+    dead_letter_limit=settings.chat_dead_letter_limit
+)
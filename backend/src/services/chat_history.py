@@ -0,0 +1,122 @@
+from collections import OrderedDict, deque
+from typing import Callable, Deque, Dict, Iterable, List, Optional
+from datetime import datetime
+import logging
+
+from src.core.settings import settings
+
+logger = logging.getLogger(__name__)
+
+
+class LectureTail:
+    """강의 하나의 최신 채팅 (id 오름차순으로 연속된 최신 구간)"""
+
+    __slots__ = ("messages", "complete")
+
+    def __init__(self, capacity: int):
+        self.messages: Deque[dict] = deque(maxlen=capacity)
+        # True면 강의의 전체 히스토리가 캐시에 있음 (더 오래된 메시지 없음)
+        self.complete = False
+
+
+class ChatTailCache:
+    """
+    진행 중인 강의의 최근 채팅 캐시 - 채팅 저장 경로가 갱신하고 히스토리 첫 페이지를 DB 없이 제공
+
+    프로세스별 캐시라 채팅이 저장되는 샤드(강의 소유 샤드)에서만 최신 상태이며, 다른 샤드는 사용하지 않습니다.
+    """
+
+    def __init__(self, capacity: int = 300, max_lectures: int = 256):
+        self.capacity = capacity
+        self.max_lectures = max_lectures
+        self.lectures: "OrderedDict[int, LectureTail]" = OrderedDict()
+        self.metrics = {
+            "hits": 0,
+            "misses": 0,
+            "appended": 0,
+            "primed": 0,
+            "start_time": datetime.now().isoformat()
+        }
+
+    def _tail(self, lecture_id: int, create: bool = True) -> Optional[LectureTail]:
+        tail = self.lectures.get(lecture_id)
+        if tail is None and create:
+            tail = self.lectures[lecture_id] = LectureTail(self.capacity)
+            if len(self.lectures) > self.max_lectures:
+                self.lectures.popitem(last=False)
+        elif tail is not None:
+            self.lectures.move_to_end(lecture_id)
+        return tail
+
+    def append_many(self, messages: Iterable[dict]):
+        """DB에 기록된 메시지(id 포함)를 캐시에 추가 - 채팅 저장 작업이 커밋 후 호출"""
+        for message in messages:
+            tail = self._tail(message["lecture_id"])
+            if tail.messages and tail.messages[-1]["id"] >= message["id"]:
+                continue
+            if len(tail.messages) == tail.messages.maxlen:
+                # 가장 오래된 메시지가 밀려나므로 더 이상 전체 히스토리가 아님
+                tail.complete = False
+            tail.messages.append(message)
+            self.metrics["appended"] += 1
+
+    def prime(self, lecture_id: int, messages: List[dict], complete: bool):
+        """DB에서 읽은 최신 메시지(id 오름차순)로 캐시 채우기 - 조회 중에 추가된 메시지는 유지"""
+        tail = self._tail(lecture_id)
+        last_id = messages[-1]["id"] if messages else 0
+        newer = [message for message in tail.messages if message["id"] > last_id]
+        tail.messages.clear()
+        tail.messages.extend(messages[-self.capacity:])
+        tail.messages.extend(newer)
+        tail.complete = complete and len(messages) + len(newer) <= self.capacity
+        self.metrics["primed"] += 1
+
+    def page(self, lecture_id: int, before_id: Optional[int], limit: int,
+             visible: Optional[Callable[[dict], bool]] = None) -> Optional[List[dict]]:
+        """캐시로 페이지를 완전히 채울 수 있으면 id 오름차순 목록, 아니면 None (visible이 있으면 통과한 메시지만)"""
+        tail = self._tail(lecture_id, create=False)
+        if tail is not None:
+            candidates = [
+                message for message in tail.messages
+                if (before_id is None or message["id"] < before_id) and (visible is None or visible(message))
+            ]
+            # 연속된 최신 구간이므로 limit개를 채우거나 전체 히스토리가 있으면 DB 결과와 같음
+            if len(candidates) >= limit or tail.complete:
+                self.metrics["hits"] += 1
+                return candidates[-limit:]
+
+        self.metrics["misses"] += 1
+        return None
+
+    def clear(self, lecture_id: int):
+        self.lectures.pop(lecture_id, None)
+
+    def get_stats(self) -> dict:
+        lookups = self.metrics["hits"] + self.metrics["misses"]
+        return {
+            "capacity_per_lecture": self.capacity,
+            "cached_lectures": len(self.lectures),
+            "hit_rate": self.metrics["hits"] / lookups if lookups else 0,
+            **self.metrics
+        }
+
+
+def serialize_chat_row(row: Dict) -> dict:
+    """히스토리 응답 형식 (DB 행과 캐시 항목 공통)"""
+    created_at = row["created_at"]
+    return {
+        "id": row["id"],
+        "lecture_id": row["lecture_id"],
+        "user_id": row["user_id"],
+        "username": row.get("username") or "",
+        "message": row["message"],
+        "is_private": row["is_private"],
+        "created_at": created_at.isoformat() if isinstance(created_at, datetime) else created_at
+    }
+
+
+# 전역 채팅 tail 캐시
+chat_tail_cache = ChatTailCache(
+    capacity=settings.chat_tail_cache_size,
+    max_lectures=settings.chat_tail_cache_lectures
+)
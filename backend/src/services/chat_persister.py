@@ -0,0 +1,49 @@
+from typing import Dict, List
+from datetime import datetime
+import logging
+
+from src.core.settings import settings
+from src.models.chat import ChatMessage
+from src.services.chat_history import chat_tail_cache
+from src.services.search_index import search_indexer
+from src.services.write_behind import WriteBehindPersister
+
+logger = logging.getLogger(__name__)
+
+
+def _after_commit(messages: List[Dict]):
+    chat_tail_cache.append_many(messages)
+    search_indexer.index_chat_messages(messages)
+
+
+class ChatPersister(WriteBehindPersister):
+    """채팅 write-behind 저장 - 커밋된 메시지로 히스토리 tail 캐시와 검색 색인 갱신"""
+
+    def __init__(self, flush_interval: float, batch_size: int, max_buffer: int,
+                 max_retries: int = 5, dead_letter_limit: int = 1000):
+        super().__init__(
+            ChatMessage, "채팅", flush_interval, batch_size, max_buffer,
+            on_commit=_after_commit, max_retries=max_retries, dead_letter_limit=dead_letter_limit
+        )
+
+    def enqueue(self, lecture_id: int, user_id: int, username: str, message: str, is_private: bool = False,
+                created_at: datetime = None) -> bool:
+        """채팅 한 건을 저장 대기열에 추가 (버퍼가 가득 차면 버리고 False)"""
+        return self.submit({
+            "lecture_id": lecture_id,
+            "user_id": user_id,
+            "username": username,
+            "message": message,
+            "is_private": is_private,
+            "created_at": created_at or datetime.utcnow()
+        })
+
+
+# 전역 채팅 저장 작업 (lifespan에서 시작/종료)
+chat_persister = ChatPersister(
+    flush_interval=settings.chat_flush_interval_ms / 1000,
+    batch_size=settings.chat_flush_batch_size,
+    max_buffer=settings.chat_buffer_limit,
+    max_retries=settings.chat_flush_max_retries,
+    dead_letter_limit=settings.chat_dead_letter_limit
+)
@@ -0,0 +1,102 @@
+from typing import AsyncIterator, Dict, List, Sequence
+from datetime import datetime
+import csv
+import io
+import json
+import logging
+import time
+import zlib
+
+from sqlalchemy import select
+
+from src.core.settings import settings
+from src.db.database import read_engine
+
+logger = logging.getLogger(__name__)
+
+EXPORT_FORMATS = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv; charset=utf-8"
+}
+
+CHAT_EXPORT_COLUMNS = ("id", "lecture_id", "user_id", "username", "message", "is_private", "created_at")
+CAPTION_EXPORT_COLUMNS = ("id", "lecture_id", "text", "translated_text", "language", "created_at")
+
+
+def _value(value):
+    return value.isoformat() if isinstance(value, datetime) else value
+
+
+async def iter_lecture_batches(model, lecture_id: int, columns: Sequence[str],
+                               batch_size: int) -> AsyncIterator[List[Dict]]:
+    """강의의 행을 id 순으로 batch_size씩 읽기 - (lecture_id, id) 커서로 배치마다 짧게 연결을 사용"""
+    statement = select(*(getattr(model, column) for column in columns)).where(model.lecture_id == lecture_id)
+    last_id = 0
+    while True:
+        # 다운로드가 느려도 읽기 트랜잭션을 오래 잡지 않도록 배치마다 연결을 반환
+        async with read_engine.connect() as conn:
+            result = await conn.execute(
+                statement.where(model.id > last_id).order_by(model.id).limit(batch_size)
+            )
+            rows = [dict(row) for row in result.mappings()]
+        if not rows:
+            return
+        yield rows
+        if len(rows) < batch_size:
+            return
+        last_id = rows[-1]["id"]
+
+
+def encode_ndjson(rows: List[Dict]) -> str:
+    return "".join(
+        json.dumps({key: _value(value) for key, value in row.items()}, ensure_ascii=False) + "\n"
+        for row in rows
+    )
+
+
+def encode_csv(rows: List[Dict], columns: Sequence[str], header: bool = False) -> str:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    if header:
+        writer.writerow(columns)
+    writer.writerows([_value(row[column]) for column in columns] for row in rows)
+    return buffer.getvalue()
+
+
+async def stream_export(model, lecture_id: int, columns: Sequence[str], fmt: str,
+                        compress: bool = False, batch_size: int = None) -> AsyncIterator[bytes]:
+    """강의 로그를 NDJSON/CSV 청크로 스트리밍 (배치 하나만 메모리에 유지, 선택적으로 gzip)"""
+    batch_size = batch_size or settings.export_batch_size
+    # wbits=31: gzip 헤더/트레일러를 포함한 스트림 압축
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 31) if compress else None
+    rows_written = 0
+    bytes_written = 0
+    export_start = time.perf_counter()
+
+    def emit(text: str) -> bytes:
+        data = text.encode("utf-8")
+        return compressor.compress(data) if compressor else data
+
+    if fmt == "csv":
+        # 엑셀에서 한글이 깨지지 않도록 BOM 추가
+        chunk = emit("\ufeff" + encode_csv([], columns, header=True))
+        bytes_written += len(chunk)
+        if chunk:
+            yield chunk
+
+    async for rows in iter_lecture_batches(model, lecture_id, columns, batch_size):
+        chunk = emit(encode_csv(rows, columns) if fmt == "csv" else encode_ndjson(rows))
+        rows_written += len(rows)
+        bytes_written += len(chunk)
+        if chunk:
+            yield chunk
+
+    if compressor:
+        chunk = compressor.flush()
+        bytes_written += len(chunk)
+        yield chunk
+
+    elapsed = time.perf_counter() - export_start
+    logger.info(f"📤 [내보내기] {model.__tablename__} 내보내기 완료 - lecture_id: {lecture_id}, 형식: {fmt}, "
+                f"gzip: {compress}, {rows_written}건, {bytes_written} bytes, "
+                f"{rows_written / elapsed if elapsed else 0:.0f} rows/s")
@@ -0,0 +1,224 @@
+from fastapi import WebSocket
+from typing import Any, Callable, Dict, Hashable, List, Optional
+from datetime import datetime
+import asyncio
+import inspect
+import logging
+import math
+import time
+
+from src.core.settings import settings
+from src.services.ws_codec import event_encoder, send_payload, JSON_ENCODING
+
+logger = logging.getLogger(__name__)
+
+
+class HashedTimerWheel:
+    """해시 타이머 휠 - 틱마다 현재 슬롯에 걸린 항목만 처리"""
+
+    def __init__(self, tick_interval: float = 1.0, slot_count: int = 64):
+        self.tick_interval = tick_interval
+        # 슬롯별 key -> 남은 회전 수
+        self.slots: List[Dict[Hashable, int]] = [{} for _ in range(slot_count)]
+        # key -> 슬롯 인덱스 (O(1) 취소용)
+        self.positions: Dict[Hashable, int] = {}
+        self.cursor = 0
+
+    def schedule(self, key: Hashable, delay: float):
+        """delay초 뒤에 만료되도록 등록 (기존 등록은 대체)"""
+        self.cancel(key)
+        ticks = max(1, math.ceil(delay / self.tick_interval))
+        slot = (self.cursor + ticks) % len(self.slots)
+        self.slots[slot][key] = (ticks - 1) // len(self.slots)
+        self.positions[key] = slot
+
+    def cancel(self, key: Hashable):
+        slot = self.positions.pop(key, None)
+        if slot is not None:
+            self.slots[slot].pop(key, None)
+
+    def advance(self) -> List[Hashable]:
+        """한 틱 전진하고 만료된 key 목록 반환"""
+        self.cursor = (self.cursor + 1) % len(self.slots)
+        bucket = self.slots[self.cursor]
+        expired = []
+        for key, rounds in list(bucket.items()):
+            if rounds > 0:
+                bucket[key] = rounds - 1
+                continue
+            del bucket[key]
+            del self.positions[key]
+            expired.append(key)
+        return expired
+
+    def __len__(self) -> int:
+        return len(self.positions)
+
+
+class HeartbeatEntry:
+    __slots__ = ("on_dead", "encoding", "send", "last_seen", "awaiting_pong", "ping_sent_at")
+
+    def __init__(self, on_dead: Callable[[WebSocket], Any], encoding: str, send: Optional[Callable[[Any], Any]]):
+        self.on_dead = on_dead
+        self.encoding = encoding
+        self.send = send
+        self.last_seen = time.monotonic()
+        self.awaiting_pong = False
+        self.ping_sent_at = 0.0
+
+
+class HeartbeatScheduler:
+    """모든 WebSocket의 ping 전송과 끊어진 연결 정리를 담당하는 중앙 스케줄러"""
+
+    def __init__(self, ping_interval: float, pong_timeout: float, tick_interval: float = 1.0, slot_count: int = 64):
+        self.ping_interval = ping_interval
+        self.pong_timeout = pong_timeout
+        self.wheel = HashedTimerWheel(tick_interval, slot_count)
+        self.entries: Dict[WebSocket, HeartbeatEntry] = {}
+        self.task: asyncio.Task | None = None
+        self.metrics = {
+            "total_pings": 0,
+            "total_reaped": 0,
+            "total_ticks": 0,
+            "total_tick_time": 0.0,
+            "max_tick_time": 0.0,
+            "last_tick_time": 0.0,
+            "start_time": datetime.now().isoformat()
+        }
+
+    def register(self, websocket: WebSocket, on_dead: Callable[[WebSocket], Any], encoding: str = JSON_ENCODING,
+                 send: Optional[Callable[[Any], Any]] = None):
+        """
+        연결 등록 - ping_interval 뒤 첫 점검
+
+        send가 있으면 ping을 직접 보내지 않고 send(payload)로 넘깁니다 (송신 큐가 있는 연결은
+        소켓 쓰기를 writer 태스크 하나로 모아야 하므로).
+        """
+        self.entries[websocket] = HeartbeatEntry(on_dead, encoding, send)
+        self.wheel.schedule(websocket, self.ping_interval)
+
+    def unregister(self, websocket: WebSocket):
+        self.entries.pop(websocket, None)
+        self.wheel.cancel(websocket)
+
+    def touch(self, websocket: WebSocket):
+        """수신 메시지(pong 포함)로 생존 확인 - 타이머는 건드리지 않는 O(1) 갱신"""
+        entry = self.entries.get(websocket)
+        if entry:
+            entry.last_seen = time.monotonic()
+            entry.awaiting_pong = False
+
+    def tick(self):
+        """만료 슬롯만 처리: 유휴 연결엔 ping, 응답 없는 연결은 정리"""
+        tick_start = time.perf_counter()
+        now = time.monotonic()
+
+        for websocket in self.wheel.advance():
+            entry = self.entries.get(websocket)
+            if entry is None:
+                continue
+
+            idle = now - entry.last_seen
+            if idle < self.ping_interval:
+                self.wheel.schedule(websocket, self.ping_interval - idle)
+                continue
+
+            if not entry.awaiting_pong:
+                entry.awaiting_pong = True
+                entry.ping_sent_at = now
+                self.wheel.schedule(websocket, self.pong_timeout)
+                if entry.send is not None:
+                    entry.send(self._ping_payload(entry))
+                    self.metrics["total_pings"] += 1
+                else:
+                    asyncio.create_task(self._send_ping(websocket, entry))
+                continue
+
+            self._reap(websocket, entry, "pong 타임아웃")
+
+        tick_time = time.perf_counter() - tick_start
+        self.metrics["total_ticks"] += 1
+        self.metrics["total_tick_time"] += tick_time
+        self.metrics["last_tick_time"] = tick_time
+        self.metrics["max_tick_time"] = max(self.metrics["max_tick_time"], tick_time)
+
+    def _ping_payload(self, entry: HeartbeatEntry):
+        return event_encoder.encode({
+            "type": "ping",
+            "timestamp": datetime.now().isoformat()
+        }, entry.encoding)
+
+    async def _send_ping(self, websocket: WebSocket, entry: HeartbeatEntry):
+        try:
+            payload = self._ping_payload(entry)
+            await asyncio.wait_for(send_payload(websocket, payload), timeout=self.pong_timeout)
+            self.metrics["total_pings"] += 1
+        except Exception as e:
+            if self.entries.get(websocket) is entry:
+                self._reap(websocket, entry, f"ping 전송 실패: {e}")
+
+    def _reap(self, websocket: WebSocket, entry: HeartbeatEntry, reason: str):
+        self.unregister(websocket)
+        self.metrics["total_reaped"] += 1
+        logger.info(f"🧹 [Heartbeat] 끊어진 연결 정리 - 사유: {reason}, 남은 연결: {len(self.entries)}")
+        asyncio.create_task(self._close_and_notify(websocket, entry))
+
+    async def _close_and_notify(self, websocket: WebSocket, entry: HeartbeatEntry):
+        try:
+            await asyncio.wait_for(websocket.close(code=1001), timeout=1.0)
+        except Exception:
+            pass
+
+        try:
+            result = entry.on_dead(websocket)
+            if inspect.isawaitable(result):
+                await result
+        except Exception as e:
+            logger.error(f"❌ [Heartbeat] 연결 정리 콜백 오류: {e}")
+
+    async def _run(self):
+        logger.info(f"💓 [Heartbeat] 스케줄러 시작 - ping 간격: {self.ping_interval}s, "
+                    f"pong 타임아웃: {self.pong_timeout}s, 틱: {self.wheel.tick_interval}s")
+        while True:
+            await asyncio.sleep(self.wheel.tick_interval)
+            try:
+                self.tick()
+            except Exception as e:
+                logger.error(f"❌ [Heartbeat] 틱 처리 오류: {e}")
+
+    def start(self):
+        if self.task is None:
+            self.task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self.task is None:
+            return
+        self.task.cancel()
+        try:
+            await self.task
+        except asyncio.CancelledError:
+            pass
+        self.task = None
+        logger.info(f"🛑 [Heartbeat] 스케줄러 종료 - 정리된 연결: {self.metrics['total_reaped']}")
+
+    def get_stats(self) -> dict:
+        ticks = self.metrics["total_ticks"]
+        return {
+            "tracked_connections": len(self.entries),
+            "awaiting_pong": sum(1 for entry in self.entries.values() if entry.awaiting_pong),
+            "total_pings": self.metrics["total_pings"],
+            "total_reaped": self.metrics["total_reaped"],
+            "total_ticks": ticks,
+            "avg_tick_ms": self.metrics["total_tick_time"] / ticks * 1000 if ticks else 0,
+            "max_tick_ms": self.metrics["max_tick_time"] * 1000,
+            "last_tick_ms": self.metrics["last_tick_time"] * 1000,
+            "start_time": self.metrics["start_time"]
+        }
+
+
+# 전역 하트비트 스케줄러 (lifespan에서 시작/종료)
+heartbeat_scheduler = HeartbeatScheduler(
+    ping_interval=settings.ws_ping_interval,
+    pong_timeout=settings.ws_pong_timeout,
+    tick_interval=settings.ws_heartbeat_tick
+)
@@ -0,0 +1,78 @@
+from collections import deque
+from datetime import datetime
+import asyncio
+import logging
+import time
+
+from src.core.settings import settings
+
+logger = logging.getLogger(__name__)
+
+
+class LoopLagMonitor:
+    """이벤트 루프 지연 측정 - 주기적으로 sleep한 뒤 예정보다 늦게 깨어난 시간을 기록"""
+
+    def __init__(self, interval: float, warn_threshold: float, window: int = 600):
+        self.interval = interval
+        self.warn_threshold = warn_threshold
+        # 최근 샘플만 유지 (p99 계산용)
+        self.samples: deque = deque(maxlen=window)
+        self.task: asyncio.Task | None = None
+        self.metrics = {
+            "total_samples": 0,
+            "total_stalls": 0,
+            "max_lag": 0.0,
+            "last_lag": 0.0,
+            "start_time": datetime.now().isoformat()
+        }
+
+    def record(self, lag: float):
+        self.samples.append(lag)
+        self.metrics["total_samples"] += 1
+        self.metrics["last_lag"] = lag
+        self.metrics["max_lag"] = max(self.metrics["max_lag"], lag)
+        if lag >= self.warn_threshold:
+            self.metrics["total_stalls"] += 1
+            logger.warning(f"🐢 [루프] 이벤트 루프 지연 감지 - {lag * 1000:.1f}ms")
+
+    async def _run(self):
+        logger.info(f"⏱️ [루프] 지연 측정 시작 - 간격: {self.interval}s, 경고 기준: {self.warn_threshold * 1000:.0f}ms")
+        while True:
+            expected = time.perf_counter() + self.interval
+            await asyncio.sleep(self.interval)
+            self.record(max(0.0, time.perf_counter() - expected))
+
+    def start(self):
+        if self.task is None:
+            self.task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self.task is None:
+            return
+        self.task.cancel()
+        try:
+            await self.task
+        except asyncio.CancelledError:
+            pass
+        self.task = None
+        logger.info(f"🛑 [루프] 지연 측정 종료 - 최대 지연: {self.metrics['max_lag'] * 1000:.1f}ms")
+
+    def get_stats(self) -> dict:
+        ordered = sorted(self.samples)
+        p99 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.99))] if ordered else 0.0
+        return {
+            "interval_ms": self.interval * 1000,
+            "total_samples": self.metrics["total_samples"],
+            "total_stalls": self.metrics["total_stalls"],
+            "last_lag_ms": self.metrics["last_lag"] * 1000,
+            "p99_lag_ms": p99 * 1000,
+            "max_lag_ms": self.metrics["max_lag"] * 1000,
+            "start_time": self.metrics["start_time"]
+        }
+
+
+# 전역 루프 지연 측정기 (lifespan에서 시작/종료)
+loop_lag_monitor = LoopLagMonitor(
+    interval=settings.loop_lag_interval_ms / 1000,
+    warn_threshold=settings.loop_lag_warn_ms / 1000
+)
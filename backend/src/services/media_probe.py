@@ -0,0 +1,132 @@
+from typing import Any, Dict, Iterable, Optional, Tuple
+from datetime import datetime
+import asyncio
+import logging
+import os
+import time
+
+from src.models.audio import Audio
+from src.models.video import Video
+from src.utils.media_headers import probe_media
+
+logger = logging.getLogger(__name__)
+
+
+def format_duration(seconds: Optional[float]) -> str:
+    """초 -> "MM:SS" (1시간 이상이면 "H:MM:SS"), 모르면 "00:00" """
+    if seconds is None:
+        return "00:00"
+    minutes, secs = divmod(int(round(seconds)), 60)
+    hours, minutes = divmod(minutes, 60)
+    return f"{hours}:{minutes:02d}:{secs:02d}" if hours else f"{minutes:02d}:{secs:02d}"
+
+
+def _stat(path: str) -> Optional[Tuple[int, int]]:
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return stat.st_size, stat.st_mtime_ns
+
+
+def video_media_fields(info: Optional[Dict[str, Any]], stat: Optional[Tuple[int, int]]) -> Dict[str, Any]:
+    """조회 결과 -> Video 컬럼 값 (일괄 INSERT/UPDATE용)"""
+    info = info or {}
+    return {
+        "duration": format_duration(info.get("duration")),
+        "duration_seconds": info.get("duration"),
+        "audio_codec": info.get("codec"),
+        "sample_rate": info.get("sample_rate"),
+        "channels": info.get("channels"),
+        "file_size": stat[0] if stat else None,
+        "file_mtime_ns": stat[1] if stat else None
+    }
+
+
+class MediaProbeService:
+    """
+    미디어 길이/코덱 조회 서비스
+
+    컨테이너 헤더(WAV/FLAC/MP3/MP4/WebM)만 읽고 길이를 모를 때만 ffprobe를 한 번 실행합니다.
+    결과는 Audio/Video 행에 파일 크기·수정 시각과 함께 저장되어, 파일이 바뀌지 않았으면 다시 조회하지 않습니다.
+    """
+
+    def __init__(self):
+        self.metrics = {
+            "probes": 0,
+            "header_hits": 0,
+            "ffprobe_fallbacks": 0,
+            "failures": 0,
+            "cache_hits": 0,
+            "total_probe_time": 0.0,
+            "start_time": datetime.now().isoformat()
+        }
+
+    def _probe_sync(self, path: str) -> Optional[Dict[str, Any]]:
+        # 작업 스레드에서 실행 - 카운터는 정수 증가뿐이라 잠금 없이 갱신
+        probe_start = time.perf_counter()
+        info = probe_media(path)
+        self.metrics["total_probe_time"] += time.perf_counter() - probe_start
+        self.metrics["probes"] += 1
+        if info is None or info["duration"] is None:
+            self.metrics["failures"] += 1
+            logger.warning(f"⚠️ [미디어] 길이 조회 실패 - {path}")
+        elif info["source"] == "ffprobe":
+            self.metrics["ffprobe_fallbacks"] += 1
+        else:
+            self.metrics["header_hits"] += 1
+        return info
+
+    async def probe(self, path: str) -> Optional[Dict[str, Any]]:
+        """파일 하나 조회 (캐시 없이)"""
+        return await asyncio.to_thread(self._probe_sync, path)
+
+    async def probe_video_files(self, paths: Iterable[str]) -> Dict[str, Dict[str, Any]]:
+        """여러 파일을 스레드 하나에서 순서대로 조회하고 경로 -> Video 컬럼 값 반환"""
+        def run(paths):
+            return {path: video_media_fields(self._probe_sync(path), _stat(path)) for path in paths}
+        return await asyncio.to_thread(run, list(paths))
+
+    def _cached(self, row, stat: Optional[Tuple[int, int]], duration) -> bool:
+        if stat is not None and duration is not None and (row.file_size, row.file_mtime_ns) == stat:
+            self.metrics["cache_hits"] += 1
+            return True
+        return False
+
+    async def probe_audio(self, audio: Audio) -> bool:
+        """
+        Audio 행의 길이/코덱 정보를 파일과 맞춥니다 (저장은 호출자가 수행).
+
+        Returns:
+            bool: 행의 값이 바뀌었으면 True
+        """
+        stat = await asyncio.to_thread(_stat, audio.file_path)
+        if stat is None or self._cached(audio, stat, audio.duration):
+            return False
+        info = await self.probe(audio.file_path) or {}
+        audio.duration = info.get("duration")
+        audio.codec = info.get("codec")
+        audio.sample_rate = info.get("sample_rate")
+        audio.channels = info.get("channels")
+        audio.file_size, audio.file_mtime_ns = stat
+        return True
+
+    async def probe_video(self, video: Video, path: str) -> bool:
+        """로컬 영상 파일로 Video 행의 duration 등을 채웁니다 (저장은 호출자가 수행)."""
+        stat = await asyncio.to_thread(_stat, path)
+        if stat is None or self._cached(video, stat, video.duration_seconds):
+            return False
+        for field, value in video_media_fields(await self.probe(path), stat).items():
+            setattr(video, field, value)
+        return True
+
+    def get_stats(self) -> dict:
+        probes = self.metrics["probes"]
+        return {
+            "avg_probe_ms": self.metrics["total_probe_time"] / probes * 1000 if probes else 0,
+            **self.metrics
+        }
+
+
+# 전역 미디어 조회 서비스
+media_probe = MediaProbeService()
@@ -1,14 +1,26 @@
-from typing import Dict, Any, List, Optional
+from collections import Counter
+from pathlib import Path
+from typing import Dict, Any, List, Optional, Tuple
+import asyncio
 import os
 import json
+import logging
+import random
+import tempfile
+import time
 import httpx
 from pydantic import BaseModel
 
+from src.core.settings import settings
+from src.utils.media import FFMPEG_PATH, cut_audio_chunk, detect_silences, get_audio_duration, plan_audio_chunks
+
+logger = logging.getLogger(__name__)
+
 # OpenAI API 키 (환경변수에서 가져오기)
 OPENAI_API_KEY = os.environ.get("OPENAI_API_KEY", "your-openai-api-key")
 
-# API 엔드포인트
-OPENAI_API_BASE = "https://api.openai.com/v1"
+# API 엔드포인트 (로컬 모의 서버로 바꿔 벤치마크할 수 있음)
+OPENAI_API_BASE = os.environ.get("OPENAI_API_BASE", "https://api.openai.com/v1")
 CHAT_ENDPOINT = f"{OPENAI_API_BASE}/chat/completions"
 WHISPER_ENDPOINT = f"{OPENAI_API_BASE}/audio/transcriptions"
 
@@ -21,12 +33,150 @@ DEFAULT_HEADERS = {
 # 테스트 모드 설정
 TEST_MODE = False  # 실제 환경에서는 False로 설정
 
+# 사용 모델
+WHISPER_MODEL = "whisper-1"
+CHAT_MODEL = "gpt-3.5-turbo"
+
+# 다시 보내면 성공할 수 있는 응답 코드
+RETRYABLE_STATUS = {408, 409, 429, 500, 502, 503, 504}
+
 class WhisperResponse(BaseModel):
     text: str
     segments: List[Dict[str, Any]] = []
     language: str
 
 
+def model_tag(model: str) -> str:
+    """처리 결과 캐시 키에 넣을 모델 이름 - 테스트 모드의 더미 결과가 실제 결과로 재사용되지 않게 구분"""
+    return f"{model}+test" if TEST_MODE else model
+
+
+def _retry_delay(error: Exception, attempt: int) -> float:
+    # 429/503의 Retry-After(초)를 따르고, 없으면 지수 백오프 + 지터
+    if isinstance(error, httpx.HTTPStatusError):
+        retry_after = error.response.headers.get("retry-after", "")
+        if retry_after.replace(".", "", 1).isdigit():
+            return min(float(retry_after), 60.0)
+    return min(2 ** attempt, 30) + random.uniform(0, 1)
+
+
+async def _whisper_request(client: httpx.AsyncClient, audio_file_path: str, language: Optional[str]) -> Dict[str, Any]:
+    """파일 하나를 Whisper에 올리고 verbose_json 반환 - 시간 초과/연결 오류/429/5xx는 이 파일만 다시 보냄"""
+    # 재시도마다 다시 읽지 않도록 한 번만 읽음 (이벤트 루프를 막지 않게 스레드에서)
+    content = await asyncio.to_thread(Path(audio_file_path).read_bytes)
+    data = {"model": WHISPER_MODEL, "response_format": "verbose_json"}
+    if language:
+        data["language"] = language
+
+    for attempt in range(settings.stt_max_retries + 1):
+        try:
+            response = await client.post(
+                WHISPER_ENDPOINT,
+                headers={"Authorization": f"Bearer {OPENAI_API_KEY}"},
+                data=data,
+                files={"file": (Path(audio_file_path).name, content)},
+                timeout=settings.stt_request_timeout
+            )
+            response.raise_for_status()
+            return response.json()
+        except (httpx.TransportError, httpx.HTTPStatusError) as e:
+            status_code = e.response.status_code if isinstance(e, httpx.HTTPStatusError) else None
+            if attempt == settings.stt_max_retries or (status_code is not None and status_code not in RETRYABLE_STATUS):
+                raise
+            delay = _retry_delay(e, attempt)
+            logger.warning(f"⚠️ [STT] Whisper 요청 실패, {delay:.1f}초 후 재시도 ({attempt + 1}/{settings.stt_max_retries}) - "
+                           f"{Path(audio_file_path).name}: {status_code or type(e).__name__}")
+            await asyncio.sleep(delay)
+
+
+def _stitch_chunks(chunks: List[Tuple[float, float]], results: List[Dict[str, Any]]) -> WhisperResponse:
+    """구간별 결과를 시간순으로 잇고 시작 시각만큼 시간을 옮긴 뒤 세그먼트 id를 0부터 다시 매김"""
+    segments = []
+    texts = []
+    languages = Counter()
+    for (offset, end), result in zip(chunks, results):
+        for segment in result.get("segments", []):
+            shifted = {
+                **segment,
+                "id": len(segments),
+                "start": round(segment.get("start", 0.0) + offset, 3),
+                "end": round(segment.get("end", 0.0) + offset, 3)
+            }
+            if "seek" in segment:
+                # seek는 10ms 프레임 단위 위치
+                shifted["seek"] = segment["seek"] + int(offset * 100)
+            segments.append(shifted)
+        text = result.get("text", "").strip()
+        if text:
+            texts.append(text)
+        # 구간마다 자동 감지 결과가 다를 수 있으므로 가장 긴 시간을 차지한 언어 사용
+        languages[result.get("language", "unknown")] += end - offset
+    return WhisperResponse(
+        text=" ".join(texts),
+        segments=segments,
+        language=languages.most_common(1)[0][0] if languages else "unknown"
+    )
+
+
+async def _transcribe_file(audio_file_path: str, language: Optional[str]) -> WhisperResponse:
+    """
+    긴 오디오는 무음 위치에서 여러 구간으로 나눠 동시에(최대 stt_concurrency개) 전사하고 이어 붙입니다.
+
+    구간 길이는 stt_chunk_seconds와 업로드 한도(stt_chunk_max_bytes) 중 작은 쪽으로 정하고,
+    실패한 구간은 그 구간만 재시도합니다. 짧은 파일이나 ffmpeg가 없으면 한 번에 보냅니다.
+    """
+    # 무압축 16비트 모노로 계산한 길이 상한 (FLAC 구간은 이보다 작음)
+    max_seconds = min(settings.stt_chunk_seconds, settings.stt_chunk_max_bytes / (settings.stt_sample_rate * 2))
+    duration = await asyncio.to_thread(get_audio_duration, audio_file_path)
+    size = os.path.getsize(audio_file_path)
+
+    async with httpx.AsyncClient(limits=httpx.Limits(max_connections=settings.stt_concurrency)) as client:
+        if FFMPEG_PATH is None or duration is None or (duration <= max_seconds and size <= settings.stt_chunk_max_bytes):
+            if size > settings.stt_chunk_max_bytes:
+                logger.warning(f"⚠️ [STT] 분할할 수 없어 업로드 한도를 넘는 파일을 그대로 전송 - {size / 1024 / 1024:.1f}MB")
+            result = await _whisper_request(client, audio_file_path, language)
+            return WhisperResponse(
+                text=result.get("text", ""),
+                segments=result.get("segments", []),
+                language=result.get("language", "unknown")
+            )
+
+        transcribe_start = time.perf_counter()
+        silences = await detect_silences(
+            audio_file_path, settings.stt_silence_threshold_db, settings.stt_silence_min_duration,
+            timeout=settings.audio_extract_timeout
+        )
+        chunks = plan_audio_chunks(duration, silences, max_seconds)
+        logger.info(f"🎙️ [STT] 분할 전사 시작 - 길이 {duration / 60:.1f}분, 구간 {len(chunks)}개, "
+                    f"무음 {len(silences)}개, 동시 요청 {settings.stt_concurrency}개")
+
+        semaphore = asyncio.Semaphore(settings.stt_concurrency)
+        with tempfile.TemporaryDirectory(prefix="studytube-stt-") as chunk_dir:
+            async def transcribe_chunk(index: int, start: float, end: float) -> Dict[str, Any]:
+                # 자르기도 세마포어 안에서 해 임시 파일이 동시 요청 수만큼만 생김
+                async with semaphore:
+                    chunk_path = os.path.join(chunk_dir, f"{index:04d}.flac")
+                    await cut_audio_chunk(audio_file_path, chunk_path, start, end, settings.stt_sample_rate,
+                                          timeout=settings.audio_extract_timeout)
+                    try:
+                        return await _whisper_request(client, chunk_path, language)
+                    finally:
+                        os.remove(chunk_path)
+
+            tasks = [asyncio.create_task(transcribe_chunk(index, start, end))
+                     for index, (start, end) in enumerate(chunks)]
+            try:
+                results = await asyncio.gather(*tasks)
+            finally:
+                # 한 구간이 재시도 후에도 실패하면 나머지 요청/ffmpeg도 정리한 뒤 임시 폴더 삭제
+                for task in tasks:
+                    task.cancel()
+                await asyncio.gather(*tasks, return_exceptions=True)
+
+    logger.info(f"✅ [STT] 분할 전사 완료 - 구간 {len(chunks)}개, 소요시간: {time.perf_counter() - transcribe_start:.1f}s")
+    return _stitch_chunks(chunks, results)
+
+
 async def transcribe_audio(audio_file_path: str, language: Optional[str] = None) -> WhisperResponse:
     """
     오디오 파일에서 자막을 추출합니다. 테스트 모드에서는 더미 응답을 반환합니다.
@@ -148,34 +298,8 @@ async def transcribe_audio(audio_file_path: str, language: Optional[str] = None)
         )
 
     try:
-        # 실제 OpenAI API 호출 로직
-        headers = {"Authorization": f"Bearer {OPENAI_API_KEY}"}
-
-        files = {
-            "file": open(audio_file_path, "rb"),
-            "model": (None, "whisper-1"),
-            "response_format": (None, "verbose_json"),
-        }
-
-        if language:
-            files["language"] = (None, language)
-
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
-                WHISPER_ENDPOINT,
-                headers=headers,
-                files=files,
-                timeout=120.0
-            )
-
-        response.raise_for_status()
-        result = response.json()
-
-        return WhisperResponse(
-            text=result.get("text", ""),
-            segments=result.get("segments", []),
-            language=result.get("language", "unknown")
-        )
+        # 실제 OpenAI API 호출 로직 (긴 오디오는 구간별 병렬 전사)
+        return await _transcribe_file(audio_file_path, language)
     except Exception as e:
         print(f"자막 추출 중 오류 발생: {str(e)}")
         raise
@@ -233,7 +357,7 @@ async def translate_text(text: str, target_language: str) -> str:
     try:
         # 실제 OpenAI API 호출 로직
         data = {
-            "model": "gpt-3.5-turbo",
+            "model": CHAT_MODEL,
             "messages": [
                 {"role": "system", "content": f"당신은 전문 번역가입니다. 다음 텍스트를 {target_language}로 번역해 주세요. 원문의 의미와 뉘앙스를 최대한 유지하면서 자연스럽게 번역하세요."},
                 {"role": "user", "content": text}
@@ -0,0 +1,134 @@
+from fastapi import WebSocket
+from collections import deque
+from typing import Any, Callable, Deque, Tuple
+from datetime import datetime
+import asyncio
+import inspect
+import logging
+import time
+
+from src.core.settings import settings
+from src.services.ws_codec import send_payload
+
+logger = logging.getLogger(__name__)
+
+# 전송 우선순위 (숫자가 작을수록 먼저 전송)
+SIGNALING_LANE = 0
+CAPTION_LANE = 1
+CHAT_LANE = 2
+LANE_NAMES = ("signaling", "caption", "chat")
+
+# WebRTC 협상과 참가자/리플레이 등 제어 메시지 - 버리지 않음
+SIGNALING_TYPES = frozenset({
+    "offer", "answer", "ice-candidate", "request_connection",
+    "screen_share_started", "screen_share_stopped",
+    "participants_delta", "participants_snapshot", "replay"
+})
+CAPTION_TYPES = frozenset({"subtitle", "realtime", "fullSentence"})
+
+
+def lane_for(message: dict) -> int:
+    """메시지 타입으로 전송 레인 결정 (나머지는 채팅 레인)"""
+    message_type = message.get("type")
+    if message_type in SIGNALING_TYPES:
+        return SIGNALING_LANE
+    if message_type in CAPTION_TYPES:
+        return CAPTION_LANE
+    return CHAT_LANE
+
+
+class OutboxStats:
+    """모든 연결의 레인별 대기 시간/드롭 통계"""
+
+    def __init__(self):
+        self.lanes = {
+            name: {"sent": 0, "dropped": 0, "total_wait": 0.0, "max_wait": 0.0}
+            for name in LANE_NAMES
+        }
+        self.start_time = datetime.now().isoformat()
+
+    def record_sent(self, lane: int, wait: float):
+        metrics = self.lanes[LANE_NAMES[lane]]
+        metrics["sent"] += 1
+        metrics["total_wait"] += wait
+        metrics["max_wait"] = max(metrics["max_wait"], wait)
+
+    def record_dropped(self, lane: int):
+        self.lanes[LANE_NAMES[lane]]["dropped"] += 1
+
+    def get_stats(self) -> dict:
+        stats = {}
+        for name, metrics in self.lanes.items():
+            sent = metrics["sent"]
+            stats[name] = {
+                "sent": sent,
+                "dropped": metrics["dropped"],
+                "avg_wait_ms": metrics["total_wait"] / sent * 1000 if sent else 0,
+                "max_wait_ms": metrics["max_wait"] * 1000
+            }
+        stats["start_time"] = self.start_time
+        return stats
+
+
+outbox_stats = OutboxStats()
+
+
+class PriorityOutbox:
+    """연결별 우선순위 송신 큐 - 시그널링 > 자막 > 채팅 순으로 전용 writer 태스크가 전송"""
+
+    def __init__(self, websocket: WebSocket, on_error: Callable[[WebSocket], Any],
+                 caption_limit: int = None, chat_limit: int = None, send_timeout: float = None):
+        self.websocket = websocket
+        self.on_error = on_error
+        self.send_timeout = send_timeout or settings.ws_outbox_send_timeout
+        # 시그널링은 무제한, 자막/채팅은 가득 차면 가장 오래된 것부터 버림
+        self.lanes: Tuple[Deque[Tuple[Any, float]], ...] = (
+            deque(),
+            deque(maxlen=caption_limit or settings.ws_outbox_caption_limit),
+            deque(maxlen=chat_limit or settings.ws_outbox_chat_limit),
+        )
+        self.ready = asyncio.Event()
+        self.task = asyncio.create_task(self._run())
+
+    def put(self, payload: Any, lane: int = CHAT_LANE):
+        queue = self.lanes[lane]
+        if queue.maxlen is not None and len(queue) == queue.maxlen:
+            outbox_stats.record_dropped(lane)
+        queue.append((payload, time.monotonic()))
+        self.ready.set()
+
+    def pending(self) -> int:
+        return sum(len(queue) for queue in self.lanes)
+
+    def _pop(self) -> Tuple[int, Any, float]:
+        for lane, queue in enumerate(self.lanes):
+            if queue:
+                payload, enqueued_at = queue.popleft()
+                return lane, payload, enqueued_at
+        raise IndexError("empty outbox")
+
+    async def _run(self):
+        try:
+            while True:
+                if not self.pending():
+                    self.ready.clear()
+                    await self.ready.wait()
+                    continue
+
+                lane, payload, enqueued_at = self._pop()
+                await asyncio.wait_for(send_payload(self.websocket, payload), timeout=self.send_timeout)
+                outbox_stats.record_sent(lane, time.monotonic() - enqueued_at)
+        except asyncio.CancelledError:
+            pass
+        except Exception as e:
+            logger.error(f"❌ [WebSocket] 송신 큐 전송 실패 - 대기 메시지: {self.pending()}개, 오류: {e}")
+            result = self.on_error(self.websocket)
+            if inspect.isawaitable(result):
+                await result
+
+    def close(self):
+        """writer 태스크 종료 (남은 메시지는 버림)"""
+        if not self.task.done() and self.task is not asyncio.current_task():
+            self.task.cancel()
+        for queue in self.lanes:
+            queue.clear()
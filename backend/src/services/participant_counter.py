@@ -0,0 +1,99 @@
+from typing import Dict, Optional
+from datetime import datetime
+import asyncio
+import logging
+
+from src.core.settings import settings
+from src.db.database import session_scope
+from src.repositories.lectures import list_participant_counts, reconcile_participant_counts
+from src.services.response_cache import LECTURE_LIST, response_cache
+
+logger = logging.getLogger(__name__)
+
+
+class ParticipantCounter:
+    """
+    강의별 활성 참여자 수 메모리 미러 - DB 카운터가 기준이고 주기적 대조로 어긋남을 바로잡음
+
+    프로세스(샤드)마다 따로 있는 조회/통계용 값이며 정원 판정에는 쓰지 않습니다 (조건부 UPDATE만 사용).
+    """
+
+    def __init__(self, reconcile_interval: float):
+        self.reconcile_interval = reconcile_interval
+        # lecture_id -> 마지막으로 확인한 활성 참여자 수
+        self.counts: Dict[int, int] = {}
+        # set 호출 순번 - 대조 중에 들어온 갱신을 대조 결과가 덮어쓰지 않도록 비교
+        self.sequence = 0
+        self.updated: Dict[int, int] = {}
+        self.task: asyncio.Task | None = None
+        self.metrics = {
+            "total_reconciles": 0,
+            "total_drift_fixed": 0,
+            "last_reconcile_at": None,
+            "start_time": datetime.now().isoformat()
+        }
+
+    def get(self, lecture_id: int, default: Optional[int] = None) -> Optional[int]:
+        return self.counts.get(lecture_id, default)
+
+    def set(self, lecture_id: int, count: Optional[int]):
+        """커밋된 UPDATE ... RETURNING 값으로 미러 갱신"""
+        if count is not None:
+            self.sequence += 1
+            self.counts[lecture_id] = count
+            self.updated[lecture_id] = self.sequence
+
+    async def reconcile(self):
+        """어긋난 DB 카운터를 다시 계산하고 미러를 DB 값으로 교체 (대조 중 set된 강의는 그 값을 유지)"""
+        started = self.sequence
+        async with session_scope() as db:
+            fixed = await reconcile_participant_counts(db)
+            await db.commit()
+            counts = dict(await list_participant_counts(db))
+
+        for lecture_id, sequence in self.updated.items():
+            if sequence > started and lecture_id in self.counts:
+                counts[lecture_id] = self.counts[lecture_id]
+        self.counts = counts
+        self.updated = {lecture_id: sequence for lecture_id, sequence in self.updated.items() if sequence > started}
+        self.metrics["total_reconciles"] += 1
+        self.metrics["total_drift_fixed"] += len(fixed)
+        self.metrics["last_reconcile_at"] = datetime.now().isoformat()
+        if fixed:
+            await response_cache.invalidate(LECTURE_LIST)
+            logger.warning(f"🔧 [참여자] 카운터 보정 - {len(fixed)}개 강의: "
+                           + ", ".join(f"{lecture_id}→{count}" for lecture_id, count in fixed[:10]))
+
+    async def _run(self):
+        logger.info(f"👥 [참여자] 카운터 대조 작업 시작 - 간격: {self.reconcile_interval}s")
+        while True:
+            try:
+                await self.reconcile()
+            except Exception as e:
+                logger.error(f"❌ [참여자] 카운터 대조 오류: {e}")
+            await asyncio.sleep(self.reconcile_interval)
+
+    def start(self):
+        if self.task is None:
+            self.task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self.task is None:
+            return
+        self.task.cancel()
+        try:
+            await self.task
+        except asyncio.CancelledError:
+            pass
+        self.task = None
+        logger.info(f"🛑 [참여자] 카운터 대조 작업 종료 - 보정된 강의: {self.metrics['total_drift_fixed']}")
+
+    def get_stats(self) -> dict:
+        return {
+            "tracked_lectures": len(self.counts),
+            **self.metrics
+        }
+
+
+# 전역 참여자 카운터 (lifespan에서 시작/종료)
+participant_counter = ParticipantCounter(reconcile_interval=settings.participant_reconcile_interval)
@@ -0,0 +1,249 @@
+from fastapi import WebSocket
+from starlette.websockets import WebSocketState
+from typing import Callable, Dict, FrozenSet, Hashable, Optional, Set, Tuple
+from datetime import datetime
+import logging
+import time
+
+from src.core.settings import settings
+from src.db.database import session_scope
+from src.repositories.lectures import get_lecture_capacity
+from src.services.sharding import shard_router
+
+logger = logging.getLogger(__name__)
+
+# 다른 샤드에 정원 캐시 무효화를 알리는 채널
+ADMISSION_INVALIDATE_CHANNEL = "cache:admission"
+
+# 거부/제한 사유
+THROTTLED_CONNECTION = "connection"
+THROTTLED_LECTURE = "lecture"
+OVERSIZED = "oversized"
+
+# 채팅 소켓에서 속도 제한하는 메시지 타입 - 강의 전체로 브로드캐스트되는 것만
+# (WebRTC 시그널링/스냅샷 요청은 제한하지 않음 - 화면 공유 시 학생 수만큼 offer/ICE가 몰림)
+CHAT_LIMITED_TYPES = frozenset({"chat_message", "subtitle", "screen_share"})
+
+
+class TokenBucket:
+    """토큰 버킷 - rate(초당 토큰)로 채워지고 capacity까지 버스트 허용"""
+
+    __slots__ = ("rate", "capacity", "tokens", "updated_at")
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated_at = time.monotonic()
+
+    def consume(self, cost: float = 1.0) -> bool:
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+        self.updated_at = now
+        if self.tokens < cost:
+            return False
+        self.tokens -= cost
+        return True
+
+
+class WebSocketRateLimiter:
+    """
+    연결별/강의별 메시지 속도 제한
+
+    크기는 모든 프레임을 파싱 전에 검사합니다. limited_types가 있으면 토큰은 그 타입의 메시지에만
+    쓰고(check_type), 없으면 모든 프레임에 씁니다(check).
+    """
+
+    def __init__(self, channel: str, connection_rate: float, connection_burst: float,
+                 lecture_rate: float, lecture_burst: float, max_frame_bytes: int,
+                 limited_types: Optional[FrozenSet[str]] = None):
+        self.channel = channel
+        self.limited_types = limited_types
+        self.connection_rate = connection_rate
+        self.connection_burst = connection_burst
+        self.lecture_rate = lecture_rate
+        self.lecture_burst = lecture_burst
+        self.max_frame_bytes = max_frame_bytes
+        self.connection_buckets: Dict[Hashable, TokenBucket] = {}
+        self.lecture_buckets: Dict[Hashable, TokenBucket] = {}
+        self.metrics = {
+            "total_allowed": 0,
+            "throttled_connection": 0,
+            "throttled_lecture": 0,
+            "oversized": 0,
+            "start_time": datetime.now().isoformat()
+        }
+
+    def check(self, websocket: WebSocket, lecture_id: Hashable, frame_size: int) -> Optional[str]:
+        """프레임 하나를 허용하면 None, 아니면 제한 사유 반환"""
+        return self.check_size(frame_size) or self.consume(websocket, lecture_id)
+
+    def check_size(self, frame_size: int) -> Optional[str]:
+        """파싱 전 크기 검사 (모든 프레임)"""
+        if frame_size > self.max_frame_bytes:
+            self.metrics["oversized"] += 1
+            return OVERSIZED
+        return None
+
+    def check_type(self, websocket: WebSocket, lecture_id: Hashable, message_type: str) -> Optional[str]:
+        """파싱한 메시지가 제한 대상 타입이면 토큰 사용 (나머지는 항상 허용)"""
+        if self.limited_types is not None and message_type not in self.limited_types:
+            return None
+        return self.consume(websocket, lecture_id)
+
+    def consume(self, websocket: WebSocket, lecture_id: Hashable) -> Optional[str]:
+        """연결/강의 버킷에서 토큰 하나 사용 - 허용하면 None, 아니면 제한 사유 반환"""
+        bucket = self.connection_buckets.get(websocket)
+        if bucket is None:
+            bucket = self.connection_buckets[websocket] = TokenBucket(self.connection_rate, self.connection_burst)
+        if not bucket.consume():
+            self.metrics["throttled_connection"] += 1
+            return THROTTLED_CONNECTION
+
+        lecture_bucket = self.lecture_buckets.get(lecture_id)
+        if lecture_bucket is None:
+            lecture_bucket = self.lecture_buckets[lecture_id] = TokenBucket(self.lecture_rate, self.lecture_burst)
+        if not lecture_bucket.consume():
+            self.metrics["throttled_lecture"] += 1
+            return THROTTLED_LECTURE
+
+        self.metrics["total_allowed"] += 1
+        return None
+
+    def release(self, websocket: WebSocket, lecture_id: Hashable = None, lecture_empty: bool = False):
+        """연결 해제 시 버킷 정리 (강의가 비면 강의 버킷도 제거)"""
+        self.connection_buckets.pop(websocket, None)
+        if lecture_empty:
+            self.lecture_buckets.pop(lecture_id, None)
+
+    def get_stats(self) -> dict:
+        return {
+            "channel": self.channel,
+            "tracked_connections": len(self.connection_buckets),
+            "tracked_lectures": len(self.lecture_buckets),
+            "connection_limit": {"rate": self.connection_rate, "burst": self.connection_burst},
+            "lecture_limit": {"rate": self.lecture_rate, "burst": self.lecture_burst},
+            "max_frame_bytes": self.max_frame_bytes,
+            "limited_types": sorted(self.limited_types) if self.limited_types is not None else None,
+            **self.metrics
+        }
+
+
+class AdmissionController:
+    """
+    WebSocket 연결 시 강의 정원 확인 - 정원은 DB에서 읽어 잠시 캐시하고 현재 인원은 라이브 레지스트리 기준
+
+    입장을 허용하면 레지스트리에 등록될 때까지 자리를 예약해 두므로(release로 해제),
+    동시에 들어온 연결이 같은 빈자리를 보고 함께 통과하지 않습니다.
+    """
+
+    def __init__(self, cache_ttl: float = 30.0):
+        self.cache_ttl = cache_ttl
+        # lecture_id -> (max_participants, instructor_id, 캐시 시각)
+        self.capacity_cache: Dict[int, Tuple[int, int, float]] = {}
+        # lecture_id -> 입장을 허용했지만 아직 레지스트리에 등록되지 않은 사용자
+        self.reserved: Dict[int, Set[int]] = {}
+        self.metrics = {
+            "total_admitted": 0,
+            "rejected_full": 0,
+            "rejected_unknown_lecture": 0,
+            "start_time": datetime.now().isoformat()
+        }
+
+    async def get_capacity(self, lecture_id: int) -> Optional[Tuple[int, int]]:
+        cached = self.capacity_cache.get(lecture_id)
+        if cached and time.monotonic() - cached[2] < self.cache_ttl:
+            return cached[0], cached[1]
+
+        async with session_scope(read_only=True) as db:
+            row = await get_lecture_capacity(db, lecture_id)
+
+        if row is None:
+            return None
+
+        self.capacity_cache[lecture_id] = (row[0], row[1], time.monotonic())
+        return row[0], row[1]
+
+    def invalidate(self, lecture_id: int):
+        """강의 정원/강사가 바뀐 뒤 호출 - 다른 샤드의 캐시도 무효화"""
+        self.capacity_cache.pop(lecture_id, None)
+        shard_router.broadcast(ADMISSION_INVALIDATE_CHANNEL, lecture_id, {})
+
+    async def on_shard_invalidate(self, lecture_id: int, message: dict):
+        self.capacity_cache.pop(lecture_id, None)
+
+    async def admit(self, lecture_id: int, user_id: int, live_user_ids: Callable[[], set]) -> Optional[str]:
+        """
+        입장 가능하면 자리를 예약하고 None, 아니면 거부 사유 반환 (강사와 재접속 사용자는 항상 허용)
+
+        정원 조회(await) 뒤에 현재 인원을 읽고 예약까지 await 없이 처리하므로 확인과 예약 사이에 다른 연결이 끼어들지 않습니다.
+        None을 받은 호출자는 연결 등록 후(또는 실패 시) 반드시 release를 호출합니다.
+        """
+        capacity = await self.get_capacity(lecture_id)
+        if capacity is None:
+            self.metrics["rejected_unknown_lecture"] += 1
+            return "존재하지 않는 강의입니다."
+
+        max_participants, instructor_id = capacity
+        reserved = self.reserved.setdefault(lecture_id, set())
+        connected = live_user_ids() | reserved
+        if user_id != instructor_id and user_id not in connected:
+            students = len(connected - {instructor_id})
+            if students >= max_participants:
+                if not reserved:
+                    del self.reserved[lecture_id]
+                self.metrics["rejected_full"] += 1
+                logger.warning(f"🚫 [WebSocket] 강의 정원 초과로 연결 거부 - lecture_id: {lecture_id}, "
+                               f"user_id: {user_id}, 현재: {students}/{max_participants}")
+                return "강의 정원이 초과되었습니다."
+
+        reserved.add(user_id)
+        self.metrics["total_admitted"] += 1
+        return None
+
+    def release(self, lecture_id: int, user_id: int):
+        """admit의 자리 예약 해제 - 연결이 레지스트리에 등록되었거나 등록 전에 실패한 뒤 호출"""
+        reserved = self.reserved.get(lecture_id)
+        if reserved is not None:
+            reserved.discard(user_id)
+            if not reserved:
+                del self.reserved[lecture_id]
+
+    def get_stats(self) -> dict:
+        return {
+            "cached_lectures": len(self.capacity_cache),
+            "reserved": sum(len(users) for users in self.reserved.values()),
+            **self.metrics
+        }
+
+
+async def reject_connection(websocket: WebSocket, code: int, reason: str):
+    """클라이언트가 close 코드를 받을 수 있도록 accept 후 종료"""
+    try:
+        if websocket.client_state == WebSocketState.CONNECTING:
+            await websocket.accept()
+        await websocket.close(code=code, reason=reason)
+    except Exception as e:
+        logger.debug(f"🔍 [WebSocket] 연결 거부 중 오류 (무시): {e}")
+
+
+# 채널별 전역 인스턴스
+chat_rate_limiter = WebSocketRateLimiter(
+    channel="chat",
+    connection_rate=settings.ws_chat_message_rate,
+    connection_burst=settings.ws_chat_message_burst,
+    lecture_rate=settings.ws_lecture_message_rate,
+    lecture_burst=settings.ws_lecture_message_burst,
+    max_frame_bytes=settings.ws_max_text_frame_bytes,
+    limited_types=CHAT_LIMITED_TYPES
+)
+stt_rate_limiter = WebSocketRateLimiter(
+    channel="stt",
+    connection_rate=settings.ws_stt_frame_rate,
+    connection_burst=settings.ws_stt_frame_burst,
+    lecture_rate=settings.ws_stt_frame_rate * 4,
+    lecture_burst=settings.ws_stt_frame_burst * 4,
+    max_frame_bytes=settings.ws_max_audio_frame_bytes
+)
+admission_controller = AdmissionController(cache_ttl=settings.ws_capacity_cache_ttl)
+shard_router.register(ADMISSION_INVALIDATE_CHANNEL, admission_controller.on_shard_invalidate)
@@ -0,0 +1,120 @@
+from collections import OrderedDict, deque
+from typing import Deque, Hashable, Iterable, Optional
+from datetime import datetime
+import logging
+
+from src.core.settings import settings
+
+logger = logging.getLogger(__name__)
+
+# 다시 보내줄 이벤트 타입 (완성된 자막과 채팅)
+CAPTION_TYPES = frozenset({"subtitle", "fullSentence"})
+CHAT_TYPES = frozenset({"chat_message"})
+
+
+class LectureReplay:
+    """강의 하나의 최근 이벤트 링 버퍼"""
+
+    __slots__ = ("events", "last_seq")
+
+    def __init__(self, capacity: int):
+        self.events: Deque[dict] = deque(maxlen=capacity)
+        self.last_seq = 0
+
+
+class ReplayBuffer:
+    """강의별 최근 N개 자막/채팅을 순번과 함께 보관 - 늦게 들어온 참가자와 재접속에 DB 없이 제공"""
+
+    def __init__(self, capacity: int = 200, max_lectures: int = 256):
+        self.capacity = capacity
+        self.max_lectures = max_lectures
+        # 최근 사용 순서로 강의 버퍼 유지 (max_lectures 초과 시 가장 오래된 강의부터 제거)
+        self.lectures: "OrderedDict[str, LectureReplay]" = OrderedDict()
+        self.metrics = {
+            "total_appended": 0,
+            "total_replays": 0,
+            "total_replayed_events": 0,
+            "truncated_replays": 0,
+            "evicted_lectures": 0,
+            "start_time": datetime.now().isoformat()
+        }
+
+    @staticmethod
+    def _key(lecture_id: Hashable) -> str:
+        # 채팅(int)과 자막 컨트롤러(str)가 같은 버퍼를 쓰도록 문자열 키 사용
+        return str(lecture_id)
+
+    def append(self, lecture_id: Hashable, event: dict) -> dict:
+        """이벤트에 순번(seq)을 붙여 저장하고 그대로 반환 (브로드캐스트에 같은 객체 사용)"""
+        key = self._key(lecture_id)
+        replay = self.lectures.get(key)
+        if replay is None:
+            replay = self.lectures[key] = LectureReplay(self.capacity)
+            if len(self.lectures) > self.max_lectures:
+                self.lectures.popitem(last=False)
+                self.metrics["evicted_lectures"] += 1
+        else:
+            self.lectures.move_to_end(key)
+
+        replay.last_seq += 1
+        event["seq"] = replay.last_seq
+        replay.events.append(event)
+        self.metrics["total_appended"] += 1
+        return event
+
+    def replay_frame(self, lecture_id: Hashable, since: Optional[int] = None,
+                     types: Optional[Iterable[str]] = None) -> dict:
+        """since 이후(없으면 전체) 이벤트를 한 프레임으로 묶어 반환"""
+        replay = self.lectures.get(self._key(lecture_id))
+        events = []
+        last_seq = 0
+        truncated = False
+
+        if replay is not None:
+            last_seq = replay.last_seq
+            if since is not None and since > last_seq:
+                # 서버 재시작 등으로 순번이 초기화됨 - 전체 재전송
+                since = None
+                truncated = True
+            elif since is not None and replay.events:
+                # 요청한 순번이 이미 버퍼에서 밀려났으면 클라이언트가 히스토리 API로 보충해야 함
+                truncated = replay.events[0]["seq"] > since + 1
+            if since is None or since < last_seq:
+                type_filter = frozenset(types) if types else None
+                events = [
+                    event for event in replay.events
+                    if (since is None or event["seq"] > since)
+                    and (type_filter is None or event.get("type") in type_filter)
+                ]
+
+        self.metrics["total_replays"] += 1
+        self.metrics["total_replayed_events"] += len(events)
+        if truncated:
+            self.metrics["truncated_replays"] += 1
+
+        return {
+            "type": "replay",
+            "events": events,
+            "last_seq": last_seq,
+            "truncated": truncated,
+            "timestamp": datetime.now().isoformat()
+        }
+
+    def clear(self, lecture_id: Hashable):
+        """강의 종료 시 버퍼 제거"""
+        self.lectures.pop(self._key(lecture_id), None)
+
+    def get_stats(self) -> dict:
+        return {
+            "capacity_per_lecture": self.capacity,
+            "buffered_lectures": len(self.lectures),
+            "buffered_events": sum(len(replay.events) for replay in self.lectures.values()),
+            **self.metrics
+        }
+
+
+# 전역 리플레이 버퍼 (채팅/STT/자막 채널 공유)
+replay_buffer = ReplayBuffer(
+    capacity=settings.ws_replay_buffer_size,
+    max_lectures=settings.ws_replay_max_lectures
+)
@@ -0,0 +1,249 @@
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+from datetime import datetime
+from fastapi import Request, Response
+from fastapi.encoders import jsonable_encoder
+import asyncio
+import hashlib
+import json
+import logging
+import time
+
+from src.core.settings import settings
+from src.services.sharding import shard_router
+
+# 여러 프로세스(샤드)가 캐시를 공유할 때 쓰는 Redis (선택 의존성)
+try:
+    import redis.asyncio as redis
+    REDIS_AVAILABLE = True
+except ImportError:
+    redis = None
+    REDIS_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+# 다른 샤드에 무효화를 알리는 채널
+INVALIDATE_CHANNEL = "cache:response"
+
+# 캐시 네임스페이스 (무효화 단위)
+AVAILABLE_VIDEOS = "videos:available"
+LECTURE_LIST = "lectures:list"
+SUPPORTED_LANGUAGES = "languages"
+
+
+def _etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+    candidates = [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+    return "*" in candidates or etag in candidates
+
+
+class MemoryCacheBackend:
+    """프로세스 내 LRU - 키마다 만료 시각을 두고 max_entries를 넘으면 가장 오래 안 쓴 항목부터 제거"""
+
+    name = "memory"
+
+    def __init__(self, max_entries: int = 1024):
+        self.max_entries = max_entries
+        # key -> (만료 시각, etag, body)
+        self.entries: "OrderedDict[str, Tuple[float, str, bytes]]" = OrderedDict()
+
+    async def get(self, key: str) -> Optional[Tuple[str, bytes]]:
+        entry = self.entries.get(key)
+        if entry is None:
+            return None
+        if entry[0] <= time.monotonic():
+            del self.entries[key]
+            return None
+        self.entries.move_to_end(key)
+        return entry[1], entry[2]
+
+    async def set(self, key: str, etag: str, body: bytes, ttl: float):
+        self.entries[key] = (time.monotonic() + ttl, etag, body)
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+
+    async def invalidate(self, namespace: str) -> int:
+        prefix = f"{namespace}:"
+        keys = [key for key in self.entries if key.startswith(prefix)]
+        for key in keys:
+            del self.entries[key]
+        return len(keys)
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+
+class RedisCacheBackend:
+    """Redis 공유 캐시 - 샤드가 여러 개여도 무효화가 모든 프로세스에 반영됨"""
+
+    name = "redis"
+
+    def __init__(self, url: str, key_prefix: str = "studytube:cache:"):
+        self.client = redis.from_url(url)
+        self.key_prefix = key_prefix
+
+    async def get(self, key: str) -> Optional[Tuple[str, bytes]]:
+        value = await self.client.get(self.key_prefix + key)
+        if value is None:
+            return None
+        etag, _, body = value.partition(b"\n")
+        return etag.decode(), body
+
+    async def set(self, key: str, etag: str, body: bytes, ttl: float):
+        await self.client.set(self.key_prefix + key, etag.encode() + b"\n" + body, px=int(ttl * 1000))
+
+    async def invalidate(self, namespace: str) -> int:
+        keys = [key async for key in self.client.scan_iter(match=f"{self.key_prefix}{namespace}:*")]
+        if keys:
+            await self.client.unlink(*keys)
+        return len(keys)
+
+    def __len__(self) -> int:
+        return 0
+
+
+class ResponseCache:
+    """자주 바뀌지 않는 공개 목록 응답 캐시 - 직렬화된 JSON과 ETag를 저장하고 If-None-Match에는 304로 응답"""
+
+    def __init__(self, backend, default_ttl: float):
+        self.backend = backend
+        self.default_ttl = default_ttl
+        # 같은 키의 동시 미스는 한 번만 생성
+        self.inflight: Dict[str, asyncio.Future] = {}
+        # 네임스페이스별 무효화 세대 - 생성 도중 무효화되면 이전 데이터를 저장하지 않음
+        self.generations: Dict[str, int] = {}
+        self.metrics = {
+            "hits": 0,
+            "misses": 0,
+            "not_modified": 0,
+            "bytes_served": 0,
+            "bytes_saved": 0,
+            "invalidations": 0,
+            "backend_errors": 0,
+            "start_time": datetime.now().isoformat()
+        }
+
+    @staticmethod
+    def encode(value: Any) -> Tuple[str, bytes]:
+        body = json.dumps(jsonable_encoder(value), ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+        return f'"{hashlib.blake2b(body, digest_size=16).hexdigest()}"', body
+
+    async def _lookup(self, key: str) -> Optional[Tuple[str, bytes]]:
+        try:
+            return await self.backend.get(key)
+        except Exception as e:
+            # 공유 캐시 장애 시 캐시 없이 계속 서비스
+            self.metrics["backend_errors"] += 1
+            logger.warning(f"⚠️ [캐시] 조회 실패 - {key}: {e}")
+            return None
+
+    async def _build(self, namespace: str, key: str, builder: Callable[[], Awaitable[Any]],
+                     ttl: float) -> Tuple[str, bytes]:
+        while (future := self.inflight.get(key)) is not None:
+            try:
+                return await asyncio.shield(future)
+            except asyncio.CancelledError:
+                # 먼저 생성하던 요청이 취소된 경우만 이어서 직접 생성 (이 요청이 취소됐으면 전파)
+                if not future.cancelled():
+                    raise
+
+        future = asyncio.get_running_loop().create_future()
+        self.inflight[key] = future
+        generation = self.generations.get(namespace, 0)
+        try:
+            etag, body = self.encode(await builder())
+            if self.generations.get(namespace, 0) == generation:
+                try:
+                    await self.backend.set(key, etag, body, ttl)
+                except Exception as e:
+                    self.metrics["backend_errors"] += 1
+                    logger.warning(f"⚠️ [캐시] 저장 실패 - {key}: {e}")
+            future.set_result((etag, body))
+            return etag, body
+        except Exception as e:
+            future.set_exception(e)
+            # 기다리는 쪽이 없어도 "never retrieved" 경고가 나지 않도록 소비
+            future.exception()
+            raise
+        finally:
+            # 생성 중 취소되면 기다리던 요청이 멈추지 않도록 future도 취소
+            if not future.done():
+                future.cancel()
+            if self.inflight.get(key) is future:
+                del self.inflight[key]
+
+    async def respond(self, request: Request, namespace: str, key: str,
+                      builder: Callable[[], Awaitable[Any]], ttl: Optional[float] = None) -> Response:
+        """캐시된 응답 반환 (없으면 builder로 생성), 클라이언트 ETag가 같으면 본문 없이 304"""
+        full_key = f"{namespace}:{key}"
+        cached = await self._lookup(full_key)
+        if cached is not None:
+            self.metrics["hits"] += 1
+            etag, body = cached
+        else:
+            self.metrics["misses"] += 1
+            etag, body = await self._build(namespace, full_key, builder, ttl or self.default_ttl)
+
+        headers = {"ETag": etag, "Cache-Control": "no-cache"}
+        if _etag_matches(request.headers.get("if-none-match"), etag):
+            self.metrics["not_modified"] += 1
+            self.metrics["bytes_saved"] += len(body)
+            return Response(status_code=304, headers=headers)
+
+        self.metrics["bytes_served"] += len(body)
+        return Response(content=body, media_type="application/json", headers=headers)
+
+    def _forget(self, namespace: str):
+        self.generations[namespace] = self.generations.get(namespace, 0) + 1
+        # 무효화 이전에 시작된 생성 결과를 새 요청이 기다리지 않도록 분리
+        prefix = f"{namespace}:"
+        for key in [key for key in self.inflight if key.startswith(prefix)]:
+            del self.inflight[key]
+
+    async def _invalidate_backend(self, namespace: str):
+        try:
+            removed = await self.backend.invalidate(namespace)
+        except Exception as e:
+            self.metrics["backend_errors"] += 1
+            logger.warning(f"⚠️ [캐시] 무효화 실패 - {namespace}: {e}")
+            return
+        self.metrics["invalidations"] += 1
+        logger.debug(f"🧹 [캐시] 무효화 - {namespace}: {removed}개")
+
+    async def invalidate(self, *namespaces: str):
+        """데이터가 바뀐 뒤 호출 - 해당 네임스페이스의 모든 키 삭제 (샤드가 여러 개면 다른 샤드에도 전달)"""
+        for namespace in namespaces:
+            self._forget(namespace)
+            await self._invalidate_backend(namespace)
+            shard_router.broadcast(INVALIDATE_CHANNEL, namespace, {})
+
+    async def on_shard_invalidate(self, namespace: str, message: dict):
+        """다른 샤드의 무효화 수신 - 공유(Redis) 캐시는 보낸 샤드가 이미 지웠으므로 세대만 올림"""
+        self._forget(namespace)
+        if self.backend.name == MemoryCacheBackend.name:
+            await self._invalidate_backend(namespace)
+
+    def get_stats(self) -> dict:
+        lookups = self.metrics["hits"] + self.metrics["misses"]
+        return {
+            "backend": self.backend.name,
+            "entries": len(self.backend),
+            "hit_rate": self.metrics["hits"] / lookups if lookups else 0,
+            **self.metrics
+        }
+
+
+def _create_backend():
+    if settings.response_cache_backend == "redis":
+        if REDIS_AVAILABLE:
+            logger.info(f"🗄️ [캐시] Redis 응답 캐시 사용 - {settings.response_cache_redis_url}")
+            return RedisCacheBackend(settings.response_cache_redis_url)
+        logger.warning("⚠️ [캐시] redis 패키지가 없어 프로세스 내 LRU 캐시 사용")
+    return MemoryCacheBackend(settings.response_cache_max_entries)
+
+
+# 전역 응답 캐시
+response_cache = ResponseCache(_create_backend(), default_ttl=settings.response_cache_ttl)
+shard_router.register(INVALIDATE_CHANNEL, response_cache.on_shard_invalidate)
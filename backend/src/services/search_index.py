@@ -0,0 +1,222 @@
+from pathlib import Path
+from typing import Dict, List, Optional
+import asyncio
+import html
+import json
+import logging
+import re
+import time
+
+from sqlalchemy import text
+
+from src.core.settings import settings
+from src.db.database import engine, read_engine
+from src.services.write_behind import WriteBehindPersister
+
+logger = logging.getLogger(__name__)
+
+SEARCH_SOURCES = ("transcript", "caption", "chat")
+
+# text만 색인하고 나머지는 결과 표시/필터용 (UNINDEXED)
+CREATE_INDEX_SQL = """
+CREATE VIRTUAL TABLE IF NOT EXISTS search_index USING fts5(
+    text,
+    source UNINDEXED,
+    video_id UNINDEXED,
+    lecture_id UNINDEXED,
+    language UNINDEXED,
+    ref_id UNINDEXED,
+    start_time UNINDEXED,
+    end_time UNINDEXED,
+    created_at UNINDEXED,
+    tokenize = 'unicode61 remove_diacritics 2',
+    prefix = '2 3'
+)
+"""
+
+INSERT_SQL = text(
+    "INSERT INTO search_index (text, source, video_id, lecture_id, language, ref_id, start_time, end_time, created_at) "
+    "VALUES (:text, :source, :video_id, :lecture_id, :language, :ref_id, :start_time, :end_time, :created_at)"
+)
+
+DELETE_TRANSCRIPT_SQL = text(
+    "DELETE FROM search_index WHERE source = 'transcript' AND video_id = :video_id AND language = :language"
+)
+
+# 스니펫 강조 표시 자리 (escape 후 <mark>로 치환 - 본문에 나올 일 없는 사용자 정의 영역 문자)
+MARK_START = "\ue000"
+MARK_END = "\ue001"
+
+# 볼 수 있는 결과만 - 공개 영상/내 영상의 자막, 내가 강사이거나 참석한 강의의 자막/채팅
+VISIBLE_CONDITION = (
+    "(video_id IN (SELECT id FROM videos WHERE is_public OR user_id = :user_id) "
+    "OR lecture_id IN (SELECT id FROM lectures WHERE instructor_id = :user_id "
+    "UNION SELECT lecture_id FROM lecture_participants WHERE student_id = :user_id))"
+)
+
+DOCUMENT_KEYS = ("text", "source", "video_id", "lecture_id", "language", "ref_id", "start_time", "end_time", "created_at")
+
+
+def render_snippet(snippet: Optional[str]) -> str:
+    """FTS5 스니펫을 HTML로 - 본문은 escape하고 강조 표시만 <mark> 태그로"""
+    escaped = html.escape(snippet or "")
+    return escaped.replace(MARK_START, "<mark>").replace(MARK_END, "</mark>")
+
+
+def build_match_query(query: str) -> Optional[str]:
+    """사용자 입력을 FTS5 MATCH 식으로 변환 - 단어별 접두어 검색 (한국어 조사 대응), 모든 단어 포함"""
+    terms = re.findall(r"\w+", query or "")
+    if not terms:
+        return None
+    return " ".join(f'"{term}"*' for term in terms)
+
+
+class SearchIndexer(WriteBehindPersister):
+    """FTS5 검색 색인 - 자막/실시간 자막/채팅을 모아 백그라운드에서 배치로 색인"""
+
+    def __init__(self, flush_interval: float, batch_size: int, max_buffer: int):
+        super().__init__(None, "검색", flush_interval, batch_size, max_buffer)
+        self.available = False
+
+    async def ensure_schema(self):
+        """FTS5 가상 테이블 생성 (SQLite가 FTS5 없이 빌드된 경우 색인/검색 비활성화)"""
+        if engine.dialect.name != "sqlite":
+            self.available = False
+            logger.warning(f"⚠️ [검색] FTS5는 SQLite 전용 - {engine.dialect.name}에서는 검색 비활성화")
+            return
+        try:
+            async with engine.begin() as conn:
+                await conn.execute(text(CREATE_INDEX_SQL))
+            self.available = True
+            logger.info("🔎 [검색] FTS5 검색 색인 준비 완료")
+        except Exception as e:
+            self.available = False
+            logger.warning(f"⚠️ [검색] FTS5 사용 불가 - 검색 비활성화: {e}")
+
+    def _add(self, **document) -> bool:
+        if not self.available or not (document.get("text") or "").strip():
+            return False
+        return self.submit({"op": "insert", **{key: document.get(key) for key in DOCUMENT_KEYS}})
+
+    def index_transcript(self, video_id: int, language: str, segments: List[Dict]) -> int:
+        """비디오 자막 세그먼트 색인 (같은 비디오/언어의 기존 색인은 교체)"""
+        if not self.available:
+            return 0
+        self.submit({"op": "delete", "video_id": video_id, "language": language})
+        added = 0
+        for position, segment in enumerate(segments or []):
+            added += self._add(
+                text=(segment.get("text") or "").strip(),
+                source="transcript",
+                video_id=video_id,
+                language=language,
+                ref_id=segment.get("id", position),
+                start_time=segment.get("start"),
+                end_time=segment.get("end")
+            )
+        return added
+
+    def index_captions(self, rows: List[Dict]):
+        """저장된 실시간 자막 색인 (자막 저장 작업이 커밋 후 호출)"""
+        for row in rows:
+            self._add(
+                text="\n".join(part for part in (row["text"], row.get("translated_text")) if part),
+                source="caption",
+                lecture_id=row["lecture_id"],
+                language=row.get("language"),
+                ref_id=row["id"],
+                created_at=row["created_at"].isoformat()
+            )
+
+    def index_chat_messages(self, rows: List[Dict]):
+        """저장된 채팅 색인 (귓속말은 제외, 채팅 저장 작업이 커밋 후 호출)"""
+        for row in rows:
+            if row.get("is_private"):
+                continue
+            self._add(
+                text=row["message"],
+                source="chat",
+                lecture_id=row["lecture_id"],
+                ref_id=row["id"],
+                created_at=row["created_at"].isoformat()
+            )
+
+    async def backfill_transcripts(self, root: Path, paths: Optional[List[Path]] = None):
+        """static/transcripts/{video_id}/{language}.json 자막 파일을 색인 대기열에 추가 (paths가 있으면 그 파일만)"""
+        if not self.available or not root.is_dir():
+            return
+        indexed = 0
+        for path in sorted(paths if paths is not None else root.glob("*/*.json")):
+            if not path.parent.name.isdigit():
+                continue
+            try:
+                data = await asyncio.to_thread(lambda: json.loads(path.read_text(encoding="utf-8")))
+            except Exception as e:
+                logger.warning(f"⚠️ [검색] 자막 파일 읽기 실패 - {path}: {e}")
+                continue
+            indexed += self.index_transcript(int(path.parent.name), path.stem, data.get("segments", []))
+            # 큰 자막 파일이 버퍼를 넘치지 않도록 색인이 따라잡을 때까지 대기
+            while len(self.buffer) >= self.max_buffer // 2:
+                await asyncio.sleep(self.flush_interval)
+        logger.info(f"🔎 [검색] 자막 파일 색인 예약 - {indexed}개 세그먼트")
+
+    async def _write(self, conn, batch: List[Dict]):
+        # 삭제와 삽입의 순서를 지키면서 연속된 삽입은 executemany로 묶음
+        pending: List[Dict] = []
+        for row in batch:
+            if row["op"] == "delete":
+                if pending:
+                    await conn.execute(INSERT_SQL, pending)
+                    pending = []
+                await conn.execute(DELETE_TRANSCRIPT_SQL, {"video_id": row["video_id"], "language": row["language"]})
+            else:
+                pending.append({key: row[key] for key in DOCUMENT_KEYS})
+        if pending:
+            await conn.execute(INSERT_SQL, pending)
+
+    async def search(self, query: str, user_id: int, source: Optional[str] = None, video_id: Optional[int] = None,
+                     lecture_id: Optional[int] = None, language: Optional[str] = None,
+                     limit: int = 20) -> List[Dict]:
+        """bm25 순위로 검색 - user_id가 볼 수 있는 영상/강의만, 스니펫(HTML escape 후 <mark> 강조)과 세그먼트 시간 포함"""
+        match = build_match_query(query)
+        if match is None:
+            return []
+
+        conditions = ["search_index MATCH :match", VISIBLE_CONDITION]
+        params = {"match": match, "limit": limit, "user_id": user_id, "mark_start": MARK_START, "mark_end": MARK_END}
+        for column, value in (("source", source), ("video_id", video_id),
+                              ("lecture_id", lecture_id), ("language", language)):
+            if value is not None:
+                conditions.append(f"{column} = :{column}")
+                params[column] = value
+
+        statement = text(
+            "SELECT source, video_id, lecture_id, language, ref_id, start_time, end_time, created_at, "
+            "snippet(search_index, 0, :mark_start, :mark_end, '…', 16) AS snippet, "
+            "bm25(search_index) AS score "
+            f"FROM search_index WHERE {' AND '.join(conditions)} "
+            "ORDER BY score LIMIT :limit"
+        )
+        search_start = time.perf_counter()
+        async with read_engine.connect() as conn:
+            result = await conn.execute(statement, params)
+            hits = [dict(row) for row in result.mappings()]
+        for hit in hits:
+            hit["snippet"] = render_snippet(hit["snippet"])
+        self.metrics["last_search_ms"] = (time.perf_counter() - search_start) * 1000
+        return hits
+
+    def get_stats(self) -> dict:
+        return {
+            "available": self.available,
+            "last_search_ms": self.metrics.get("last_search_ms", 0.0),
+            **super().get_stats()
+        }
+
+
+# 전역 검색 색인 작업 (lifespan에서 시작/종료)
+search_indexer = SearchIndexer(
+    flush_interval=settings.search_index_interval_ms / 1000,
+    batch_size=settings.search_index_batch_size,
+    max_buffer=settings.search_index_buffer_limit
+)
@@ -0,0 +1,190 @@
+from bisect import bisect
+from typing import Any, Awaitable, Callable, Dict, Hashable, List, Optional
+from datetime import datetime
+import asyncio
+import hashlib
+import logging
+import re
+import threading
+
+from src.core.settings import settings
+
+logger = logging.getLogger(__name__)
+
+ShardHandler = Callable[[Hashable, dict], Awaitable[Any]]
+
+# 다른 샤드 소유 강의로 접속했을 때의 close 코드 (프론트 리스너가 경로로 넘기므로 보통은 일어나지 않음)
+WRONG_SHARD_CLOSE_CODE = 4010
+
+# 강의 소유 샤드에서 처리해야 하는 경로 - WebSocket과 강의별 메모리 상태(레코더, tail 캐시, 참가자)를 쓰는 REST
+LECTURE_PATH = re.compile(
+    r"^/(?:ws/(?:chat|stt|shard)|api/stt/ws(?:/audio)?|api/stt/(?:start-recording|stop-recording|test-subtitle)"
+    r"|api/chat|api/lectures)/([^/]+)"
+)
+
+
+def lecture_for_path(path: str):
+    """요청 경로의 강의 ID (강의 소유 샤드로 보낼 경로가 아니면 None)"""
+    match = LECTURE_PATH.match(path)
+    return match.group(1) if match else None
+
+
+class HashRing:
+    """가상 노드를 사용하는 일관된 해시 링 - 샤드 수가 바뀌어도 대부분의 강의는 같은 샤드에 남음"""
+
+    def __init__(self, nodes: List[int], vnodes: int = 64):
+        self.vnodes = vnodes
+        self.points: List[int] = []
+        self.owners: List[int] = []
+        ring = sorted(
+            (self._hash(f"{node}#{replica}"), node)
+            for node in nodes for replica in range(vnodes)
+        )
+        for point, node in ring:
+            self.points.append(point)
+            self.owners.append(node)
+
+    @staticmethod
+    def _hash(key: str) -> int:
+        return int.from_bytes(hashlib.blake2b(key.encode("utf-8"), digest_size=8).digest(), "big")
+
+    def node_for(self, key: Hashable) -> int:
+        index = bisect(self.points, self._hash(str(key))) % len(self.points)
+        return self.owners[index]
+
+
+class ShardRouter:
+    """강의를 샤드(프로세스)에 고정하고 다른 샤드 소유 강의의 이벤트를 큐로 전달"""
+
+    def __init__(self):
+        self.index = 0
+        self.count = 1
+        self.queues: Optional[list] = None
+        self.ready_event = None
+        self.ring = HashRing([0])
+        self.handlers: Dict[str, ShardHandler] = {}
+        self.loop: Optional[asyncio.AbstractEventLoop] = None
+        self.consumer: Optional[threading.Thread] = None
+        self.metrics = {
+            "local_dispatches": 0,
+            "forwarded": 0,
+            "broadcasts": 0,
+            "received": 0,
+            "handler_errors": 0,
+            "start_time": datetime.now().isoformat()
+        }
+
+    def configure(self, index: int, count: int, queues: list, ready_event=None):
+        """샤드 프로세스 시작 시 호출 (앱 import 전에)"""
+        self.index = index
+        self.count = count
+        self.queues = queues
+        self.ready_event = ready_event
+        self.ring = HashRing(list(range(count)), settings.ws_shard_vnodes)
+
+    @property
+    def enabled(self) -> bool:
+        return self.count > 1
+
+    @property
+    def is_primary(self) -> bool:
+        return self.index == 0
+
+    def shard_for(self, lecture_id: Hashable) -> int:
+        if not self.enabled:
+            return 0
+        return self.ring.node_for(lecture_id)
+
+    def owns(self, lecture_id: Hashable) -> bool:
+        return self.shard_for(lecture_id) == self.index
+
+    def shard_info(self, lecture_id: Hashable) -> dict:
+        shard = self.shard_for(lecture_id)
+        return {
+            "lecture_id": str(lecture_id),
+            "shard": shard,
+            "shard_count": self.count,
+            "owned": shard == self.index
+        }
+
+    def wrong_shard_reason(self, lecture_id: Hashable) -> str:
+        return f"shard={self.shard_for(lecture_id)}"
+
+    def register(self, channel: str, handler: ShardHandler):
+        """채널별 이벤트 처리기 등록 (예: 자막 브로드캐스트)"""
+        self.handlers[channel] = handler
+
+    async def dispatch(self, channel: str, lecture_id: Hashable, message: dict):
+        """소유 샤드에서 이벤트 처리 - 로컬이면 바로 실행, 아니면 소유 샤드 큐로 전달"""
+        shard = self.shard_for(lecture_id)
+        if shard == self.index:
+            self.metrics["local_dispatches"] += 1
+            await self.handlers[channel](lecture_id, message)
+            return
+
+        self.queues[shard].put((channel, lecture_id, message))
+        self.metrics["forwarded"] += 1
+        logger.debug(f"🔀 [샤드] 이벤트 전달 - channel: {channel}, lecture_id: {lecture_id}, "
+                     f"{self.index} → {shard}")
+
+    def broadcast(self, channel: str, key: Hashable, message: dict):
+        """다른 모든 샤드에 이벤트 전달 - 프로세스별 캐시 무효화용 (이 샤드는 호출자가 직접 처리)"""
+        if not self.enabled:
+            return
+        for shard, queue in enumerate(self.queues):
+            if shard != self.index:
+                queue.put((channel, key, message))
+        self.metrics["broadcasts"] += 1
+
+    async def _handle(self, channel: str, lecture_id: Hashable, message: dict):
+        handler = self.handlers.get(channel)
+        if handler is None:
+            logger.warning(f"⚠️ [샤드] 처리기 없는 채널 - channel: {channel}")
+            return
+        try:
+            await handler(lecture_id, message)
+        except Exception as e:
+            self.metrics["handler_errors"] += 1
+            logger.error(f"❌ [샤드] 전달된 이벤트 처리 오류 - channel: {channel}, 오류: {e}")
+
+    def _consume(self):
+        # 블로킹 get은 전용 스레드에서, 처리는 이벤트 루프에서
+        queue = self.queues[self.index]
+        while True:
+            item = queue.get()
+            if item is None:
+                break
+            self.metrics["received"] += 1
+            asyncio.run_coroutine_threadsafe(self._handle(*item), self.loop)
+
+    def start(self):
+        if not self.enabled or self.consumer is not None:
+            return
+        self.loop = asyncio.get_running_loop()
+        self.consumer = threading.Thread(target=self._consume, name=f"shard-{self.index}-consumer", daemon=True)
+        self.consumer.start()
+        logger.info(f"🧩 [샤드] 샤드 {self.index}/{self.count} 시작")
+
+    def mark_ready(self):
+        """초기화 완료 알림 (주 샤드가 DB를 준비한 뒤 나머지 샤드 시작)"""
+        if self.ready_event is not None:
+            self.ready_event.set()
+
+    async def stop(self):
+        if self.consumer is None:
+            return
+        self.queues[self.index].put(None)
+        await asyncio.get_running_loop().run_in_executor(None, self.consumer.join, 1.0)
+        self.consumer = None
+
+    def get_stats(self) -> dict:
+        return {
+            "shard": self.index,
+            "shard_count": self.count,
+            "handlers": list(self.handlers),
+            **self.metrics
+        }
+
+
+# 프로세스 전역 샤드 라우터 (샤드 미사용 시 모든 강의를 로컬에서 처리)
+shard_router = ShardRouter()
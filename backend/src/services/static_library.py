@@ -0,0 +1,328 @@
+from pathlib import Path
+from typing import Dict, List, Tuple
+from datetime import datetime
+import asyncio
+import logging
+import time
+
+from sqlmodel import select
+
+from src.core.settings import settings
+from src.db.database import session_scope
+from src.models.static_file import StaticFile
+from src.models.user import User
+from src.repositories.static_files import get_static_files, load_static_manifest
+from src.repositories.videos import get_video_ids_by_url, insert_videos, set_media_fields, set_thumbnail_urls
+from src.services.media_probe import media_probe
+from src.services.response_cache import AVAILABLE_VIDEOS, response_cache
+from src.services.search_index import search_indexer
+from src.services.thumbnails import ThumbnailPool, thumbnail_pool
+
+logger = logging.getLogger(__name__)
+
+VIDEO_EXTENSIONS = {".mp4", ".avi", ".mov", ".mkv"}
+
+
+def _scan(directory: Path, pattern: str, suffixes=None) -> Dict[str, Tuple[int, int]]:
+    """static/ 기준 상대 경로 -> (크기, 수정 시각 ns)"""
+    files = {}
+    if not directory.is_dir():
+        return files
+    for path in directory.glob(pattern):
+        if not path.is_file() or (suffixes and path.suffix.lower() not in suffixes):
+            continue
+        stat = path.stat()
+        files[path.as_posix()] = (stat.st_size, stat.st_mtime_ns)
+    return files
+
+
+def _changed(files: Dict[str, Tuple[int, int]], manifest: Dict[str, StaticFile]) -> List[str]:
+    return [
+        path for path, (size, mtime_ns) in files.items()
+        if path not in manifest or (manifest[path].size, manifest[path].mtime_ns) != (size, mtime_ns)
+    ]
+
+
+def _record(db, manifest: Dict[str, StaticFile], path: str, stat: Tuple[int, int], video_id: int = None):
+    entry = manifest.get(path) or StaticFile(path=path, size=0, mtime_ns=0)
+    entry.size, entry.mtime_ns = stat
+    entry.video_id = video_id if video_id is not None else entry.video_id
+    entry.synced_at = datetime.utcnow()
+    db.add(entry)
+
+
+async def _remove_missing(db, manifest: Dict[str, StaticFile], files: Dict[str, Tuple[int, int]]) -> int:
+    # 사라진 파일은 매니페스트에서만 제거 (등록된 영상/사용자 데이터는 유지)
+    missing = [entry for path, entry in manifest.items() if path not in files]
+    for entry in missing:
+        await db.delete(entry)
+    return len(missing)
+
+
+def _video_row(file_path: Path, owner_id: int, media_fields: dict) -> dict:
+    # 일괄 INSERT는 모델의 default_factory를 거치지 않으므로 모든 값을 채움
+    return {
+        "url": f"static/{file_path.name}",
+        "title": file_path.stem,  # 파일 이름을 제목으로 사용
+        "thumbnail_url": "",
+        "description": f"{file_path.name} 영상입니다.",
+        "transcript": "",
+        "summary": "",
+        "user_id": owner_id,
+        "is_public": True,
+        "is_processed": False,
+        "created_at": datetime.utcnow(),
+        **media_fields
+    }
+
+
+class StaticLibraryIngestor:
+    """
+    static/ 영상 등록 서비스
+
+    매니페스트와 크기/수정 시각이 같은 파일은 건너뛰고, 새로 생기거나 바뀐 파일만
+    한 트랜잭션에서 일괄 등록한 뒤 썸네일은 프로세스 풀에서 병렬로 생성합니다.
+    시작 시에는 백그라운드 작업으로 실행되어 서버 준비를 막지 않습니다.
+    """
+
+    def __init__(self, pool: ThumbnailPool, batch_size: int):
+        self.pool = pool
+        # 썸네일 URL을 이 개수만큼 모아서 한 번에 갱신
+        self.batch_size = batch_size
+        self.task: asyncio.Task | None = None
+        # 시작 작업과 초기화 API가 같은 파일을 동시에 등록하지 않도록 직렬화
+        self.lock = asyncio.Lock()
+        self.progress = {
+            "state": "idle",
+            "total_files": 0,
+            "changed": 0,
+            "registered": 0,
+            "thumbnails_done": 0,
+            "thumbnails_failed": 0,
+            "started_at": None,
+            "finished_at": None,
+            "elapsed_seconds": None,
+            "videos_per_minute": None
+        }
+
+    async def _resolve_owner(self, db, owner_username: str) -> int | None:
+        result = await db.exec(select(User.id).where(User.username == owner_username))
+        return result.first()
+
+    async def _register(self, static_dir: Path, files: Dict[str, Tuple[int, int]], owner_username: str,
+                        owner_id: int | None) -> Tuple[Dict[str, int], List[Tuple[str, int, bool, Tuple[int, int]]]]:
+        """
+        매니페스트 비교 후 바뀐 파일을 한 트랜잭션으로 등록
+
+        바뀐 파일의 매니페스트는 썸네일이 만들어진 뒤에 갱신하므로(_flush_thumbnails),
+        썸네일 생성이 실패하거나 중단된 파일은 다음 동기화에서 다시 처리됩니다.
+
+        Returns:
+            (전체 파일 경로 -> 영상 id, [(바뀐 파일 경로, 영상 id, 썸네일 재생성 여부, (크기, 수정 시각))])
+        """
+        async with session_scope() as db:
+            manifest = await load_static_manifest(db, f"{static_dir.as_posix()}/")
+            # 하위 폴더(transcripts 등)의 항목은 영상 매니페스트가 아님
+            manifest = {path: entry for path, entry in manifest.items() if Path(path).parent == static_dir}
+            changed = _changed(files, manifest)
+            removed = await _remove_missing(db, manifest, files)
+            video_ids = {path: manifest[path].video_id for path in files if path in manifest and path not in changed}
+            self.progress["changed"] = len(changed)
+            if removed:
+                logger.info(f"📁 [정적] 사라진 파일 매니페스트 제거 - {removed}개")
+
+            if changed and owner_id is None:
+                owner_id = await self._resolve_owner(db, owner_username)
+                if owner_id is None:
+                    logger.warning(f"⚠️ [정적] 기본 사용자({owner_username})가 없어 영상 등록을 건너뜀 - 대상 {len(changed)}개")
+                    await db.commit()
+                    return video_ids, []
+
+            # 바뀐 파일만 헤더에서 재생 시간/오디오 정보를 읽음 (바뀌지 않은 파일은 DB 값 유지)
+            media_fields = await media_probe.probe_video_files(changed)
+
+            # 이미 등록된 영상은 한 번에 조회하고 나머지는 INSERT 한 문장으로 등록
+            urls = {path: f"static/{Path(path).name}" for path in changed}
+            existing = await get_video_ids_by_url(db, urls.values())
+            new_rows = [_video_row(Path(path), owner_id, media_fields[path])
+                        for path in changed if urls[path] not in existing]
+            created = await insert_videos(db, new_rows)
+            await set_media_fields(db, {
+                existing[urls[path]]: media_fields[path] for path in changed if urls[path] in existing
+            })
+            ids_by_url = {**existing, **created}
+
+            work = []
+            for path in changed:
+                video_id = ids_by_url[urls[path]]
+                video_ids[path] = video_id
+                # 내용이 바뀐 파일은 썸네일을 다시 생성
+                work.append((path, video_id, path in manifest, files[path]))
+            await db.commit()
+
+        self.progress["registered"] = len(new_rows)
+        if work:
+            await response_cache.invalidate(AVAILABLE_VIDEOS)
+        logger.info(f"📁 [정적] 영상 일괄 등록 - 새 영상 {len(new_rows)}개, 재처리 {len(existing)}개")
+        return video_ids, work
+
+    async def _flush_thumbnails(self, thumbnail_urls: Dict[int, str], synced: Dict[str, Tuple[Tuple[int, int], int]]):
+        """썸네일 URL과 썸네일까지 끝난 파일의 매니페스트를 한 트랜잭션으로 기록"""
+        if not thumbnail_urls and not synced:
+            return
+        async with session_scope() as db:
+            await set_thumbnail_urls(db, thumbnail_urls)
+            manifest = await get_static_files(db, synced)
+            for path, (stat, video_id) in synced.items():
+                _record(db, manifest, path, stat, video_id)
+            await db.commit()
+        thumbnail_urls.clear()
+        synced.clear()
+        await response_cache.invalidate(AVAILABLE_VIDEOS)
+
+    async def _thumbnails(self, thumbnail_dir: Path, work: List[Tuple[str, int, bool, Tuple[int, int]]]):
+        """프로세스 풀로 썸네일 생성 - 끝나는 대로 batch_size개씩 thumbnail_url과 매니페스트 갱신"""
+        async def extract(path: str, video_id: int, regenerate: bool, stat: Tuple[int, int]):
+            thumbnail_path = thumbnail_dir / f"{video_id}.jpg"
+            if thumbnail_path.exists() and not regenerate:
+                return path, video_id, stat, True
+            return path, video_id, stat, await self.pool.extract(path, str(thumbnail_path), 5)
+
+        pending: Dict[int, str] = {}
+        synced: Dict[str, Tuple[Tuple[int, int], int]] = {}
+        last_logged = 0
+        tasks = [asyncio.create_task(extract(*item)) for item in work]
+        try:
+            for future in asyncio.as_completed(tasks):
+                path, video_id, stat, ok = await future
+                if ok:
+                    self.progress["thumbnails_done"] += 1
+                    pending[video_id] = f"static/thumbnails/{video_id}.jpg"
+                    synced[path] = (stat, video_id)
+                else:
+                    # 매니페스트를 갱신하지 않아 다음 동기화에서 다시 시도
+                    self.progress["thumbnails_failed"] += 1
+                if len(pending) >= self.batch_size:
+                    await self._flush_thumbnails(pending, synced)
+
+                finished = self.progress["thumbnails_done"] + self.progress["thumbnails_failed"]
+                if finished - last_logged >= max(1, len(work) // 10):
+                    last_logged = finished
+                    logger.info(f"🖼️ [정적] 썸네일 진행 - {finished}/{len(work)} (실패 {self.progress['thumbnails_failed']})")
+        finally:
+            # 중단(종료)되면 아직 풀에서 시작하지 않은 추출도 취소
+            for task in tasks:
+                task.cancel()
+        await self._flush_thumbnails(pending, synced)
+
+    async def ingest(self, static_dir: Path, owner_username: str = "professor",
+                     owner_id: int | None = None) -> List[int]:
+        """
+        static/ 영상 파일을 DB와 맞춥니다.
+
+        Args:
+            static_dir: 영상 폴더
+            owner_username: 새 영상의 소유자 (owner_id가 없을 때)
+            owner_id: 새 영상의 소유자 id
+
+        Returns:
+            List[int]: static/ 영상 파일 전체의 영상 id
+        """
+        async with self.lock:
+            ingest_start = time.perf_counter()
+            self.progress.update(
+                state="scanning", changed=0, registered=0, thumbnails_done=0, thumbnails_failed=0,
+                started_at=datetime.now().isoformat(), finished_at=None, elapsed_seconds=None, videos_per_minute=None
+            )
+            try:
+                thumbnail_dir = static_dir / "thumbnails"
+                thumbnail_dir.mkdir(parents=True, exist_ok=True)
+                files = await asyncio.to_thread(_scan, static_dir, "*", VIDEO_EXTENSIONS)
+                self.progress["total_files"] = len(files)
+
+                self.progress["state"] = "registering"
+                video_ids, work = await self._register(static_dir, files, owner_username, owner_id)
+
+                self.progress["state"] = "thumbnails"
+                await self._thumbnails(thumbnail_dir, work)
+                self.progress["state"] = "done"
+            except BaseException:
+                self.progress["state"] = "failed"
+                raise
+            finally:
+                elapsed = time.perf_counter() - ingest_start
+                self.progress["finished_at"] = datetime.now().isoformat()
+                self.progress["elapsed_seconds"] = round(elapsed, 3)
+                if self.progress["changed"]:
+                    self.progress["videos_per_minute"] = round(self.progress["changed"] / elapsed * 60, 1)
+
+        logger.info(f"📁 [정적] 영상 동기화 완료 - 전체 {len(files)}개, 처리 {len(work)}개, "
+                    f"썸네일 실패 {self.progress['thumbnails_failed']}개, 소요시간: {elapsed * 1000:.1f}ms"
+                    + (f", {self.progress['videos_per_minute']}개/분" if work else ""))
+        return [video_ids[path] for path in sorted(video_ids) if video_ids[path] is not None]
+
+    async def _run(self, static_dir: Path):
+        try:
+            await self.ingest(static_dir)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"❌ [정적] 영상 동기화 실패: {e}", exc_info=True)
+
+    def start(self, static_dir: Path):
+        """백그라운드 동기화 시작 - 서버는 등록/썸네일 생성이 끝나기 전에 요청을 받음"""
+        if self.task is None or self.task.done():
+            self.task = asyncio.create_task(self._run(static_dir))
+
+    async def stop(self):
+        if self.task is not None and not self.task.done():
+            self.task.cancel()
+            try:
+                await self.task
+            except asyncio.CancelledError:
+                pass
+            logger.info(f"🛑 [정적] 영상 동기화 중단 - 진행 상태: {self.progress['state']}")
+        self.task = None
+        self.pool.shutdown()
+
+    def get_stats(self) -> dict:
+        return {
+            "running": self.task is not None and not self.task.done(),
+            **self.progress
+        }
+
+
+# 전역 static/ 등록 서비스 (lifespan에서 시작/종료)
+static_ingestor = StaticLibraryIngestor(thumbnail_pool, batch_size=settings.static_ingest_batch_size)
+
+
+async def backfill_static_transcripts(transcript_dir: Path) -> int:
+    """바뀐 자막 파일만 검색 색인에 다시 넣고, 기록이 끝난 뒤 매니페스트 갱신"""
+    if not search_indexer.available:
+        return 0
+    files = await asyncio.to_thread(_scan, transcript_dir, "*/*.json")
+
+    async with session_scope() as db:
+        manifest = await load_static_manifest(db, f"{transcript_dir.as_posix()}/")
+        changed = _changed(files, manifest)
+        removed = await _remove_missing(db, manifest, files)
+        await db.commit()
+
+    if not changed:
+        logger.info(f"🔎 [검색] 자막 파일 변경 없음 - 전체 {len(files)}개, 매니페스트 제거 {removed}개")
+        return 0
+
+    failed_before = search_indexer.metrics["failed_flushes"]
+    await search_indexer.backfill_transcripts(transcript_dir, [Path(path) for path in changed])
+    await search_indexer.flush()
+    if search_indexer.metrics["failed_flushes"] != failed_before:
+        # 색인 기록이 실패했으면 다음 시작 때 다시 시도하도록 매니페스트를 갱신하지 않음
+        logger.warning("⚠️ [검색] 자막 색인 기록 실패 - 매니페스트 갱신 보류")
+        return 0
+
+    async with session_scope() as db:
+        manifest = await load_static_manifest(db, f"{transcript_dir.as_posix()}/")
+        for path in changed:
+            _record(db, manifest, path, files[path])
+        await db.commit()
+    return len(changed)
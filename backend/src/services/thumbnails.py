@@ -0,0 +1,89 @@
+from concurrent.futures import ProcessPoolExecutor
+from typing import Optional
+import asyncio
+import logging
+import multiprocessing
+import os
+import shutil
+import subprocess
+
+from src.core.settings import settings
+
+logger = logging.getLogger(__name__)
+
+
+def extract_keyframe_thumbnail(video_path: str, thumbnail_path: str, time: int = 5, width: int = 480) -> None:
+    """
+    ffmpeg로 time(초) 부근의 키프레임 하나만 디코딩해 썸네일(JPEG)을 저장합니다.
+
+    -ss를 입력 앞에 두고 -skip_frame nokey로 키프레임 외 프레임은 디코딩하지 않으므로
+    영상 길이와 상관없이 거의 일정한 시간에 끝납니다. ffmpeg가 없으면 moviepy로 추출합니다.
+    프로세스 풀에서 실행되므로 모듈 최상위 함수로 둡니다.
+    """
+    if shutil.which("ffmpeg") is None:
+        from src.services.youtube import extract_thumbnail_from_video
+        extract_thumbnail_from_video(video_path, thumbnail_path, time)
+        return
+
+    error = ""
+    # 영상이 time보다 짧으면 프레임이 나오지 않으므로 처음 키프레임으로 다시 시도
+    for seek in dict.fromkeys((time, 0)):
+        result = subprocess.run(
+            ["ffmpeg", "-hide_banner", "-loglevel", "error", "-y",
+             "-skip_frame", "nokey", "-ss", str(seek), "-noaccurate_seek", "-i", video_path,
+             "-frames:v", "1", "-vf", f"scale={width}:-2", "-q:v", "4", thumbnail_path],
+            capture_output=True,
+            timeout=settings.thumbnail_timeout
+        )
+        if result.returncode == 0 and os.path.exists(thumbnail_path) and os.path.getsize(thumbnail_path) > 0:
+            return
+        error = result.stderr.decode("utf-8", errors="ignore").strip()
+    raise RuntimeError(f"ffmpeg 썸네일 추출 오류: {error[-300:]}")
+
+
+class ThumbnailPool:
+    """썸네일 추출용 프로세스 풀 - 동시 추출 수를 max_workers로 제한하고 이벤트 루프를 막지 않음"""
+
+    def __init__(self, max_workers: int):
+        self.max_workers = max_workers
+        self.executor: Optional[ProcessPoolExecutor] = None
+        self.metrics = {
+            "total_extracted": 0,
+            "total_failed": 0
+        }
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        # 처음 쓸 때 생성 (썸네일이 필요 없는 실행에서는 프로세스를 띄우지 않음)
+        if self.executor is None:
+            # fork는 이벤트 루프 스레드 상태까지 복사하므로 spawn 사용
+            self.executor = ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                mp_context=multiprocessing.get_context("spawn")
+            )
+            logger.info(f"🖼️ [썸네일] 프로세스 풀 시작 - 작업자: {self.max_workers}")
+        return self.executor
+
+    async def extract(self, video_path: str, thumbnail_path: str, time: int = 5) -> bool:
+        """썸네일 추출 (실패 시 False)"""
+        loop = asyncio.get_running_loop()
+        try:
+            await loop.run_in_executor(
+                self._get_executor(), extract_keyframe_thumbnail, video_path, thumbnail_path, time
+            )
+            self.metrics["total_extracted"] += 1
+            return True
+        except Exception as e:
+            self.metrics["total_failed"] += 1
+            logger.error(f"썸네일 생성 실패 ({video_path}): {e}")
+            return False
+
+    def shutdown(self):
+        if self.executor is not None:
+            self.executor.shutdown(wait=False, cancel_futures=True)
+            self.executor = None
+            logger.info(f"🛑 [썸네일] 프로세스 풀 종료 - 생성: {self.metrics['total_extracted']}, "
+                        f"실패: {self.metrics['total_failed']}")
+
+
+# 전역 썸네일 풀 (종료는 lifespan에서)
+thumbnail_pool = ThumbnailPool(max_workers=settings.thumbnail_workers)
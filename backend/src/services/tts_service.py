@@ -8,6 +8,9 @@ from typing import Optional, List, Dict
 # 테스트 모드 설정
 TEST_MODE = False  # 실제 환경에서는 False로 설정
 
+# 음성 합성 엔진 (gTTS는 언어별 음성이 하나라 엔진과 언어로 결과가 정해짐)
+TTS_ENGINE = "gtts"
+
 # 지원 언어 목록
 SUPPORTED_LANGUAGES = {
     "ko": "한국어",
@@ -20,6 +23,10 @@ SUPPORTED_LANGUAGES = {
     "ru": "러시아어"
 }
 
+def engine_tag() -> str:
+    """처리 결과 캐시 키에 넣을 엔진 이름 - 테스트 모드의 더미 결과가 실제 결과로 재사용되지 않게 구분"""
+    return f"{TTS_ENGINE}+test" if TEST_MODE else TTS_ENGINE
+
 def get_supported_languages() -> Dict[str, str]:
     """
     지원하는 언어 목록을 반환합니다.
@@ -4,6 +4,8 @@ import logging
 import time
 from datetime import datetime
 
+from src.services.heartbeat import heartbeat_scheduler
+
 # 로깅 설정
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -32,13 +34,15 @@ class WebSocketManager:
         
         # 기존 연결이 있는지 확인
         if user_id in self.connections:
-            old_lecture_id = self.connections[user_id][1]
+            old_websocket, old_lecture_id = self.connections[user_id]
+            heartbeat_scheduler.unregister(old_websocket)
             logger.warning(f"🔄 [WebSocket] 기존 연결 교체 - user_id: {user_id}, "
                           f"이전 강의: {old_lecture_id} → 새 강의: {lecture_id}")
         else:
             logger.info(f"🆕 [WebSocket] 새 연결 생성 - user_id: {user_id}")
         
         self.connections[user_id] = (websocket, lecture_id)
+        heartbeat_scheduler.register(websocket, lambda ws: self._on_dead(user_id, ws))
         
         # 메트릭 업데이트
         self.metrics["total_connections"] += 1
@@ -59,10 +63,17 @@ class WebSocketManager:
         logger.info(f"✅ [WebSocket] 연결 완료 - user_id: {user_id}, lecture_id: {lecture_id}")
         logger.info(f"📊 [WebSocket] 연결 시간: {connection_time:.3f}s, 총 활성 연결: {len(self.connections)}")
 
+    async def _on_dead(self, user_id: int, websocket: WebSocket):
+        """heartbeat가 정리한 연결 해제 (재연결로 교체된 경우는 무시)"""
+        connection = self.connections.get(user_id)
+        if connection and connection[0] is websocket:
+            await self.disconnect(user_id)
+
     async def disconnect(self, user_id: int):
         """사용자 연결 해제"""
         if user_id in self.connections:
-            lecture_id = self.connections[user_id][1]
+            websocket, lecture_id = self.connections[user_id]
+            heartbeat_scheduler.unregister(websocket)
             del self.connections[user_id]
             
             self.metrics["total_disconnections"] += 1
@@ -199,7 +210,7 @@ class WebSocketManager:
         return stats
 
     def cleanup_stale_connections(self):
-        """유효하지 않은 연결 정리"""
+        """유효하지 않은 연결 정리 (수동 점검용 - 평상시 정리는 heartbeat_scheduler 담당)"""
         cleanup_start = time.time()
         
         stale_users = []
@@ -215,7 +226,8 @@ class WebSocketManager:
         # 유효하지 않은 연결 제거
         for user_id in stale_users:
             if user_id in self.connections:
-                lecture_id = self.connections[user_id][1]
+                websocket, lecture_id = self.connections[user_id]
+                heartbeat_scheduler.unregister(websocket)
                 del self.connections[user_id]
                 self.metrics["total_disconnections"] += 1
                 
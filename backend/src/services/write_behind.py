@@ -0,0 +1,213 @@
+from collections import deque
+from typing import Callable, Deque, Dict, List, Optional
+from datetime import datetime
+import asyncio
+import logging
+import time
+
+from sqlalchemy import insert
+from sqlalchemy.exc import IntegrityError
+
+from src.db.database import engine
+
+logger = logging.getLogger(__name__)
+
+
+class WriteBehindPersister:
+    """
+    write-behind 저장 - 메모리 큐에 모았다가 주기적으로 한 트랜잭션의 bulk INSERT로 기록
+
+    배치가 실패하면 행 단위로 다시 기록해 나머지 행을 살리고, 제약 조건 위반(삭제된 강의 등)이나
+    max_retries번 넘게 실패한 행은 dead_letters로 옮겨 버퍼 앞을 막지 않게 합니다.
+    """
+
+    def __init__(self, model, tag: str, flush_interval: float, batch_size: int, max_buffer: int,
+                 on_commit: Optional[Callable[[List[Dict]], None]] = None,
+                 max_retries: int = 5, dead_letter_limit: int = 1000):
+        self.model = model
+        self.tag = tag
+        self.flush_interval = flush_interval
+        self.batch_size = batch_size
+        self.max_buffer = max_buffer
+        self.on_commit = on_commit
+        self.max_retries = max_retries
+        self.buffer: Deque[Dict] = deque()
+        # 버퍼에 남아 있는 행의 실패 횟수 (id(row) -> 횟수, 행이 버퍼에 있는 동안만 유지)
+        self.attempts: Dict[int, int] = {}
+        # 저장을 포기한 행 (오래된 것부터 버림)
+        self.dead_letters: Deque[Dict] = deque(maxlen=dead_letter_limit)
+        self.wakeup: Optional[asyncio.Event] = None
+        self.task: Optional[asyncio.Task] = None
+        self.flush_lock: Optional[asyncio.Lock] = None
+        self.stopping = False
+        self.metrics = {
+            "total_enqueued": 0,
+            "total_dropped": 0,
+            "total_flushed": 0,
+            "total_commits": 0,
+            "failed_flushes": 0,
+            "row_retries": 0,
+            "total_dead_lettered": 0,
+            "max_batch": 0,
+            "total_flush_time": 0.0,
+            "max_flush_time": 0.0,
+            "last_flush_time": 0.0,
+            "start_time": datetime.now().isoformat()
+        }
+
+    def submit(self, row: Dict) -> bool:
+        """행 하나를 저장 대기열에 추가 (버퍼가 가득 차면 버리고 False)"""
+        if len(self.buffer) >= self.max_buffer:
+            self.metrics["total_dropped"] += 1
+            logger.warning(f"⚠️ [{self.tag}] 저장 버퍼 초과로 누락 - lecture_id: {row.get('lecture_id')}, "
+                           f"버퍼: {len(self.buffer)}")
+            return False
+
+        self.buffer.append(row)
+        self.metrics["total_enqueued"] += 1
+
+        # 배치 크기가 모이면 주기를 기다리지 않고 바로 기록
+        if len(self.buffer) >= self.batch_size and self.wakeup is not None:
+            self.wakeup.set()
+        return True
+
+    async def _write(self, conn, batch: List[Dict]):
+        """배치 하나를 기록 - 커밋 후 처리에서 쓸 수 있도록 행에 id를 채움"""
+        result = await conn.execute(
+            insert(self.model).returning(self.model.id, sort_by_parameter_order=True),
+            batch
+        )
+        for row, row_id in zip(batch, result.scalars().all()):
+            row["id"] = row_id
+
+    def _dead_letter(self, row: Dict, error: Exception):
+        self.attempts.pop(id(row), None)
+        self.dead_letters.append(row)
+        self.metrics["total_dead_lettered"] += 1
+        logger.error(f"🪦 [{self.tag}] 저장 포기 - lecture_id: {row.get('lecture_id')}, 오류: {error}")
+
+    async def _write_rows(self, batch: List[Dict]):
+        """
+        실패한 배치를 행 단위로 기록합니다.
+
+        Returns:
+            (커밋된 행, 다시 시도할 행) - 제약 조건 위반이나 재시도 한도를 넘은 행은 dead_letters로 이동
+        """
+        committed: List[Dict] = []
+        for index, row in enumerate(batch):
+            try:
+                async with engine.begin() as conn:
+                    await self._write(conn, [row])
+            except IntegrityError as e:
+                # 다시 넣어도 같은 결과 - 바로 포기
+                self._dead_letter(row, e)
+                continue
+            except Exception as e:
+                attempts = self.attempts.get(id(row), 0) + 1
+                if attempts > self.max_retries:
+                    self._dead_letter(row, e)
+                    continue
+                # DB 연결 문제 등 일시적 오류 - 남은 행은 시도하지 않고 다음 주기에 재시도
+                self.attempts[id(row)] = attempts
+                self.metrics["row_retries"] += 1
+                return committed, batch[index:]
+            self.attempts.pop(id(row), None)
+            committed.append(row)
+        return committed, []
+
+    async def flush(self) -> int:
+        """대기 중인 행을 batch_size 단위로 기록 (배치당 커밋 1회)"""
+        async with self.flush_lock:
+            flushed = 0
+            while self.buffer:
+                batch: List[Dict] = [self.buffer.popleft() for _ in range(min(self.batch_size, len(self.buffer)))]
+                flush_start = time.perf_counter()
+                retry: List[Dict] = []
+                try:
+                    async with engine.begin() as conn:
+                        await self._write(conn, batch)
+                except Exception as e:
+                    self.metrics["failed_flushes"] += 1
+                    logger.error(f"❌ [{self.tag}] 일괄 저장 실패 - {len(batch)}건, 행 단위로 재시도, 오류: {e}")
+                    batch, retry = await self._write_rows(batch)
+                else:
+                    for row in batch:
+                        self.attempts.pop(id(row), None)
+
+                flush_time = time.perf_counter() - flush_start
+
+                # 커밋된 행을 후속 처리(캐시 갱신 등)에 전달
+                if batch:
+                    if self.on_commit is not None:
+                        self.on_commit(batch)
+
+                    flushed += len(batch)
+                    self.metrics["total_flushed"] += len(batch)
+                    self.metrics["total_commits"] += 1
+                    self.metrics["max_batch"] = max(self.metrics["max_batch"], len(batch))
+                    self.metrics["total_flush_time"] += flush_time
+                    self.metrics["last_flush_time"] = flush_time
+                    self.metrics["max_flush_time"] = max(self.metrics["max_flush_time"], flush_time)
+                    logger.debug(f"💾 [{self.tag}] 일괄 저장 - {len(batch)}건, 소요시간: {flush_time * 1000:.1f}ms")
+
+                if retry:
+                    # 일시적 오류로 남은 행은 버퍼 앞쪽으로 되돌려 다음 주기에 재시도
+                    room = self.max_buffer - len(self.buffer)
+                    self.buffer.extendleft(reversed(retry[:room]))
+                    for row in retry[room:]:
+                        self.attempts.pop(id(row), None)
+                    self.metrics["total_dropped"] += len(retry) - min(room, len(retry))
+                    break
+            return flushed
+
+    async def _run(self):
+        logger.info(f"💾 [{self.tag}] 저장 작업 시작 - 주기: {self.flush_interval * 1000:.0f}ms, "
+                    f"배치: {self.batch_size}, 버퍼 한도: {self.max_buffer}")
+        while not self.stopping:
+            try:
+                await asyncio.wait_for(self.wakeup.wait(), timeout=self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self.wakeup.clear()
+            if self.buffer:
+                await self.flush()
+
+    def start(self):
+        if self.task is None:
+            self.stopping = False
+            self.wakeup = asyncio.Event()
+            self.flush_lock = asyncio.Lock()
+            self.task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        """종료 시 남은 행을 모두 기록"""
+        if self.task is None:
+            return
+        # 진행 중인 배치가 끝나도록 취소 대신 종료 신호
+        self.stopping = True
+        self.wakeup.set()
+        await self.task
+        self.task = None
+        remaining = len(self.buffer)
+        flushed = await self.flush()
+        logger.info(f"🛑 [{self.tag}] 저장 작업 종료 - 종료 시 기록: {flushed}/{remaining}건")
+
+    def get_stats(self) -> dict:
+        commits = self.metrics["total_commits"]
+        return {
+            "buffered": len(self.buffer),
+            "total_enqueued": self.metrics["total_enqueued"],
+            "total_dropped": self.metrics["total_dropped"],
+            "total_flushed": self.metrics["total_flushed"],
+            "total_commits": commits,
+            "failed_flushes": self.metrics["failed_flushes"],
+            "row_retries": self.metrics["row_retries"],
+            "dead_letters": len(self.dead_letters),
+            "total_dead_lettered": self.metrics["total_dead_lettered"],
+            "max_batch": self.metrics["max_batch"],
+            "avg_rows_per_commit": self.metrics["total_flushed"] / commits if commits else 0,
+            "avg_flush_ms": self.metrics["total_flush_time"] / commits * 1000 if commits else 0,
+            "max_flush_ms": self.metrics["max_flush_time"] * 1000,
+            "last_flush_ms": self.metrics["last_flush_time"] * 1000,
+            "start_time": self.metrics["start_time"]
+        }
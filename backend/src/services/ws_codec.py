@@ -0,0 +1,189 @@
+from fastapi import WebSocket
+from typing import Any, Dict, Iterable
+from datetime import datetime
+import json
+import logging
+import time
+
+# MessagePack / CBOR 라이브러리 (선택 의존성)
+try:
+    import msgpack
+    MSGPACK_AVAILABLE = True
+except ImportError:
+    msgpack = None
+    MSGPACK_AVAILABLE = False
+
+try:
+    import cbor2
+    CBOR_AVAILABLE = True
+except ImportError:
+    cbor2 = None
+    CBOR_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+# 지원 인코딩
+JSON_ENCODING = "json"
+MSGPACK_ENCODING = "msgpack"
+CBOR_ENCODING = "cbor"
+
+# 바이너리 인코딩에서 사용하는 짧은 키 (클라이언트는 연결 시 전달받은 매핑으로 복원)
+SHORT_KEYS = {
+    "type": "t",
+    "user_id": "u",
+    "username": "n",
+    "message": "m",
+    "timestamp": "ts",
+    "text": "x",
+    "translatedText": "tx",
+    "language": "lg",
+    "translationLanguage": "tl",
+    "confidence": "c",
+    "is_private": "p",
+    "is_sharing": "s",
+    "participants": "ps",
+    "participant": "pt",
+    "version": "v",
+    "seq": "q",
+    "events": "e",
+    "last_seq": "lq",
+    "truncated": "tr",
+    "currentUserId": "cu",
+    "connected_at": "ca",
+    "message_count": "mc",
+    "instructorId": "ii",
+    "fromStudentId": "fs",
+    "fromPeerId": "fp",
+    "targetPeerId": "tp",
+    "lectureId": "li",
+    "lecture_id": "l",
+    "offer": "o",
+    "answer": "a",
+    "candidate": "cd",
+}
+
+# 정수 epoch(ms)로 변환할 타임스탬프 키
+TIMESTAMP_KEYS = {"timestamp", "connected_at"}
+
+
+def available_encodings() -> list[str]:
+    """현재 서버에서 사용 가능한 인코딩 목록"""
+    encodings = [JSON_ENCODING]
+    if MSGPACK_AVAILABLE:
+        encodings.append(MSGPACK_ENCODING)
+    if CBOR_AVAILABLE:
+        encodings.append(CBOR_ENCODING)
+    return encodings
+
+
+def negotiate_encoding(requested: str | None) -> str:
+    """클라이언트가 요청한 인코딩을 협상 (지원하지 않으면 JSON)"""
+    if not requested:
+        return JSON_ENCODING
+
+    requested = requested.lower()
+    if requested in available_encodings():
+        return requested
+
+    logger.warning(f"⚠️ [WebSocket] 지원하지 않는 인코딩 요청: {requested} - JSON 사용")
+    return JSON_ENCODING
+
+
+def is_deflate_offered(websocket: WebSocket) -> bool:
+    """핸드셰이크에서 클라이언트가 permessage-deflate를 제안했는지 확인"""
+    extensions = websocket.headers.get("sec-websocket-extensions", "")
+    return "permessage-deflate" in extensions
+
+
+def _to_epoch_ms(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return int(value.timestamp() * 1000)
+    if isinstance(value, str):
+        try:
+            return int(datetime.fromisoformat(value).timestamp() * 1000)
+        except ValueError:
+            return value
+    return value
+
+
+def compact_event(value: Any) -> Any:
+    """키를 짧은 키로 바꾸고 타임스탬프를 정수 epoch(ms)로 변환"""
+    if isinstance(value, dict):
+        return {
+            SHORT_KEYS.get(key, key): _to_epoch_ms(item) if key in TIMESTAMP_KEYS else compact_event(item)
+            for key, item in value.items()
+        }
+    if isinstance(value, list):
+        return [compact_event(item) for item in value]
+    return value
+
+
+class EventEncoder:
+    """이벤트를 인코딩별로 한 번만 직렬화하고 인코딩별 비용을 추적"""
+
+    def __init__(self):
+        self.metrics: Dict[str, Dict[str, float]] = {
+            encoding: {"events": 0, "bytes": 0, "encode_time": 0.0}
+            for encoding in (JSON_ENCODING, MSGPACK_ENCODING, CBOR_ENCODING)
+        }
+
+    def encode(self, event: dict, encoding: str) -> str | bytes:
+        """이벤트 하나를 지정한 인코딩으로 직렬화"""
+        encode_start = time.perf_counter()
+
+        if encoding == MSGPACK_ENCODING:
+            payload = msgpack.packb(compact_event(event), use_bin_type=True)
+            size = len(payload)
+        elif encoding == CBOR_ENCODING:
+            payload = cbor2.dumps(compact_event(event))
+            size = len(payload)
+        else:
+            payload = json.dumps(event)
+            size = len(payload.encode("utf-8"))
+
+        metrics = self.metrics[encoding]
+        metrics["events"] += 1
+        metrics["bytes"] += size
+        metrics["encode_time"] += time.perf_counter() - encode_start
+        return payload
+
+    def encode_for(self, event: dict, encodings: Iterable[str]) -> Dict[str, str | bytes]:
+        """필요한 인코딩마다 한 번씩만 직렬화한 결과 반환"""
+        return {encoding: self.encode(event, encoding) for encoding in set(encodings)}
+
+    def get_stats(self) -> dict:
+        """인코딩별 이벤트당 바이트/CPU 시간 통계"""
+        stats = {}
+        for encoding, metrics in self.metrics.items():
+            events = metrics["events"]
+            stats[encoding] = {
+                "events": events,
+                "total_bytes": metrics["bytes"],
+                "avg_bytes_per_event": metrics["bytes"] / events if events else 0,
+                "avg_encode_us_per_event": metrics["encode_time"] / events * 1_000_000 if events else 0,
+            }
+        stats["available_encodings"] = available_encodings()
+        return stats
+
+
+async def send_payload(websocket: WebSocket, payload: str | bytes):
+    """인코딩 결과에 맞는 프레임 타입으로 전송 (텍스트/바이너리)"""
+    if isinstance(payload, bytes):
+        await websocket.send_bytes(payload)
+    else:
+        await websocket.send_text(payload)
+
+
+def encoding_ack(encoding: str, deflate: bool) -> str:
+    """협상 결과 안내 메시지 (항상 JSON 텍스트 프레임)"""
+    return json.dumps({
+        "type": "encoding",
+        "encoding": encoding,
+        "deflate": deflate,
+        "keys": SHORT_KEYS if encoding != JSON_ENCODING else {},
+        "timestamp": datetime.now().isoformat()
+    })
+
+
+# 채팅/자막 채널이 공유하는 인코더
+event_encoder = EventEncoder()
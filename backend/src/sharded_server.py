@@ -0,0 +1,235 @@
+"""강의 단위로 WebSocket을 여러 프로세스(샤드)에 나눠 서비스하는 실행기
+
+프론트 리스너(이 프로세스)가 settings.port 하나만 열고 연결을 받는다. 요청 줄을 MSG_PEEK로
+읽어(소비하지 않음) 경로의 강의 ID를 일관된 해시로 소유 샤드에 대응시키고, 받은 소켓 자체를
+Unix 소켓(SCM_RIGHTS)으로 그 샤드에 넘긴다. 이후 바이트는 프론트를 거치지 않고 샤드의 이벤트
+루프가 직접 읽고 쓴다. 강의 경로가 아닌 요청은 주 샤드(0)가 처리한다. 클라이언트는 샤드를
+의식하지 않고 기존 주소(ws://host:port/...)로 접속한다.
+
+HTTP keep-alive 연결의 이후 요청은 첫 요청이 넘겨진 샤드에서 처리된다.
+다른 샤드 소유 강의의 이벤트는 샤드별 큐로 전달된다.
+
+프로세스별 캐시는 샤드마다 따로 있다. 응답 캐시(memory 백엔드)/입장 정원 캐시/사용자 캐시의
+무효화는 같은 큐로 다른 모든 샤드에 전달되고, 채팅 tail 캐시는 채팅이 저장되는 소유 샤드에서만 쓴다.
+
+    python -m src.sharded_server --shards 4
+"""
+from urllib.parse import unquote
+import argparse
+import asyncio
+import logging
+import multiprocessing
+import socket
+import sys
+import time
+
+import uvicorn
+
+from src.core.settings import settings
+from src.services.sharding import HashRing, lecture_for_path
+
+logger = logging.getLogger(__name__)
+
+# 요청 줄을 찾을 때 들여다보는 최대 바이트
+PEEK_LIMIT = 8192
+
+
+class ShardServer(uvicorn.Server):
+    """리스닝 소켓 없이 프론트 리스너가 넘겨준 연결만 처리하는 uvicorn 서버"""
+
+    def __init__(self, config: uvicorn.Config, handoff: socket.socket):
+        super().__init__(config)
+        self.handoff = handoff
+
+    def _create_protocol(self, _loop=None) -> asyncio.Protocol:
+        # uvicorn Server.startup의 프로토콜 생성과 같은 인자
+        return self.config.http_protocol_class(
+            config=self.config,
+            server_state=self.server_state,
+            app_state=self.lifespan.state,
+            _loop=_loop
+        )
+
+    async def startup(self, sockets=None):
+        await super().startup(sockets=[])
+        self.handoff.setblocking(False)
+        asyncio.get_running_loop().add_reader(self.handoff.fileno(), self._receive_sockets)
+
+    def _receive_sockets(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            try:
+                data, fds, _, _ = socket.recv_fds(self.handoff, 1, 1)
+            except BlockingIOError:
+                return
+            if not data and not fds:
+                # 프론트 리스너 종료
+                loop.remove_reader(self.handoff.fileno())
+                self.should_exit = True
+                return
+            for fd in fds:
+                sock = socket.socket(fileno=fd)
+                sock.setblocking(False)
+                loop.create_task(loop.connect_accepted_socket(self._create_protocol, sock))
+
+    async def shutdown(self, sockets=None):
+        asyncio.get_running_loop().remove_reader(self.handoff.fileno())
+        await super().shutdown(sockets=sockets)
+
+
+def _run_shard(index: int, count: int, queues: list, handoff: socket.socket, ready_event):
+    from src.services.sharding import shard_router
+
+    shard_router.configure(index, count, queues, ready_event)
+    config = uvicorn.Config("src.main:app", ws_per_message_deflate=settings.ws_per_message_deflate)
+    ShardServer(config, handoff).run()
+
+
+def _wait_ready(process, ready_event, timeout: float) -> bool:
+    """주 샤드의 초기화 완료 대기 - 주 샤드가 초기화 중 종료되거나 timeout이 지나면 False"""
+    deadline = time.monotonic() + timeout
+    while not ready_event.wait(1.0):
+        if not process.is_alive():
+            logger.error(f"❌ [샤드] 주 샤드가 초기화 중 종료됨 - exitcode: {process.exitcode}")
+            return False
+        if time.monotonic() > deadline:
+            logger.error(f"❌ [샤드] 주 샤드 초기화 시간 초과 - {timeout:.0f}s")
+            return False
+    return True
+
+
+async def _peek_request_line(loop: asyncio.AbstractEventLoop, conn: socket.socket) -> bytes:
+    """요청 줄(첫 CRLF까지)을 소비하지 않고 읽음 - 데이터는 커널 버퍼에 남아 샤드가 그대로 읽음"""
+    while True:
+        readable = loop.create_future()
+        loop.add_reader(conn.fileno(), readable.set_result, None)
+        try:
+            await readable
+        finally:
+            loop.remove_reader(conn.fileno())
+        head = conn.recv(PEEK_LIMIT, socket.MSG_PEEK)
+        if not head or b"\r\n" in head or len(head) >= PEEK_LIMIT:
+            return head
+        # 요청 줄이 나눠 도착한 경우 - 읽지 않은 데이터가 있어 바로 다시 readable이므로 잠시 대기
+        await asyncio.sleep(0.005)
+
+
+def _shard_for_request(head: bytes, ring: HashRing) -> int:
+    parts = head.split(b"\r\n", 1)[0].split(b" ")
+    if len(parts) < 2:
+        return 0
+    path = unquote(parts[1].split(b"?", 1)[0].decode("latin-1"))
+    lecture_id = lecture_for_path(path)
+    return ring.node_for(lecture_id) if lecture_id is not None else 0
+
+
+class FrontListener:
+    """settings.port에서 연결을 받아 경로의 강의 소유 샤드로 소켓을 넘김"""
+
+    def __init__(self, listener: socket.socket, channels: list, processes: list):
+        self.listener = listener
+        self.channels = channels
+        # 샤드가 밀려 버퍼가 차면 기다리지 않고 그 연결만 버림 (프론트 루프가 멈추지 않도록)
+        for channel in channels:
+            channel.setblocking(False)
+        self.processes = processes
+        self.ring = HashRing(list(range(len(channels))), settings.ws_shard_vnodes)
+        self.handed_off = [0] * len(channels)
+        self.dropped = 0
+
+    async def _hand_off(self, loop: asyncio.AbstractEventLoop, conn: socket.socket):
+        try:
+            head = await asyncio.wait_for(_peek_request_line(loop, conn), settings.ws_shard_handoff_timeout)
+            if not head:
+                return
+            shard = _shard_for_request(head, self.ring)
+            socket.send_fds(self.channels[shard], [b"\0"], [conn.fileno()])
+            self.handed_off[shard] += 1
+        except (asyncio.TimeoutError, OSError) as e:
+            self.dropped += 1
+            logger.debug(f"🔍 [샤드] 연결 전달 실패 (무시): {e!r}")
+        finally:
+            # 샤드가 복제본을 받았으므로 프론트의 fd는 닫음
+            conn.close()
+
+    async def _watch(self):
+        while True:
+            await asyncio.sleep(1.0)
+            for process in self.processes:
+                if not process.is_alive():
+                    raise RuntimeError(f"{process.name} 종료 - exitcode: {process.exitcode}")
+
+    async def serve(self):
+        loop = asyncio.get_running_loop()
+        self.listener.setblocking(False)
+        watcher = asyncio.create_task(self._watch())
+        logger.info(f"🧩 [샤드] 프론트 리스너 시작 - {settings.host}:{self.listener.getsockname()[1]}, "
+                    f"샤드: {len(self.channels)}")
+        try:
+            while True:
+                accept = asyncio.ensure_future(loop.sock_accept(self.listener))
+                done, _ = await asyncio.wait({accept, watcher}, return_when=asyncio.FIRST_COMPLETED)
+                if watcher in done:
+                    accept.cancel()
+                    watcher.result()
+                conn, _ = accept.result()
+                loop.create_task(self._hand_off(loop, conn))
+        finally:
+            watcher.cancel()
+            logger.info(f"🛑 [샤드] 프론트 리스너 종료 - 샤드별 전달: {self.handed_off}, 실패: {self.dropped}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="샤드 WebSocket 서버 실행")
+    parser.add_argument("--shards", type=int, default=settings.ws_shard_count)
+    parser.add_argument("--port", type=int, default=settings.port)
+    args = parser.parse_args()
+
+    context = multiprocessing.get_context("spawn")
+    queues = [context.Queue() for _ in range(args.shards)]
+    ready_event = context.Event()
+
+    # 데이터그램 경계가 유지되는 소켓 쌍 - 메시지 하나에 소켓 하나
+    pairs = [socket.socketpair(socket.AF_UNIX, socket.SOCK_SEQPACKET) for _ in range(args.shards)]
+    processes = []
+    for index in range(args.shards):
+        process = context.Process(
+            target=_run_shard,
+            args=(index, args.shards, queues, pairs[index][1], ready_event if index == 0 else None),
+            name=f"shard-{index}"
+        )
+        process.start()
+        pairs[index][1].close()
+        processes.append(process)
+        logger.info(f"🧩 [샤드] 샤드 {index} 시작 - pid: {process.pid}")
+
+        # 주 샤드가 DB 초기화를 끝낸 뒤 나머지 샤드 시작
+        if index == 0 and args.shards > 1 and not _wait_ready(process, ready_event, settings.ws_shard_ready_timeout):
+            process.terminate()
+            sys.exit(1)
+
+    listener = socket.create_server((settings.host, args.port), backlog=2048)
+    front = FrontListener(listener, [pair[0] for pair in pairs], processes)
+    exit_code = 0
+    try:
+        asyncio.run(front.serve())
+    except KeyboardInterrupt:
+        pass
+    except RuntimeError as e:
+        logger.error(f"❌ [샤드] {e} - 전체 종료")
+        exit_code = 1
+    finally:
+        listener.close()
+        # 소켓 쌍을 닫으면 샤드가 정상 종료 절차를 밟음
+        for channel, _ in pairs:
+            channel.close()
+        for process in processes:
+            process.join(settings.ws_shard_ready_timeout)
+            if process.is_alive():
+                process.terminate()
+    sys.exit(exit_code)
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    main()
@@ -0,0 +1,92 @@
+"""오디오 추출 경로(ffmpeg 서브프로세스 / moviepy) 시간과 최대 메모리(RSS) 비교
+
+각 경로를 별도 Python 프로세스에서 실행해 ru_maxrss가 섞이지 않게 하고,
+원본 길이로 나눠 영상 1시간당 소요 시간/메모리로 환산한다.
+RSS는 앱 프로세스(self)와 그 자식(ffmpeg)을 따로 출력한다.
+
+    python -m src.utils.bench_audio_extract static/lecture.mp4
+    python -m src.utils.bench_audio_extract static/lecture.mp4 --format mp3 --repeat 3
+"""
+from pathlib import Path
+import argparse
+import asyncio
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+from src.utils import media
+
+
+def _duration_seconds(path: str) -> float:
+    result = subprocess.run(
+        [media.FFPROBE_PATH, "-v", "error", "-show_entries", "format=duration", "-of", "json", path],
+        capture_output=True, check=True
+    )
+    return float(json.loads(result.stdout)["format"]["duration"])
+
+
+def _run_once(path: str, video_path: str, output_path: str, sample_rate: int) -> dict:
+    """현재 프로세스에서 한 경로만 실행하고 측정값 반환"""
+    start = time.perf_counter()
+    if path == "ffmpeg":
+        asyncio.run(media.extract_audio_ffmpeg(video_path, output_path, sample_rate))
+    else:
+        if not media.MOVIEPY_AVAILABLE:
+            raise SystemExit("moviepy가 설치되어 있지 않습니다.")
+        media._extract_audio_moviepy(video_path, output_path, Path(output_path).suffix.lstrip("."), sample_rate)
+    elapsed = time.perf_counter() - start
+    # Linux의 ru_maxrss 단위는 KiB
+    return {
+        "seconds": elapsed,
+        "self_rss_mib": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+        "child_rss_mib": resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss / 1024,
+        "output_bytes": os.path.getsize(output_path)
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="오디오 추출 시간/메모리 벤치마크")
+    parser.add_argument("video", help="입력 영상")
+    parser.add_argument("--format", default="flac", choices=sorted(media.AUDIO_FORMATS), help="출력 형식")
+    parser.add_argument("--sample-rate", type=int, default=16000)
+    parser.add_argument("--repeat", type=int, default=1, help="경로별 반복 횟수 (가장 빠른 값 사용)")
+    parser.add_argument("--only", choices=("ffmpeg", "moviepy"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if media.FFMPEG_PATH is None or media.FFPROBE_PATH is None:
+        raise SystemExit("ffmpeg/ffprobe 실행 파일이 필요합니다.")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        output_path = os.path.join(tmp, f"out.{args.format}")
+        if args.only:
+            print(json.dumps(_run_once(args.only, args.video, output_path, args.sample_rate)))
+            return
+
+        hours = _duration_seconds(args.video) / 3600
+        print(f"{args.video}: {hours * 60:.1f}분, 출력 {args.format} {args.sample_rate}Hz 모노")
+        for path in ("ffmpeg", "moviepy"):
+            runs = []
+            for _ in range(args.repeat):
+                result = subprocess.run(
+                    [sys.executable, "-m", "src.utils.bench_audio_extract", args.video,
+                     "--format", args.format, "--sample-rate", str(args.sample_rate), "--only", path],
+                    capture_output=True, text=True
+                )
+                if result.returncode != 0:
+                    print(f"{path:<8} 실패: {(result.stderr or result.stdout).strip().splitlines()[-1:]}")
+                    break
+                runs.append(json.loads(result.stdout.strip().splitlines()[-1]))
+            if not runs:
+                continue
+            best = min(runs, key=lambda run: run["seconds"])
+            print(f"{path:<8} {best['seconds']:>8.2f}s ({best['seconds'] / hours:>7.1f}s/영상 1시간)  "
+                  f"RSS 앱 {best['self_rss_mib']:>7.1f}MiB / ffmpeg {best['child_rss_mib']:>6.1f}MiB  "
+                  f"출력 {best['output_bytes'] / hours / 1024 / 1024:>6.1f}MiB/시간")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,226 @@
+"""샤드 수별 WebSocket 채팅 fan-out 처리량 비교
+
+샤드 수마다 임시 SQLite DB로 src.sharded_server를 새로 띄우고, 강의를 만든 뒤
+강의마다 구독자 소켓 --subscribers개와 강사 소켓 하나를 프론트 리스너(같은 포트)로 연결한다.
+강사 소켓이 강의마다 초당 --rate개의 chat_message를 --seconds 동안 보내고, 구독자가 받은
+프레임 수(초당 전달 수)와 전송→수신 지연(p50/p99)을 잰다. 클라이언트는 --client-procs개
+프로세스로 나눠 돌리며, 서버와 같은 머신에서 돌면 클라이언트도 CPU를 쓰므로 코어 수를 함께 출력한다.
+벤치 서버는 채팅 속도 제한을 풀고 실행한다 (fan-out 자체를 재기 위해).
+
+    python -m src.utils.bench_fanout --shards 1 2 4
+    python -m src.utils.bench_fanout --shards 1 4 --lectures 16 --subscribers 100 --rate 20 --seconds 15
+"""
+from datetime import datetime, timedelta
+import argparse
+import asyncio
+import json
+import multiprocessing
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.parse
+import urllib.request
+
+import websockets
+
+from src.services.auth import create_access_token
+
+# 구독자 user_id 시작 값 (실제 사용자/테스트 사용자 999와 겹치지 않게)
+SUBSCRIBER_BASE_ID = 100000
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _request(url: str, data: dict = None, token: str = None, form: bool = False) -> dict:
+    headers = {"Authorization": f"Bearer {token}"} if token else {}
+    body = None
+    if data is not None:
+        if form:
+            body = urllib.parse.urlencode(data).encode()
+            headers["Content-Type"] = "application/x-www-form-urlencoded"
+        else:
+            body = json.dumps(data).encode()
+            headers["Content-Type"] = "application/json"
+    with urllib.request.urlopen(urllib.request.Request(url, body, headers), timeout=30) as response:
+        return json.loads(response.read())
+
+
+def _start_server(shards: int, port: int, workdir: str) -> subprocess.Popen:
+    env = dict(
+        os.environ,
+        DATABASE_URL=f"sqlite:///{workdir}/bench_{shards}.db",
+        STATIC_SYNC_ON_STARTUP="false",
+        SEED_TEST_DATA="true",
+        WS_CHAT_MESSAGE_RATE="100000",
+        WS_CHAT_MESSAGE_BURST="100000",
+        WS_LECTURE_MESSAGE_RATE="1000000",
+        WS_LECTURE_MESSAGE_BURST="1000000",
+    )
+    log = open(os.path.join(workdir, f"server_{shards}.log"), "wb")
+    process = subprocess.Popen(
+        [sys.executable, "-m", "src.sharded_server", "--shards", str(shards), "--port", str(port)],
+        env=env, stdout=log, stderr=subprocess.STDOUT
+    )
+    deadline = time.monotonic() + 180
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise SystemExit(f"서버 시작 실패 - 로그: {log.name}")
+        try:
+            _request(f"http://127.0.0.1:{port}/ws/shard/1")
+            return process
+        except OSError:
+            time.sleep(0.5)
+    process.terminate()
+    raise SystemExit(f"서버 시작 시간 초과 - 로그: {log.name}")
+
+
+def _create_lectures(port: int, count: int, capacity: int):
+    # 회원가입은 항상 학생이므로 시드된 테스트 강사 계정으로 강의 생성
+    base = f"http://127.0.0.1:{port}"
+    instructor = next(account for account in _request(f"{base}/test-accounts") if account["role"] == "instructor")
+    token = _request(f"{base}/auth/login", {"username": instructor["email"], "password": instructor["password"]},
+                     form=True)["access_token"]
+    lecture_ids = []
+    for index in range(count):
+        lecture = _request(f"{base}/lectures/", {
+            "title": f"fan-out {index}", "scheduled_start": datetime.now().isoformat(), "max_participants": capacity
+        }, token=token)
+        lecture_ids.append(lecture["id"])
+    return token, lecture_ids
+
+
+async def _subscribe(port: int, lecture_id: int, user_id: int, ready: asyncio.Event, stop: asyncio.Event,
+                     latencies: list, counts: list):
+    token = create_access_token({"sub": f"bench{user_id}", "user_id": user_id}, timedelta(hours=1))
+    async with websockets.connect(f"ws://127.0.0.1:{port}/ws/chat/{lecture_id}?token={token}",
+                                  max_queue=None, ping_interval=None) as ws:
+        ready.set()
+        while not stop.is_set():
+            try:
+                frame = await asyncio.wait_for(ws.recv(), 0.5)
+            except asyncio.TimeoutError:
+                continue
+            message = json.loads(frame)
+            if message.get("type") == "chat_message":
+                counts[0] += 1
+                latencies.append(time.monotonic() - float(message["message"]))
+
+
+async def _publish(port: int, lecture_id: int, token: str, rate: float, seconds: float, start: float):
+    async with websockets.connect(f"ws://127.0.0.1:{port}/ws/chat/{lecture_id}?token={token}",
+                                  max_queue=None, ping_interval=None) as ws:
+        drain = asyncio.create_task(_drain(ws))
+        await asyncio.sleep(max(0.0, start - time.monotonic()))
+        for index in range(int(rate * seconds)):
+            await asyncio.sleep(max(0.0, start + index / rate - time.monotonic()))
+            await ws.send(json.dumps({"type": "chat_message", "message": f"{time.monotonic():.6f}"}))
+        drain.cancel()
+
+
+async def _drain(ws):
+    async for _ in ws:
+        pass
+
+
+async def _client(port: int, token: str, lecture_ids: list, subscribers: int, rate: float, seconds: float,
+                  barrier, start_delay: float) -> dict:
+    stop = asyncio.Event()
+    latencies, counts = [], [0]
+    readies = []
+    tasks = []
+    for lecture_id in lecture_ids:
+        for index in range(subscribers):
+            ready = asyncio.Event()
+            readies.append(ready)
+            tasks.append(asyncio.create_task(_subscribe(
+                port, lecture_id, SUBSCRIBER_BASE_ID + index, ready, stop, latencies, counts
+            )))
+    await asyncio.gather(*(ready.wait() for ready in readies))
+    # 모든 클라이언트 프로세스가 연결을 마친 뒤 동시에 전송 시작
+    await asyncio.to_thread(barrier.wait)
+    start = time.monotonic() + start_delay
+    await asyncio.gather(*(_publish(port, lecture_id, token, rate, seconds, start) for lecture_id in lecture_ids))
+    sent_at = time.monotonic()
+    # 큐에 남은 프레임이 도착할 때까지 대기 (새 프레임이 1초간 없으면 종료)
+    received = -1
+    while received != counts[0]:
+        received = counts[0]
+        await asyncio.sleep(1.0)
+    stop.set()
+    await asyncio.gather(*tasks, return_exceptions=True)
+    return {"received": counts[0], "latencies": latencies, "elapsed": max(seconds, sent_at - start)}
+
+
+def _client_process(port, token, lecture_ids, subscribers, rate, seconds, barrier, results):
+    results.put(asyncio.run(_client(port, token, lecture_ids, subscribers, rate, seconds, barrier, 1.0)))
+
+
+def _run(shards: int, args, workdir: str) -> dict:
+    port = _free_port()
+    server = _start_server(shards, port, workdir)
+    try:
+        token, lecture_ids = _create_lectures(port, args.lectures, args.subscribers + 1)
+        context = multiprocessing.get_context("spawn")
+        procs = min(args.client_procs, len(lecture_ids))
+        barrier = context.Barrier(procs)
+        results = context.Queue()
+        clients = [
+            context.Process(target=_client_process, args=(
+                port, token, lecture_ids[index::procs], args.subscribers, args.rate, args.seconds, barrier, results
+            ))
+            for index in range(procs)
+        ]
+        for client in clients:
+            client.start()
+        parts = [results.get() for _ in clients]
+        for client in clients:
+            client.join()
+    finally:
+        server.terminate()
+        server.wait(60)
+
+    latencies = sorted(latency for part in parts for latency in part["latencies"])
+    received = sum(part["received"] for part in parts)
+    expected = args.lectures * args.subscribers * int(args.rate * args.seconds)
+    elapsed = max(part["elapsed"] for part in parts)
+    return {
+        "frames_per_second": received / elapsed,
+        "delivered": received / expected if expected else 0.0,
+        "p50_ms": statistics.median(latencies) * 1000 if latencies else 0.0,
+        "p99_ms": latencies[int(len(latencies) * 0.99) - 1] * 1000 if latencies else 0.0,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="샤드 수별 채팅 fan-out 벤치마크")
+    parser.add_argument("--shards", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--lectures", type=int, default=8, help="강의 수 (샤드에 해시로 나뉨)")
+    parser.add_argument("--subscribers", type=int, default=50, help="강의당 구독자 소켓 수")
+    parser.add_argument("--rate", type=float, default=20.0, help="강의당 초당 채팅 메시지 수")
+    parser.add_argument("--seconds", type=float, default=10.0, help="전송 시간 (초)")
+    parser.add_argument("--client-procs", type=int, default=max(1, (os.cpu_count() or 2) // 2),
+                        help="클라이언트 프로세스 수")
+    args = parser.parse_args()
+
+    offered = args.lectures * args.subscribers * args.rate
+    print(f"CPU {os.cpu_count()}개, 강의 {args.lectures} x 구독자 {args.subscribers}, 강의당 {args.rate:g}msg/s "
+          f"-> 목표 {offered:,.0f} frames/s, {args.seconds:g}s, 클라이언트 프로세스 {args.client_procs}")
+    with tempfile.TemporaryDirectory() as workdir:
+        baseline = None
+        for shards in args.shards:
+            r = _run(shards, args, workdir)
+            baseline = baseline or r["frames_per_second"]
+            print(f"샤드 {shards:<3} {r['frames_per_second']:>10,.0f} frames/s  (x{r['frames_per_second'] / baseline:.2f})  "
+                  f"전달 {r['delivered'] * 100:5.1f}%  p50 {r['p50_ms']:8.1f}ms  p99 {r['p99_ms']:8.1f}ms")
+
+
+if __name__ == "__main__":
+    main()
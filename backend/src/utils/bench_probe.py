@@ -0,0 +1,81 @@
+"""미디어 길이 조회 방식별 초당 조회 수 비교 (헤더 파싱 / ffprobe / moviepy)
+
+같은 파일 목록을 방식마다 --seconds 동안 반복 조회하고 초당 조회 수와 파일당 평균 시간을 출력한다.
+길이가 방식마다 다르게 나오면 파일별로 함께 출력한다 (헤더 파싱 결과 검증용).
+설치되지 않은 방식은 건너뛴다.
+
+    python -m src.utils.bench_probe static/*.mp4 static/audio/*/*.flac
+    python -m src.utils.bench_probe static/lecture.mp4 --seconds 5
+"""
+from typing import Callable, Dict, List, Optional
+import argparse
+import time
+
+from src.utils import media
+from src.utils.media_headers import FFPROBE_PATH, ffprobe_info, read_header_info
+
+
+def _header(path: str) -> Optional[float]:
+    info = read_header_info(path)
+    return info and info["duration"]
+
+
+def _ffprobe(path: str) -> Optional[float]:
+    info = ffprobe_info(path)
+    return info and info["duration"]
+
+
+def _moviepy(path: str) -> Optional[float]:
+    # 이전 get_audio_duration과 같은 방식 (디코더를 열어 길이만 읽음)
+    clip = media.AudioFileClip(path)
+    try:
+        return clip.duration
+    finally:
+        clip.close()
+
+
+def _methods() -> Dict[str, Callable[[str], Optional[float]]]:
+    methods = {"header": _header}
+    if FFPROBE_PATH is not None:
+        methods["ffprobe"] = _ffprobe
+    if media.MOVIEPY_AVAILABLE:
+        methods["moviepy"] = _moviepy
+    return methods
+
+
+def _run(method: Callable[[str], Optional[float]], paths: List[str], seconds: float):
+    durations = {}
+    probes = 0
+    start = time.perf_counter()
+    # 최소 한 바퀴는 돌아 파일별 결과를 모두 얻음
+    while not durations or time.perf_counter() - start < seconds:
+        for path in paths:
+            try:
+                durations[path] = method(path)
+            except Exception:
+                durations[path] = None
+            probes += 1
+    return probes / (time.perf_counter() - start), durations
+
+
+def main():
+    parser = argparse.ArgumentParser(description="미디어 길이 조회 벤치마크")
+    parser.add_argument("files", nargs="+", help="조회할 미디어 파일")
+    parser.add_argument("--seconds", type=float, default=2.0, help="방식별 측정 시간 (초)")
+    args = parser.parse_args()
+
+    results = {}
+    for name, method in _methods().items():
+        rate, durations = _run(method, args.files, args.seconds)
+        results[name] = durations
+        print(f"{name:<8} {rate:>10.0f} 조회/s  ({1000 / rate:>8.3f}ms/파일)")
+
+    for path in args.files:
+        values = {name: durations[path] for name, durations in results.items()}
+        rounded = {round(value, 1) if value is not None else None for value in values.values()}
+        if len(rounded) > 1 or None in rounded:
+            print(f"  {path}: " + ", ".join(f"{name}={value}" for name, value in values.items()))
+
+
+if __name__ == "__main__":
+    main()
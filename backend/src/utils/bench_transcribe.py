@@ -0,0 +1,156 @@
+"""긴 강의 오디오 전사 시간 비교 - 한 번에 업로드 vs 무음 위치 분할 + 동시 요청
+
+로컬 모의 Whisper 서버를 띄우고 openai_service의 전사 함수를 그대로 호출한다.
+모의 서버는 받은 파일의 길이를 헤더에서 읽어 (지연 + 길이 / 배속)만큼 기다린 뒤
+5초 간격 세그먼트를 verbose_json으로 돌려주고, --fail-rate 비율로 503을 응답해 재시도를 확인할 수 있다.
+실제 API는 25MB를 넘는 파일을 거절하지만, 시간 비교를 위해 모의 서버는 받아 처리하고 한도 초과 횟수만 센다.
+
+    python -m src.utils.bench_transcribe --generate 120
+    python -m src.utils.bench_transcribe static/audio/1/ko.flac --concurrency 1 4 8 --fail-rate 0.1
+"""
+from email.parser import BytesParser
+from email.policy import default as email_policy
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import argparse
+import asyncio
+import json
+import os
+import random
+import subprocess
+import tempfile
+import threading
+import time
+
+from src.core.settings import settings
+from src.services import openai_service
+from src.utils.media import FFMPEG_PATH
+from src.utils.media_headers import read_header_info
+
+UPLOAD_LIMIT = 25 * 1024 * 1024
+
+
+class MockWhisper(BaseHTTPRequestHandler):
+    latency = 0.5
+    speed = 20.0
+    fail_rate = 0.0
+    requests = 0
+    failures = 0
+    oversized = 0
+    lock = threading.Lock()
+
+    def log_message(self, *args):
+        pass
+
+    def _reply(self, status: int, body: dict):
+        data = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers["Content-Length"]))
+        with MockWhisper.lock:
+            MockWhisper.requests += 1
+            if len(body) > UPLOAD_LIMIT:
+                MockWhisper.oversized += 1
+        if random.random() < self.fail_rate:
+            with MockWhisper.lock:
+                MockWhisper.failures += 1
+            return self._reply(503, {"error": {"message": "overloaded"}})
+
+        message = BytesParser(policy=email_policy).parsebytes(
+            f"Content-Type: {self.headers['Content-Type']}\r\n\r\n".encode() + body
+        )
+        upload = next(part for part in message.iter_parts() if part.get_param("name", header="content-disposition") == "file")
+        with tempfile.NamedTemporaryFile(suffix=".audio") as f:
+            f.write(upload.get_payload(decode=True))
+            f.flush()
+            duration = (read_header_info(f.name) or {}).get("duration") or 0.0
+
+        time.sleep(self.latency + duration / self.speed)
+        segments = [
+            {"id": i, "seek": int(start * 100), "start": start, "end": min(start + 5.0, duration),
+             "text": f"segment {i}"}
+            for i, start in enumerate(x * 5.0 for x in range(int(duration // 5) + (duration % 5 > 0)))
+        ]
+        self._reply(200, {"text": " ".join(s["text"] for s in segments), "segments": segments,
+                          "language": "ko", "duration": duration})
+
+
+def _generate(path: str, minutes: float):
+    # 말하는 구간(톤)과 0.4~1.5초 쉬는 구간이 섞인 16kHz 모노 FLAC (extract_audio 출력과 같은 형식)
+    volume = "if(lt(mod(t,11),8.5)+between(mod(t,31),20,20.6),1,0)"
+    subprocess.run([
+        FFMPEG_PATH, "-hide_banner", "-loglevel", "error", "-y",
+        "-f", "lavfi", "-i", f"sine=frequency=220:sample_rate={settings.stt_sample_rate}:duration={minutes * 60}",
+        "-af", f"volume='{volume}':eval=frame", "-ac", "1", "-c:a", "flac", path
+    ], check=True)
+
+
+async def _run(path: str, chunk_seconds: float, concurrency: int) -> dict:
+    settings.stt_chunk_seconds = chunk_seconds
+    settings.stt_concurrency = concurrency
+    MockWhisper.requests = MockWhisper.failures = MockWhisper.oversized = 0
+    start = time.perf_counter()
+    try:
+        result = await openai_service._transcribe_file(path, None)
+    except Exception as e:
+        return {"error": str(e).splitlines()[0]}
+    return {
+        "seconds": time.perf_counter() - start,
+        "requests": MockWhisper.requests,
+        "retried": MockWhisper.failures,
+        "oversized": MockWhisper.oversized,
+        "segments": len(result.segments),
+        "last_end": result.segments[-1]["end"] if result.segments else 0.0,
+        "ids_ok": [s["id"] for s in result.segments] == list(range(len(result.segments)))
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="분할 병렬 전사 벤치마크 (모의 Whisper 서버)")
+    parser.add_argument("audio", nargs="?", help="전사할 오디오 (없으면 --generate)")
+    parser.add_argument("--generate", type=float, metavar="MINUTES", help="합성 강의 오디오 길이 (분)")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 4, 8])
+    parser.add_argument("--chunk-seconds", type=float, default=settings.stt_chunk_seconds)
+    parser.add_argument("--latency", type=float, default=0.5, help="모의 서버 요청당 고정 지연 (초)")
+    parser.add_argument("--speed", type=float, default=20.0, help="모의 서버 처리 배속 (오디오 길이 / 처리 시간)")
+    parser.add_argument("--fail-rate", type=float, default=0.0, help="모의 서버 503 응답 비율")
+    args = parser.parse_args()
+    if FFMPEG_PATH is None:
+        raise SystemExit("ffmpeg 실행 파일이 필요합니다.")
+
+    MockWhisper.latency, MockWhisper.speed, MockWhisper.fail_rate = args.latency, args.speed, args.fail_rate
+    server = ThreadingHTTPServer(("127.0.0.1", 0), MockWhisper)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    openai_service.WHISPER_ENDPOINT = f"http://127.0.0.1:{server.server_address[1]}/v1/audio/transcriptions"
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = args.audio
+        if path is None:
+            path = os.path.join(tmp, "lecture.flac")
+            _generate(path, args.generate or 120)
+        duration = read_header_info(path)["duration"]
+        print(f"{path}: {duration / 60:.1f}분, {os.path.getsize(path) / 1024 / 1024:.1f}MB, "
+              f"모의 서버 {args.latency}s + 길이/{args.speed:g}, 실패율 {args.fail_rate:g}")
+
+        runs = [("한 번에 업로드", float("inf"), 1)] + [
+            (f"분할 동시 {n}", args.chunk_seconds, n) for n in args.concurrency
+        ]
+        for label, chunk_seconds, concurrency in runs:
+            # 한 번에 업로드는 업로드 한도도 풀어 이전 동작(파일 전체 전송)을 재현
+            settings.stt_chunk_max_bytes = 1 << 40 if chunk_seconds == float("inf") else UPLOAD_LIMIT - 1024 * 1024
+            r = asyncio.run(_run(path, chunk_seconds, concurrency))
+            if "error" in r:
+                print(f"{label:<14} 실패: {r['error']}")
+                continue
+            print(f"{label:<14} {r['seconds']:>8.2f}s  요청 {r['requests']:>3} (재시도 {r['retried']})  "
+                  f"세그먼트 {r['segments']}  마지막 끝 {r['last_end']:.1f}s  id 연속 {r['ids_ok']}"
+                  + (f"  25MB 초과 {r['oversized']}건 (실제 API는 413)" if r["oversized"] else ""))
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
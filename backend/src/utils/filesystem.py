@@ -1,3 +1,5 @@
+import asyncio
+import json
 import os
 import pathlib
 from typing import List
@@ -36,6 +38,23 @@ def get_audio_path(video_id: int, language: str) -> pathlib.Path:
     """특정 비디오와 언어의 오디오 파일 경로를 반환합니다."""
     return get_video_audio_dir(video_id) / f"{language}.mp3"
 
-def get_ko_audio_path(video_id: int) -> pathlib.Path:
-    """특정 비디오의 원본 오디오 파일 경로를 반환합니다."""
-    return get_video_audio_dir(video_id) / "ko.mp3"
+def get_ko_audio_path(video_id: int, audio_format: str = "mp3") -> pathlib.Path:
+    """특정 비디오의 원본 오디오(음성 인식 입력) 파일 경로를 반환합니다."""
+    return get_video_audio_dir(video_id) / f"ko.{audio_format}"
+
+def _read_json_sync(path) -> dict:
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+def _write_json_sync(path, data: dict):
+    os.makedirs(os.path.dirname(str(path)), exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False, indent=2)
+
+async def read_json(path) -> dict:
+    """JSON 파일 읽기 (이벤트 루프를 막지 않도록 스레드에서 실행)"""
+    return await asyncio.to_thread(_read_json_sync, path)
+
+async def write_json(path, data: dict):
+    """JSON 파일 저장 (이벤트 루프를 막지 않도록 스레드에서 실행)"""
+    await asyncio.to_thread(_write_json_sync, path, data)
@@ -1,8 +1,14 @@
+import asyncio
+import bisect
 import os
 import json
+import re
+import logging
 import shutil
 from pathlib import Path
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional, Tuple
+
+from src.utils.media_headers import probe_media
 
 # moviepy 라이브러리 임포트 (최신 버전)
 try:
@@ -12,9 +18,213 @@ except ImportError:
     MOVIEPY_AVAILABLE = False
     print("Warning: moviepy 라이브러리가 설치되어 있지 않습니다. 'pip install moviepy'로 설치하세요.")
 
-def extract_audio(video_path: str, output_path: str, format: str = "mp3", sample_rate: int = 16000) -> bool:
+logger = logging.getLogger(__name__)
+
+FFMPEG_PATH = shutil.which("ffmpeg")
+FFPROBE_PATH = shutil.which("ffprobe")
+
+# 출력 형식 -> (ffmpeg muxer, 인코더 인자, 그대로 복사할 수 있는 원본 코덱)
+AUDIO_FORMATS = {
+    "flac": ("flac", ["-c:a", "flac", "-compression_level", "5"], "flac"),
+    "wav": ("wav", ["-c:a", "pcm_s16le"], "pcm_s16le"),
+    "mp3": ("mp3", ["-c:a", "libmp3lame", "-q:a", "4"], "mp3"),
+}
+
+
+class AudioExtractionError(RuntimeError):
+    """ffmpeg 오디오 추출 실패"""
+
+
+async def _run_ffmpeg(args: List[str], timeout: Optional[float], return_stderr: bool = False) -> bytes:
+    """
+    ffmpeg/ffprobe를 비동기 서브프로세스로 실행하고 stdout(return_stderr면 stderr 로그) 반환
+
+    시간 초과나 호출 작업 취소 시 프로세스를 종료하고 기다린 뒤 예외를 다시 올립니다.
+    """
+    process = await asyncio.create_subprocess_exec(
+        *args,
+        stdin=asyncio.subprocess.DEVNULL,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.PIPE
+    )
+    try:
+        stdout, stderr = await asyncio.wait_for(process.communicate(), timeout)
+    except BaseException:
+        # TimeoutError/CancelledError - 고아 ffmpeg가 남지 않도록 정리
+        if process.returncode is None:
+            process.kill()
+            await process.wait()
+        raise
+    if process.returncode != 0:
+        message = stderr.decode("utf-8", errors="ignore").strip()
+        raise AudioExtractionError(f"{Path(args[0]).name} 종료 코드 {process.returncode}: {message[-300:]}")
+    return stderr if return_stderr else stdout
+
+
+async def probe_audio_stream(path: str, timeout: Optional[float] = 30.0) -> Optional[Dict[str, Any]]:
+    """첫 오디오 스트림의 codec_name/sample_rate/channels (오디오 트랙이 없으면 None)"""
+    stdout = await _run_ffmpeg([
+        FFPROBE_PATH, "-v", "error", "-select_streams", "a:0",
+        "-show_entries", "stream=codec_name,sample_rate,channels", "-of", "json", path
+    ], timeout)
+    streams = json.loads(stdout or b"{}").get("streams") or []
+    if not streams:
+        return None
+    stream = streams[0]
+    return {
+        "codec_name": stream.get("codec_name"),
+        "sample_rate": int(stream.get("sample_rate") or 0),
+        "channels": int(stream.get("channels") or 0)
+    }
+
+
+SILENCE_START = re.compile(rb"silence_start: (-?[\d.]+)")
+SILENCE_END = re.compile(rb"silence_end: (-?[\d.]+)")
+
+
+async def detect_silences(audio_path: str, threshold_db: float = -35.0, min_duration: float = 0.4,
+                          timeout: Optional[float] = None) -> List[Tuple[float, float]]:
+    """
+    ffmpeg silencedetect로 무음 구간 [(시작, 끝)] 조회 (초 단위, 시간순)
+
+    8kHz 모노로 낮춰 분석하므로 디코딩만 하는 것과 비슷한 시간에 끝납니다.
+    """
+    log = await _run_ffmpeg([
+        FFMPEG_PATH, "-hide_banner", "-nostdin", "-nostats", "-loglevel", "info",
+        "-i", audio_path, "-vn", "-sn", "-dn",
+        "-af", f"aresample=8000,silencedetect=noise={threshold_db}dB:d={min_duration}",
+        "-f", "null", "-"
+    ], timeout, return_stderr=True)
+    starts = [float(value) for value in SILENCE_START.findall(log)]
+    ends = [float(value) for value in SILENCE_END.findall(log)]
+    # 파일 끝까지 이어지는 무음은 silence_end가 없으므로 zip에서 빠짐 (자를 위치로 쓰지 않음)
+    return [(max(start, 0.0), end) for start, end in zip(starts, ends)]
+
+
+def plan_audio_chunks(duration: float, silences: List[Tuple[float, float]],
+                      max_seconds: float) -> List[Tuple[float, float]]:
+    """
+    전체 길이를 max_seconds 이하 구간 [(시작, 끝)]으로 나눕니다.
+
+    각 구간은 길이 절반 이후에서 가장 늦게 나오는 무음 구간의 가운데에서 자르고,
+    그런 무음이 없을 때만 max_seconds에서 자릅니다 (단어 중간에서 잘리는 일을 줄임).
+    """
+    cut_points = sorted((start + end) / 2 for start, end in silences)
+    chunks = []
+    start = 0.0
+    while duration - start > max_seconds:
+        limit = start + max_seconds
+        index = bisect.bisect_right(cut_points, limit) - 1
+        cut = cut_points[index] if index >= 0 and cut_points[index] >= start + max_seconds / 2 else limit
+        chunks.append((start, cut))
+        start = cut
+    chunks.append((start, duration))
+    return chunks
+
+
+async def cut_audio_chunk(audio_path: str, output_path: str, start: float, end: float,
+                          sample_rate: int = 16000, timeout: Optional[float] = None) -> None:
+    """start~end 구간을 모노 sample_rate Hz FLAC으로 저장 (-ss를 입력 앞에 두어 필요한 부분만 디코딩)"""
+    _, encode_args, _ = AUDIO_FORMATS["flac"]
+    await _run_ffmpeg([
+        FFMPEG_PATH, "-hide_banner", "-nostdin", "-loglevel", "error", "-y",
+        "-ss", f"{start:.3f}", "-t", f"{end - start:.3f}", "-i", audio_path,
+        "-map", "0:a:0", "-vn", "-sn", "-dn", *encode_args, "-ac", "1", "-ar", str(sample_rate),
+        "-f", "flac", output_path
+    ], timeout)
+
+
+def _sample_audio_source() -> Optional[Path]:
+    for path in (Path("static/sample.mp3"), Path("backend/static/sample.mp3"),
+                 Path(__file__).parent.parent.parent / "static" / "sample.mp3"):
+        if path.exists():
+            return path
+    return None
+
+
+async def extract_audio_ffmpeg(video_path: str, output_path: str, sample_rate: int = 16000,
+                               timeout: Optional[float] = None) -> None:
     """
-    비디오에서 오디오를 추출합니다.
+    ffmpeg 한 번의 실행으로 첫 오디오 트랙을 디먹싱/리샘플링해 모노 sample_rate Hz로 저장합니다.
+
+    샘플은 Python을 거치지 않고, 원본이 이미 같은 코덱/샘플레이트/모노면 재인코딩 없이 복사합니다.
+    임시 파일에 쓴 뒤 교체하므로 실패/취소 시 불완전한 파일이 남지 않습니다.
+
+    Raises:
+        AudioExtractionError: ffmpeg 실패 또는 오디오 트랙/샘플 오디오가 모두 없는 경우
+        TimeoutError: timeout 초과
+    """
+    audio_format = Path(output_path).suffix.lstrip(".").lower()
+    if audio_format not in AUDIO_FORMATS:
+        raise AudioExtractionError(f"지원하지 않는 오디오 형식입니다: {audio_format}")
+    muxer, encode_args, copy_codec = AUDIO_FORMATS[audio_format]
+
+    codec_args = encode_args + ["-ac", "1", "-ar", str(sample_rate)]
+    probed = False
+    if FFPROBE_PATH:
+        try:
+            stream = await probe_audio_stream(video_path)
+            probed = True
+        except (AudioExtractionError, ValueError, asyncio.TimeoutError) as e:
+            # 확인하지 못하면 복사/샘플 대체 없이 그대로 변환 시도
+            logger.warning(f"⚠️ [오디오] 스트림 정보 확인 실패 - {video_path}: {e}")
+    if probed:
+        if stream is None:
+            # 기존 동작과 같이 오디오 트랙이 없으면 샘플 오디오로 대체
+            sample = _sample_audio_source()
+            if sample is None:
+                raise AudioExtractionError(f"오디오 트랙이 없습니다: {video_path}")
+            logger.warning(f"⚠️ [오디오] 오디오 트랙이 없어 샘플 오디오 사용 - {video_path}")
+            video_path = str(sample)
+        elif (stream["codec_name"], stream["sample_rate"], stream["channels"]) == (copy_codec, sample_rate, 1):
+            codec_args = ["-c:a", "copy"]
+
+    os.makedirs(os.path.dirname(output_path) or ".", exist_ok=True)
+    partial_path = f"{output_path}.part"
+    try:
+        await _run_ffmpeg([
+            FFMPEG_PATH, "-hide_banner", "-nostdin", "-loglevel", "error", "-y",
+            "-i", video_path, "-map", "0:a:0", "-vn", "-sn", "-dn",
+            *codec_args, "-f", muxer, partial_path
+        ], timeout)
+        os.replace(partial_path, output_path)
+    finally:
+        if os.path.exists(partial_path):
+            os.remove(partial_path)
+
+
+async def extract_audio(video_path: str, output_path: str, sample_rate: int = 16000,
+                        timeout: Optional[float] = None) -> bool:
+    """
+    비디오에서 음성 인식용 오디오(모노, sample_rate Hz)를 추출합니다. 형식은 output_path 확장자(flac/wav/mp3)를 따릅니다.
+
+    ffmpeg가 있으면 서브프로세스로 스트리밍 추출하고, 없으면 moviepy로 추출합니다.
+
+    Args:
+        video_path: 입력 비디오 파일 경로
+        output_path: 출력 오디오 파일 경로
+        sample_rate: 샘플링 레이트 (기본값: 16000Hz)
+        timeout: ffmpeg 실행 제한 시간 (초, None이면 제한 없음)
+
+    Returns:
+        bool: 추출 성공 여부
+    """
+    if FFMPEG_PATH is None:
+        audio_format = Path(output_path).suffix.lstrip(".").lower() or "mp3"
+        return await asyncio.to_thread(_extract_audio_moviepy, video_path, output_path, audio_format, sample_rate)
+
+    try:
+        await extract_audio_ffmpeg(video_path, output_path, sample_rate, timeout)
+        logger.info(f"🎵 [오디오] ffmpeg 추출 완료 - {output_path}")
+        return True
+    except (AudioExtractionError, asyncio.TimeoutError) as e:
+        logger.error(f"❌ [오디오] ffmpeg 추출 실패 - {video_path}: {str(e) or '시간 초과'}")
+        return False
+
+
+def _extract_audio_moviepy(video_path: str, output_path: str, format: str = "mp3", sample_rate: int = 16000) -> bool:
+    """
+    moviepy로 비디오에서 오디오를 추출합니다. (ffmpeg 실행 파일이 없을 때의 대체 경로)
 
     Args:
         video_path: 입력 비디오 파일 경로
@@ -40,53 +250,57 @@ def extract_audio(video_path: str, output_path: str, format: str = "mp3", sample
                 if video.audio is None:
                     print("Error: 비디오에 오디오 트랙이 없습니다.")
                     video.close()
-                    return use_sample_audio(output_path)
+                    return use_sample_audio(output_path, format, sample_rate)
 
                 # 오디오 추출 및 저장
                 print(f"MoviePy: 오디오 추출 중 - {output_path}")
-                audio = video.audio
-
-                # 샘플링 레이트 설정 (MoviePy는 fps 매개변수 사용)
-                audio.write_audiofile(
-                    output_path,
-                    fps=sample_rate,
-                    nbytes=2,  # 16-bit
-                    codec=format
-                )
-
-                # 리소스 정리
-                audio.close()
+                _write_audio_moviepy(video.audio, output_path, format, sample_rate)
                 video.close()
 
                 print(f"MoviePy: 오디오 추출 완료 - {output_path}")
                 return True
             except Exception as e:
                 print(f"MoviePy 오디오 추출 실패: {str(e)}")
-                return use_sample_audio(output_path)
+                return use_sample_audio(output_path, format, sample_rate)
         else:
             print("MoviePy 라이브러리가 없어 샘플 오디오를 사용합니다.")
-            return use_sample_audio(output_path)
+            return use_sample_audio(output_path, format, sample_rate)
 
     except Exception as e:
         print(f"오디오 추출 중 오류 발생: {str(e)}")
         return False
 
-def use_sample_audio(output_path: str) -> bool:
-    """샘플 오디오 파일을 사용합니다."""
+def _write_audio_moviepy(audio, output_path: str, format: str, sample_rate: int):
+    """moviepy 오디오 클립을 format/sample_rate 모노로 저장하고 클립을 닫습니다."""
+    try:
+        # 샘플링 레이트 설정 (MoviePy는 fps 매개변수 사용)
+        audio.write_audiofile(
+            output_path,
+            fps=sample_rate,
+            nbytes=2,  # 16-bit
+            codec={"wav": "pcm_s16le"}.get(format, format),
+            ffmpeg_params=["-ac", "1"]
+        )
+    finally:
+        audio.close()
+
+def use_sample_audio(output_path: str, format: str = "mp3", sample_rate: int = 16000) -> bool:
+    """
+    샘플 오디오 파일을 사용합니다.
+
+    샘플은 MP3이므로 다른 형식(flac/wav)이면 moviepy로 변환하고, 변환할 수 없으면 실패로 처리합니다.
+    (확장자와 내용이 다른 파일을 남기지 않음)
+    """
     try:
-        # 기본 샘플 오디오 경로 탐색
-        sample_paths = [
-            Path("static/sample.mp3"),  # 프로젝트 루트의 static 폴더
-            Path("backend/static/sample.mp3"),  # backend 폴더 내의 static 폴더
-            Path(__file__).parent.parent.parent / "static" / "sample.mp3"  # backend 폴더 기준
-        ]
-
-        # 샘플 오디오 파일 찾기
-        sample_audio = None
-        for path in sample_paths:
-            if path.exists():
-                sample_audio = path
-                break
+        sample_audio = _sample_audio_source()
+
+        if format != "mp3":
+            if sample_audio is None or not MOVIEPY_AVAILABLE:
+                print(f"샘플 오디오를 {format} 형식으로 변환할 수 없습니다.")
+                return False
+            print(f"샘플 오디오 파일 {sample_audio}를 {format} 형식으로 변환")
+            _write_audio_moviepy(AudioFileClip(str(sample_audio)), output_path, format, sample_rate)
+            return True
 
         if sample_audio:
             # 샘플 파일 복사
@@ -111,29 +325,16 @@ def get_audio_duration(audio_path: str) -> Optional[float]:
     """
     오디오 파일 길이를 초 단위로 가져옵니다.
 
+    컨테이너 헤더만 읽고, 헤더로 알 수 없을 때만 ffprobe를 실행합니다 (디코더를 열지 않음).
+
     Args:
         audio_path: 오디오 파일 경로
 
     Returns:
         float: 오디오 길이 (초), 실패 시 None
     """
-    # moviepy가 설치되어 있는지 확인
-    if MOVIEPY_AVAILABLE:
-        try:
-            # 오디오 파일 열기
-            audio = AudioFileClip(audio_path)
-
-            # 길이 가져오기
-            duration = audio.duration
-
-            # 리소스 정리
-            audio.close()
-
-            print(f"오디오 길이: {duration}초")
-            return duration
-        except Exception as e:
-            print(f"오디오 정보 가져오기 중 오류 발생: {str(e)}")
-
-    # moviepy 사용 불가능하거나 오류 발생 시 기본값 반환
-    print(f"기본 오디오 길이 반환: 60.0초")
-    return 60.0
+    info = probe_media(audio_path)
+    if info is None or info["duration"] is None:
+        logger.warning(f"⚠️ [오디오] 길이 조회 실패 - {audio_path}")
+        return None
+    return info["duration"]
@@ -0,0 +1,439 @@
+"""컨테이너 헤더만 읽어 길이/코덱/샘플레이트/채널 수를 구하는 파서 (샘플 디코딩 없음)
+
+WAV(fmt/data 청크), FLAC(STREAMINFO), MP3(Xing/Info/VBRI 헤더, 없으면 CBR 계산),
+MP4/MOV/M4A(moov의 mvhd와 오디오 trak의 stsd), WebM/Matroska(Info/Tracks)를 지원하고
+헤더로 길이를 알 수 없으면 ffprobe를 한 번 실행한다.
+결과는 {"duration", "codec", "sample_rate", "channels", "source"} dict (모르는 값은 None).
+"""
+from typing import Any, BinaryIO, Dict, Iterator, Optional, Tuple
+import json
+import os
+import shutil
+import struct
+import subprocess
+
+FFPROBE_PATH = shutil.which("ffprobe")
+
+
+def _info(duration=None, codec=None, sample_rate=None, channels=None, source="header") -> Dict[str, Any]:
+    return {
+        "duration": float(duration) if duration else None,
+        "codec": codec,
+        "sample_rate": int(sample_rate) if sample_rate else None,
+        "channels": int(channels) if channels else None,
+        "source": source
+    }
+
+
+# ---------------------------------------------------------------- WAV
+
+WAV_CODECS = {3: "pcm_f{bits}le", 6: "pcm_alaw", 7: "pcm_mulaw"}
+
+
+def _read_wav(f: BinaryIO, size: int) -> Optional[Dict[str, Any]]:
+    f.seek(12)
+    fmt = None
+    data_size = None
+    while data_size is None:
+        chunk = f.read(8)
+        if len(chunk) < 8:
+            break
+        chunk_id, chunk_size = chunk[:4], struct.unpack("<I", chunk[4:])[0]
+        if chunk_id == b"fmt ":
+            fmt = f.read(chunk_size)
+            f.seek(chunk_size & 1, os.SEEK_CUR)
+        elif chunk_id == b"data":
+            # 스트리밍으로 쓴 파일은 크기가 0 또는 0xFFFFFFFF일 수 있으므로 남은 파일 크기로 제한
+            data_size = min(chunk_size, size - f.tell()) if chunk_size not in (0, 0xFFFFFFFF) else size - f.tell()
+        else:
+            f.seek(chunk_size + (chunk_size & 1), os.SEEK_CUR)
+    if fmt is None or len(fmt) < 16 or data_size is None:
+        return None
+
+    audio_format, channels, sample_rate, byte_rate, _, bits = struct.unpack("<HHIIHH", fmt[:16])
+    if audio_format == 0xFFFE and len(fmt) >= 26:
+        # WAVE_FORMAT_EXTENSIBLE - 실제 형식은 SubFormat GUID 앞 2바이트
+        audio_format = struct.unpack("<H", fmt[24:26])[0]
+    if audio_format == 1:
+        codec = "pcm_u8" if bits == 8 else f"pcm_s{bits}le"
+    else:
+        codec = WAV_CODECS.get(audio_format, f"wav_0x{audio_format:04x}").format(bits=bits)
+    return _info(data_size / byte_rate if byte_rate else None, codec, sample_rate, channels)
+
+
+# ---------------------------------------------------------------- FLAC
+
+def _read_flac(f: BinaryIO, size: int) -> Optional[Dict[str, Any]]:
+    f.seek(4)
+    block_header = f.read(4)
+    # 첫 메타데이터 블록은 항상 STREAMINFO(0)
+    if len(block_header) < 4 or block_header[0] & 0x7F != 0:
+        return None
+    streaminfo = f.read(34)
+    if len(streaminfo) < 34:
+        return None
+    # 샘플레이트 20비트, 채널-1 3비트, 비트 깊이-1 5비트, 전체 샘플 수 36비트
+    packed = int.from_bytes(streaminfo[10:18], "big")
+    sample_rate = packed >> 44
+    channels = ((packed >> 41) & 0x7) + 1
+    total_samples = packed & 0xFFFFFFFFF
+    return _info(total_samples / sample_rate if sample_rate and total_samples else None, "flac", sample_rate, channels)
+
+
+# ---------------------------------------------------------------- MP3
+
+MP3_BITRATES = {
+    (1, 1): (0, 32, 64, 96, 128, 160, 192, 224, 256, 288, 320, 352, 384, 416, 448),
+    (1, 2): (0, 32, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320, 384),
+    (1, 3): (0, 32, 40, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320),
+    (2, 1): (0, 32, 48, 56, 64, 80, 96, 112, 128, 144, 160, 176, 192, 224, 256),
+    (2, 2): (0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160),
+    (2, 3): (0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160),
+}
+# 버전 비트 -> (MPEG 버전, 샘플레이트 표), 0b01은 예약값
+MP3_VERSIONS = {
+    0b11: (1, (44100, 48000, 32000)),
+    0b10: (2, (22050, 24000, 16000)),
+    0b00: (2.5, (11025, 12000, 8000)),
+}
+
+
+def _mp3_frame(header: bytes) -> Optional[Dict[str, Any]]:
+    if len(header) < 4 or header[0] != 0xFF or header[1] & 0xE0 != 0xE0:
+        return None
+    version_bits = (header[1] >> 3) & 0x3
+    layer = 4 - ((header[1] >> 1) & 0x3)
+    bitrate_index = header[2] >> 4
+    rate_index = (header[2] >> 2) & 0x3
+    if version_bits not in MP3_VERSIONS or layer == 4 or bitrate_index in (0, 15) or rate_index == 3:
+        return None
+    version, rates = MP3_VERSIONS[version_bits]
+    bitrate = MP3_BITRATES[(1 if version == 1 else 2, layer)][bitrate_index] * 1000
+    sample_rate = rates[rate_index]
+    padding = (header[2] >> 1) & 0x1
+    mono = (header[3] >> 6) == 0x3
+    if layer == 1:
+        samples, length = 384, (12 * bitrate // sample_rate + padding) * 4
+    else:
+        samples = 576 if layer == 3 and version != 1 else 1152
+        length = samples // 8 * bitrate // sample_rate + padding
+    return {
+        "version": version, "layer": layer, "bitrate": bitrate, "sample_rate": sample_rate,
+        "channels": 1 if mono else 2, "samples": samples, "length": length
+    }
+
+
+def _read_mp3(f: BinaryIO, size: int) -> Optional[Dict[str, Any]]:
+    f.seek(0)
+    head = f.read(10)
+    start = 0
+    if head[:3] == b"ID3" and len(head) == 10:
+        # ID3v2 태그 크기는 7비트씩 나눈 syncsafe 정수, 푸터 플래그가 있으면 10바이트 추가
+        start = 10 + ((head[6] & 0x7F) << 21 | (head[7] & 0x7F) << 14 | (head[8] & 0x7F) << 7 | (head[9] & 0x7F))
+        start += 10 if head[5] & 0x10 else 0
+    f.seek(start)
+    buffer = f.read(64 * 1024)
+
+    position = buffer.find(b"\xff")
+    frame = None
+    while 0 <= position < len(buffer) - 4:
+        frame = _mp3_frame(buffer[position:position + 4])
+        if frame:
+            # 우연히 동기 비트와 같은 바이트를 걸러내기 위해 다음 프레임 헤더도 확인 (버퍼 안에 있을 때)
+            following = position + frame["length"]
+            if following + 4 > len(buffer) or _mp3_frame(buffer[following:following + 4]):
+                break
+        frame = None
+        position = buffer.find(b"\xff", position + 1)
+    if frame is None:
+        return None
+
+    codec = f"mp{frame['layer']}"
+    side_info = (17 if frame["channels"] == 1 else 32) if frame["version"] == 1 else (9 if frame["channels"] == 1 else 17)
+    xing = position + 4 + side_info
+    if buffer[xing:xing + 4] in (b"Xing", b"Info") and len(buffer) >= xing + 12:
+        flags = struct.unpack(">I", buffer[xing + 4:xing + 8])[0]
+        if flags & 0x1:
+            frames = struct.unpack(">I", buffer[xing + 8:xing + 12])[0]
+            return _info(frames * frame["samples"] / frame["sample_rate"], codec, frame["sample_rate"], frame["channels"])
+    vbri = position + 4 + 32
+    if buffer[vbri:vbri + 4] == b"VBRI" and len(buffer) >= vbri + 18:
+        frames = struct.unpack(">I", buffer[vbri + 14:vbri + 18])[0]
+        return _info(frames * frame["samples"] / frame["sample_rate"], codec, frame["sample_rate"], frame["channels"])
+
+    # VBR 헤더가 없으면 고정 비트레이트로 보고 오디오 바이트 수로 계산 (끝의 ID3v1 태그 제외)
+    audio_bytes = size - start - position
+    if size >= 128:
+        f.seek(size - 128)
+        if f.read(3) == b"TAG":
+            audio_bytes -= 128
+    return _info(audio_bytes * 8 / frame["bitrate"], codec, frame["sample_rate"], frame["channels"])
+
+
+# ---------------------------------------------------------------- MP4 / MOV
+
+MP4_CODECS = {
+    b"mp4a": "aac", b"Opus": "opus", b"fLaC": "flac", b"ac-3": "ac3", b"ec-3": "eac3", b".mp3": "mp3",
+    b"alac": "alac", b"samr": "amr_nb", b"sowt": "pcm_s16le", b"twos": "pcm_s16be", b"lpcm": "pcm"
+}
+MP4_TOP_LEVEL = (b"ftyp", b"moov", b"wide", b"free", b"skip", b"mdat")
+
+
+def _boxes(f: BinaryIO, start: int, end: int) -> Iterator[Tuple[bytes, int, int]]:
+    """[start, end) 안의 박스를 (타입, 내용 시작, 박스 끝)으로 순회 - 내용은 읽지 않고 건너뜀"""
+    position = start
+    while position + 8 <= end:
+        f.seek(position)
+        header = f.read(8)
+        if len(header) < 8:
+            return
+        box_size, box_type = struct.unpack(">I4s", header)
+        header_size = 8
+        if box_size == 1:
+            box_size = struct.unpack(">Q", f.read(8))[0]
+            header_size = 16
+        elif box_size == 0:
+            box_size = end - position
+        if box_size < header_size:
+            return
+        yield box_type, position + header_size, min(position + box_size, end)
+        position += box_size
+
+
+def _child(f: BinaryIO, start: int, end: int, box_type: bytes) -> Optional[Tuple[int, int]]:
+    for found, content_start, box_end in _boxes(f, start, end):
+        if found == box_type:
+            return content_start, box_end
+    return None
+
+
+def _mp4_audio_track(f: BinaryIO, start: int, end: int) -> Optional[Dict[str, Any]]:
+    mdia = _child(f, start, end, b"mdia")
+    if mdia is None:
+        return None
+    hdlr = _child(f, *mdia, b"hdlr")
+    if hdlr is None:
+        return None
+    f.seek(hdlr[0] + 8)
+    if f.read(4) != b"soun":
+        return None
+
+    track = {"codec": None, "sample_rate": None, "channels": None}
+    mdhd = _child(f, *mdia, b"mdhd")
+    if mdhd:
+        f.seek(mdhd[0])
+        version = f.read(1)[0]
+        f.seek(mdhd[0] + (20 if version == 1 else 12))
+        # 오디오 트랙의 timescale은 보통 샘플레이트
+        track["sample_rate"] = struct.unpack(">I", f.read(4))[0]
+
+    minf = _child(f, *mdia, b"minf")
+    stbl = _child(f, *minf, b"stbl") if minf else None
+    stsd = _child(f, *stbl, b"stsd") if stbl else None
+    if stsd:
+        # 전체 박스 헤더(버전/플래그 4) + entry_count(4) 다음이 첫 샘플 엔트리
+        f.seek(stsd[0] + 8)
+        entry = f.read(36)
+        if len(entry) >= 36:
+            track["codec"] = MP4_CODECS.get(entry[4:8], entry[4:8].decode("latin-1").strip().lower())
+            track["channels"] = struct.unpack(">H", entry[24:26])[0]
+            sample_rate = struct.unpack(">I", entry[32:36])[0] >> 16
+            track["sample_rate"] = sample_rate or track["sample_rate"]
+    return track
+
+
+def _read_mp4(f: BinaryIO, size: int) -> Optional[Dict[str, Any]]:
+    # moov는 파일 끝에 있을 수 있음 (faststart가 아닌 녹화 파일) - mdat는 읽지 않고 건너뜀
+    moov = _child(f, 0, size, b"moov")
+    if moov is None:
+        return None
+
+    duration = None
+    mvhd = _child(f, *moov, b"mvhd")
+    if mvhd:
+        f.seek(mvhd[0])
+        version = f.read(1)[0]
+        if version == 1:
+            f.seek(mvhd[0] + 20)
+            timescale, raw_duration = struct.unpack(">IQ", f.read(12))
+            unknown = 0xFFFFFFFFFFFFFFFF
+        else:
+            f.seek(mvhd[0] + 12)
+            timescale, raw_duration = struct.unpack(">II", f.read(8))
+            unknown = 0xFFFFFFFF
+        # 조각화된 MP4(fMP4)는 mvhd 길이가 0 - ffprobe로 넘김
+        if timescale and raw_duration not in (0, unknown):
+            duration = raw_duration / timescale
+
+    track = {}
+    for box_type, content_start, box_end in _boxes(f, *moov):
+        if box_type == b"trak":
+            track = _mp4_audio_track(f, content_start, box_end) or {}
+            if track:
+                break
+    return _info(duration, track.get("codec"), track.get("sample_rate"), track.get("channels"))
+
+
+# ---------------------------------------------------------------- WebM / Matroska
+
+EBML_HEADER = 0x1A45DFA3
+SEGMENT = 0x18538067
+INFO = 0x1549A966
+TIMECODE_SCALE = 0x2AD7B1
+DURATION = 0x4489
+TRACKS = 0x1654AE6B
+TRACK_ENTRY = 0xAE
+TRACK_TYPE = 0x83
+CODEC_ID = 0x86
+AUDIO = 0xE1
+SAMPLING_FREQUENCY = 0xB5
+CHANNELS = 0x9F
+CLUSTER = 0x1F43B675
+MATROSKA_CODECS = {"A_OPUS": "opus", "A_VORBIS": "vorbis", "A_FLAC": "flac", "A_MPEG/L3": "mp3", "A_AC3": "ac3"}
+
+
+def _vint(f: BinaryIO, keep_marker: bool) -> Optional[int]:
+    """EBML 가변 길이 정수 - ID는 표시 비트를 포함, 크기는 제외 (모든 비트가 1인 크기는 미정으로 None)"""
+    first = f.read(1)
+    if not first:
+        raise EOFError
+    length = 9 - first[0].bit_length()
+    if length > 8:
+        raise ValueError("잘못된 EBML 정수")
+    value = first[0] if keep_marker else first[0] & (0xFF >> length)
+    for byte in f.read(length - 1):
+        value = value << 8 | byte
+    if not keep_marker and value == (1 << (7 * length)) - 1:
+        return None
+    return value
+
+
+def _elements(f: BinaryIO, start: int, end: int) -> Iterator[Tuple[int, int, int]]:
+    position = start
+    while position < end:
+        f.seek(position)
+        element_id = _vint(f, True)
+        element_size = _vint(f, False)
+        content_start = f.tell()
+        content_end = end if element_size is None else min(content_start + element_size, end)
+        yield element_id, content_start, content_end
+        if element_size is None:
+            # 크기 미정 요소(라이브 녹화의 Cluster 등) 뒤는 순회하지 않음
+            return
+        position = content_end
+
+
+def _ebml_value(f: BinaryIO, start: int, end: int, kind: str):
+    f.seek(start)
+    data = f.read(end - start)
+    if kind == "uint":
+        return int.from_bytes(data, "big")
+    if kind == "float":
+        return struct.unpack(">f" if len(data) == 4 else ">d", data)[0] if len(data) in (4, 8) else None
+    return data.rstrip(b"\x00").decode("ascii", errors="ignore")
+
+
+def _read_webm(f: BinaryIO, size: int) -> Optional[Dict[str, Any]]:
+    elements = _elements(f, 0, size)
+    header = next(elements, None)
+    if header is None or header[0] != EBML_HEADER:
+        return None
+    segment = next(elements, None)
+    if segment is None or segment[0] != SEGMENT:
+        return None
+
+    scale, raw_duration, track = 1_000_000, None, {}
+    for element_id, start, end in _elements(f, segment[1], segment[2]):
+        if element_id == INFO:
+            for child_id, child_start, child_end in _elements(f, start, end):
+                if child_id == TIMECODE_SCALE:
+                    scale = _ebml_value(f, child_start, child_end, "uint") or scale
+                elif child_id == DURATION:
+                    raw_duration = _ebml_value(f, child_start, child_end, "float")
+        elif element_id == TRACKS:
+            for entry_id, entry_start, entry_end in _elements(f, start, end):
+                if entry_id != TRACK_ENTRY:
+                    continue
+                entry = {}
+                for child_id, child_start, child_end in _elements(f, entry_start, entry_end):
+                    if child_id == TRACK_TYPE:
+                        entry["type"] = _ebml_value(f, child_start, child_end, "uint")
+                    elif child_id == CODEC_ID:
+                        codec_id = _ebml_value(f, child_start, child_end, "str")
+                        entry["codec"] = MATROSKA_CODECS.get(codec_id) or (
+                            "aac" if codec_id.startswith("A_AAC") else codec_id.removeprefix("A_").lower())
+                    elif child_id == AUDIO:
+                        for audio_id, audio_start, audio_end in _elements(f, child_start, child_end):
+                            if audio_id == SAMPLING_FREQUENCY:
+                                entry["sample_rate"] = _ebml_value(f, audio_start, audio_end, "float")
+                            elif audio_id == CHANNELS:
+                                entry["channels"] = _ebml_value(f, audio_start, audio_end, "uint")
+                # TrackType 2 = 오디오
+                if entry.get("type") == 2 and not track:
+                    track = entry
+        elif element_id == CLUSTER:
+            # Info/Tracks는 첫 Cluster 앞에 있음 - 미디어 데이터는 읽지 않음
+            break
+
+    duration = raw_duration * scale / 1e9 if raw_duration else None
+    return _info(duration, track.get("codec"), track.get("sample_rate"), track.get("channels") or (1 if track else None))
+
+
+# ---------------------------------------------------------------- 진입점
+
+def read_header_info(path: str) -> Optional[Dict[str, Any]]:
+    """매직 바이트로 컨테이너를 판별해 헤더만 파싱 (지원하지 않거나 손상된 파일이면 None)"""
+    size = os.path.getsize(path)
+    with open(path, "rb") as f:
+        magic = f.read(12)
+        if magic[:4] in (b"RIFF", b"RF64") and magic[8:12] == b"WAVE":
+            parser = _read_wav
+        elif magic[:4] == b"fLaC":
+            parser = _read_flac
+        elif magic[4:8] in MP4_TOP_LEVEL:
+            parser = _read_mp4
+        elif magic[:4] == b"\x1a\x45\xdf\xa3":
+            parser = _read_webm
+        elif magic[:3] == b"ID3" or _mp3_frame(magic[:4]):
+            parser = _read_mp3
+        else:
+            return None
+        try:
+            return parser(f, size)
+        except (struct.error, ValueError, EOFError, IndexError, TypeError):
+            return None
+
+
+def ffprobe_info(path: str, timeout: float = 30.0) -> Optional[Dict[str, Any]]:
+    """ffprobe 한 번으로 길이와 첫 오디오 스트림 정보 조회 (ffprobe가 없거나 실패하면 None)"""
+    if FFPROBE_PATH is None:
+        return None
+    try:
+        result = subprocess.run(
+            [FFPROBE_PATH, "-v", "error", "-show_entries",
+             "format=duration:stream=codec_type,codec_name,sample_rate,channels", "-of", "json", path],
+            capture_output=True, timeout=timeout, check=True
+        )
+        data = json.loads(result.stdout or b"{}")
+    except (subprocess.SubprocessError, OSError, ValueError):
+        return None
+    stream = next((s for s in data.get("streams", []) if s.get("codec_type") == "audio"), {})
+    try:
+        duration = float(data.get("format", {}).get("duration"))
+    except (TypeError, ValueError):
+        duration = None
+    return _info(duration, stream.get("codec_name"), stream.get("sample_rate"), stream.get("channels"), "ffprobe")
+
+
+def probe_media(path: str) -> Optional[Dict[str, Any]]:
+    """헤더 파싱을 먼저 하고 길이를 모르면 ffprobe로 보충"""
+    info = read_header_info(path)
+    if info is not None and info["duration"] is not None:
+        return info
+    fallback = ffprobe_info(path)
+    if fallback is None:
+        return info
+    if info is not None:
+        # 헤더에서 얻은 값은 유지하고 빈 값만 채움
+        fallback.update({key: value for key, value in info.items() if value is not None and key != "source"})
+    return fallback
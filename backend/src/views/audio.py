@@ -1,14 +1,16 @@
 from fastapi import APIRouter, Depends, HTTPException, status, Response
 from fastapi.responses import FileResponse
 from sqlmodel.ext.asyncio.session import AsyncSession
-from sqlmodel import select
 import os
+import pathlib
 
 from src.db.database import get_db
-from src.models.audio import Audio
+from src.repositories.audios import get_audio
 from src.services.auth import get_current_user
 from src.utils.filesystem import get_audio_path
 
+AUDIO_MEDIA_TYPES = {".mp3": "audio/mpeg", ".flac": "audio/flac", ".wav": "audio/wav"}
+
 router = APIRouter(
     prefix="/audio",
     tags=["오디오"],
@@ -33,12 +35,7 @@ async def get_audio_file(
         FileResponse: 오디오 파일
     """
     # 오디오 레코드 확인
-    statement = select(Audio).where(
-        Audio.video_id == video_id,
-        Audio.language == language,
-        Audio.is_processed == True
-    )
-    audio = db.exec(statement).first()
+    audio = await get_audio(db, video_id, language, processed_only=True)
     
     if not audio:
         raise HTTPException(
@@ -46,8 +43,8 @@ async def get_audio_file(
             detail=f"요청한 오디오 파일을 찾을 수 없습니다. 비디오 {video_id}의 {language} 오디오가 아직 처리되지 않았습니다."
         )
     
-    # 실제 파일 경로
-    audio_path = get_audio_path(video_id, language)
+    # 실제 파일 경로 (원본 오디오는 flac 등 mp3가 아닐 수 있으므로 DB에 기록된 경로 우선)
+    audio_path = pathlib.Path(audio.file_path or get_audio_path(video_id, language))
     
     if not os.path.exists(audio_path):
         raise HTTPException(
@@ -57,6 +54,6 @@ async def get_audio_file(
     
     return FileResponse(
         path=audio_path,
-        media_type="audio/mpeg",
-        filename=f"audio_{video_id}_{language}.mp3"
+        media_type=AUDIO_MEDIA_TYPES.get(audio_path.suffix.lower(), "application/octet-stream"),
+        filename=f"audio_{video_id}_{language}{audio_path.suffix}"
     ) 
\ No newline at end of file
@@ -1,4 +1,5 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+from fastapi.responses import StreamingResponse
 from sqlmodel import Session, select
 from typing import List
 from datetime import datetime
@@ -9,10 +10,30 @@ from src.models.lecture import (
     Lecture, LectureCreate, LectureRead, LectureUpdate, 
     LectureParticipant, LectureStatus
 )
+from src.models.chat import ChatMessage
+from src.models.caption import LectureCaption
+from src.repositories.lectures import (
+    list_lecture_summaries, get_lecture_summary,
+    increment_participant_count, decrement_participant_count, deactivate_participant
+)
 from src.services.auth import get_current_user
+from src.services.participant_counter import participant_counter
+from src.services.rate_limit import admission_controller
+from src.services.response_cache import LECTURE_LIST, response_cache
+from src.services.export import (
+    stream_export, EXPORT_FORMATS, CHAT_EXPORT_COLUMNS, CAPTION_EXPORT_COLUMNS
+)
 
 router = APIRouter(prefix="/lectures", tags=["lectures"])
 
+
+def _lecture_read(lecture: Lecture, instructor_name: str) -> LectureRead:
+    return LectureRead(
+        **lecture.model_dump(),
+        instructor_name=instructor_name or "알 수 없음",
+        participant_count=lecture.active_participant_count
+    )
+
 @router.post("/", response_model=LectureRead)
 async def create_lecture(
     lecture: LectureCreate,
@@ -33,6 +54,7 @@ async def create_lecture(
     db.add(db_lecture)
     await db.commit()
     await db.refresh(db_lecture)
+    await response_cache.invalidate(LECTURE_LIST)
     
     return LectureRead(
         **db_lecture.model_dump(), 
@@ -43,35 +65,20 @@ async def create_lecture(
 
 @router.get("/", response_model=List[LectureRead])
 async def get_lectures(
+    request: Request,
+    skip: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=100),
     db: Session = Depends(get_db)
 ):
     """강의 목록 조회 (공개 API)"""
-    # 모든 강의 목록 조회 (인증 없이도 접근 가능)
-    lectures_result = await db.exec(select(Lecture))
-    lectures = lectures_result.all()
-    
-    result = []
-    for lecture in lectures:
-        # 강사 정보 조회
-        instructor = await db.get(User, lecture.instructor_id)
-        instructor_name = instructor.username if instructor else "알 수 없음"
-        
-        # 참여자 수를 별도 쿼리로 조회 (lazy loading 회피)
-        participant_count_result = await db.exec(
-            select(LectureParticipant).where(
-                LectureParticipant.lecture_id == lecture.id,
-                LectureParticipant.is_active == True
-            )
-        )
-        participant_count = len(participant_count_result.all())
-        
-        result.append(LectureRead(
-            **lecture.model_dump(), 
-            instructor_name=instructor_name,
-            participant_count=participant_count
-        ))
-    
-    return result
+    async def build():
+        # 강사 이름과 참여자 수를 한 번의 쿼리로 함께 조회 (인증 없이도 접근 가능)
+        summaries = await list_lecture_summaries(db, skip, limit)
+        return [_lecture_read(lecture, instructor_name).model_dump(mode="json")
+                for lecture, instructor_name in summaries]
+
+    # 강의 생성/수정/시작/종료와 참여자 변동 시 무효화
+    return await response_cache.respond(request, LECTURE_LIST, f"{skip}:{limit}", build)
 
 
 @router.get("/{lecture_id}", response_model=LectureRead)
@@ -81,31 +88,14 @@ async def get_lecture(
     current_user: User = Depends(get_current_user)
 ):
     """특정 강의 조회"""
-    lecture = await db.get(Lecture, lecture_id)
-    if not lecture:
+    summary = await get_lecture_summary(db, lecture_id)
+    if not summary:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="강의를 찾을 수 없습니다."
         )
     
-    # 강사 정보 조회
-    instructor = await db.get(User, lecture.instructor_id)
-    instructor_name = instructor.username if instructor else "알 수 없음"
-    
-    # 참여자 수를 별도 쿼리로 조회 (lazy loading 회피)
-    participant_count_result = await db.exec(
-        select(LectureParticipant).where(
-            LectureParticipant.lecture_id == lecture.id,
-            LectureParticipant.is_active == True
-        )
-    )
-    participant_count = len(participant_count_result.all())
-    
-    return LectureRead(
-        **lecture.model_dump(), 
-        instructor_name=instructor_name,
-        participant_count=participant_count
-    )
+    return _lecture_read(*summary)
 
 
 @router.put("/{lecture_id}", response_model=LectureRead)
@@ -135,21 +125,11 @@ async def update_lecture(
     db.add(lecture)
     await db.commit()
     await db.refresh(lecture)
+    # WebSocket 입장 제어의 정원 캐시도 모든 샤드에서 무효화
+    admission_controller.invalidate(lecture_id)
+    await response_cache.invalidate(LECTURE_LIST)
     
-    # 참여자 수를 별도 쿼리로 조회 (lazy loading 회피)
-    participant_count_result = await db.exec(
-        select(LectureParticipant).where(
-            LectureParticipant.lecture_id == lecture.id,
-            LectureParticipant.is_active == True
-        )
-    )
-    participant_count = len(participant_count_result.all())
-    
-    return LectureRead(
-        **lecture.model_dump(), 
-        instructor_name=current_user.username,
-        participant_count=participant_count
-    )
+    return _lecture_read(lecture, current_user.username)
 
 
 @router.post("/{lecture_id}/join")
@@ -180,23 +160,17 @@ async def join_lecture(
         # 이미 참석 중이면 성공 메시지 반환 (에러가 아닌 정상 처리)
         return {"message": "이미 참석 중인 강의입니다."}
     
-    # 최대 참석자 수 확인 (강사는 제외)
-    if current_user.id != lecture.instructor_id:
-        active_participants_result = await db.exec(
-            select(LectureParticipant).where(
-                LectureParticipant.lecture_id == lecture_id,
-                LectureParticipant.is_active == True
-            )
+    # 최대 참석자 수 확인 (강사는 제외) - 정원 검사와 증가를 조건부 UPDATE 한 문장으로 판정
+    enforce_capacity = current_user.id != lecture.instructor_id
+    participant_count = await increment_participant_count(db, lecture_id, enforce_capacity)
+    if participant_count is None:
+        await db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="강의 정원이 초과되었습니다."
         )
-        active_participants = active_participants_result.all()
-        
-        if len(active_participants) >= lecture.max_participants:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="강의 정원이 초과되었습니다."
-            )
     
-    # 참석 등록
+    # 참석 등록 (카운터 증가와 같은 트랜잭션)
     participant = LectureParticipant(
         lecture_id=lecture_id,
         student_id=current_user.id,
@@ -204,6 +178,8 @@ async def join_lecture(
     )
     db.add(participant)
     await db.commit()
+    participant_counter.set(lecture_id, participant_count)
+    await response_cache.invalidate(LECTURE_LIST)
     
     return {"message": "강의에 성공적으로 참석했습니다."}
 
@@ -230,10 +206,12 @@ async def leave_lecture(
             detail="참석 중인 강의가 아닙니다."
         )
     
-    participant.is_active = False
-    participant.left_at = datetime.utcnow()
-    db.add(participant)
-    await db.commit()
+    # 동시 퇴장 요청이 카운터를 두 번 줄이지 않도록 실제로 비활성화한 경우에만 감소
+    if await deactivate_participant(db, participant.id, datetime.utcnow()):
+        participant_count = await decrement_participant_count(db, lecture_id)
+        await db.commit()
+        participant_counter.set(lecture_id, participant_count)
+        await response_cache.invalidate(LECTURE_LIST)
     
     return {"message": "강의에서 나갔습니다."}
 
@@ -262,6 +240,7 @@ async def start_lecture(
     lecture.actual_start = datetime.utcnow()
     db.add(lecture)
     await db.commit()
+    await response_cache.invalidate(LECTURE_LIST)
     
     return {"message": "강의가 시작되었습니다."}
 
@@ -290,5 +269,58 @@ async def end_lecture(
     lecture.actual_end = datetime.utcnow()
     db.add(lecture)
     await db.commit()
+    await response_cache.invalidate(LECTURE_LIST)
     
     return {"message": "강의가 종료되었습니다."}
+
+
+EXPORT_SOURCES = {
+    "chat": (ChatMessage, CHAT_EXPORT_COLUMNS),
+    "captions": (LectureCaption, CAPTION_EXPORT_COLUMNS)
+}
+
+
+@router.get("/{lecture_id}/export/{kind}")
+async def export_lecture_log(
+    lecture_id: int,
+    kind: str,
+    format: str = Query("ndjson"),
+    gzip: bool = Query(False),
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """강의 채팅/자막 로그 내보내기 (강사만 가능) - NDJSON/CSV 스트리밍, 선택적 gzip"""
+    if kind not in EXPORT_SOURCES:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="지원하지 않는 내보내기 항목입니다. (chat, captions)"
+        )
+    if format not in EXPORT_FORMATS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="지원하지 않는 형식입니다. (ndjson, csv)"
+        )
+    
+    lecture = await db.get(Lecture, lecture_id)
+    if not lecture:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="강의를 찾을 수 없습니다."
+        )
+    
+    if lecture.instructor_id != current_user.id:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="본인이 개설한 강의의 기록만 내보낼 수 있습니다."
+        )
+    
+    # 권한 확인에 쓴 세션은 스트리밍 동안 읽기 트랜잭션을 잡지 않도록 먼저 반환
+    await db.close()
+    
+    model, columns = EXPORT_SOURCES[kind]
+    filename = f"lecture-{lecture_id}-{kind}.{format}" + (".gz" if gzip else "")
+    return StreamingResponse(
+        stream_export(model, lecture_id, columns, format, compress=gzip),
+        media_type="application/gzip" if gzip else EXPORT_FORMATS[format],
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'}
+    )
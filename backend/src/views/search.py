@@ -0,0 +1,50 @@
+from fastapi import APIRouter, Depends, HTTPException, status, Query
+from typing import Optional
+import time
+
+from src.core.settings import settings
+from src.services.auth import get_current_user
+from src.services.search_index import search_indexer, SEARCH_SOURCES
+
+router = APIRouter(
+    prefix="/search",
+    tags=["검색"],
+    responses={401: {"description": "인증되지 않음"}}
+)
+
+# 자막/실시간 자막/채팅 통합 검색
+@router.get("/")
+async def search(
+    q: str = Query(..., min_length=1),
+    source: Optional[str] = Query(None),
+    video_id: Optional[int] = Query(None),
+    lecture_id: Optional[int] = Query(None),
+    language: Optional[str] = Query(None),
+    limit: int = Query(20, ge=1),
+    current_user = Depends(get_current_user)
+):
+    """
+    강의 자막, 실시간 자막, 채팅을 전문 검색합니다. (bm25 순위, 스니펫과 세그먼트 시간 포함)
+    공개 영상과 내 영상, 내가 강사이거나 참석한 강의의 결과만 반환합니다.
+    """
+    if not search_indexer.available:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="검색 색인을 사용할 수 없습니다."
+        )
+    if source is not None and source not in SEARCH_SOURCES:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"지원하지 않는 검색 대상입니다. ({', '.join(SEARCH_SOURCES)})"
+        )
+
+    search_start = time.perf_counter()
+    hits = await search_indexer.search(
+        q, current_user.id, source=source, video_id=video_id, lecture_id=lecture_id, language=language,
+        limit=min(limit, settings.search_max_limit)
+    )
+    return {
+        "query": q,
+        "hits": hits,
+        "took_ms": round((time.perf_counter() - search_start) * 1000, 2)
+    }
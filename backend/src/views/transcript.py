@@ -1,22 +1,24 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query, BackgroundTasks
-from sqlmodel import Session, select
+from fastapi import APIRouter, Depends, HTTPException, status, Query, BackgroundTasks, Request
+from sqlmodel.ext.asyncio.session import AsyncSession
 from typing import List, Dict
 from fastapi.responses import JSONResponse
 import os
-import json
 
-from src.db.database import get_db
-from src.models.video import Video
-from src.models.transcript import Transcript
+from src.core.settings import settings
+from src.db.database import get_db, session_scope
 from src.controllers.media_controller import (
     process_video_transcript, 
     translate_video_transcript,
-    generate_audio_from_transcript
+    generate_audio_from_transcript,
+    run_media_task
 )
 from src.controllers.transcript_controller import get_video_transcripts
+from src.repositories.videos import get_video
+from src.repositories.transcripts import get_transcript
 from src.services.auth import get_current_user
+from src.services.response_cache import SUPPORTED_LANGUAGES, response_cache
 from src.services.tts_service import get_supported_languages
-from src.utils.filesystem import get_transcript_path
+from src.utils.filesystem import get_transcript_path, read_json
 
 router = APIRouter(
     prefix="/transcripts",
@@ -28,7 +30,7 @@ router = APIRouter(
 @router.get("/{video_id}/all")
 async def get_transcripts(
     video_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user = Depends(get_current_user)
 ):
     """
@@ -41,11 +43,11 @@ async def get_transcripts(
 async def create_ko_transcript(
     video_id: int,
     background_tasks: BackgroundTasks,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user = Depends(get_current_user)
 ):
     # 비동기 작업으로 자막 생성
-    background_tasks.add_task(process_video_transcript, db, video_id, "ko")
+    background_tasks.add_task(run_media_task, process_video_transcript, video_id, "ko")
     
     return {"message": "자막 생성 작업이 시작되었습니다."}
 
@@ -55,7 +57,7 @@ async def translate_transcript(
     video_id: int,
     target_lang: str,
     background_tasks: BackgroundTasks,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user = Depends(get_current_user)
 ):
     # 번역 지원 언어 확인
@@ -67,7 +69,7 @@ async def translate_transcript(
         )
     
     # 비동기 작업으로 자막 번역
-    background_tasks.add_task(translate_video_transcript, db, video_id, "ko", target_lang)
+    background_tasks.add_task(run_media_task, translate_video_transcript, video_id, "ko", target_lang)
     
     return {"message": f"{supported_langs[target_lang]}로 자막 번역 작업이 시작되었습니다."}
 
@@ -77,7 +79,7 @@ async def generate_tts(
     video_id: int,
     language: str,
     background_tasks: BackgroundTasks,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user = Depends(get_current_user)
 ):
     # TTS 지원 언어 확인
@@ -89,17 +91,22 @@ async def generate_tts(
         )
     
     # 비동기 작업으로 TTS 생성
-    background_tasks.add_task(generate_audio_from_transcript, db, video_id, language)
+    background_tasks.add_task(run_media_task, generate_audio_from_transcript, video_id, language)
     
     return {"message": f"{supported_langs[language]} 음성 생성 작업이 시작되었습니다."}
 
 # 지원 언어 목록 조회
 @router.get("/languages")
-async def list_supported_languages():
+async def list_supported_languages(request: Request):
     """
     지원하는 언어 목록을 반환합니다.
     """
-    return get_supported_languages()
+    async def build():
+        return get_supported_languages()
+
+    return await response_cache.respond(
+        request, SUPPORTED_LANGUAGES, "transcripts", build, ttl=settings.response_cache_static_ttl
+    )
 
 # 자막/음성 처리 원스톱 API (모든 처리를 한 번에 수행)
 @router.post("/{video_id}/process/{target_lang}")
@@ -107,7 +114,7 @@ async def process_transcript_and_audio(
     video_id: int,
     target_lang: str,
     background_tasks: BackgroundTasks,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user = Depends(get_current_user)
 ):
     """
@@ -126,7 +133,7 @@ async def process_transcript_and_audio(
         )
     
     # 비디오 확인
-    video = db.get(Video, video_id)
+    video = await get_video(db, video_id)
     if not video:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -140,19 +147,20 @@ async def process_transcript_and_audio(
             detail="이 비디오의 소유자만 처리할 수 있습니다."
         )
     
-    # 비동기 작업 등록
+    # 비동기 작업 등록 (요청 세션은 응답 후 닫히므로 작업 전용 세션 사용)
     async def process_all():
-        # 1. 원본 자막 생성
-        ko_transcript = await process_video_transcript(db, video_id, "ko")
-        
-        # 2. 대상 언어로 자막 번역
-        translated_transcript = await translate_video_transcript(db, video_id, "ko", target_lang)
-        
-        # 3. 원본 음성 생성 (추가적으로 원하는 경우)
-        # await generate_audio_from_transcript(db, video_id, "ko")
-        
-        # 4. 번역 음성 생성
-        await generate_audio_from_transcript(db, video_id, target_lang)
+        async with session_scope() as task_db:
+            # 1. 원본 자막 생성
+            ko_transcript = await process_video_transcript(task_db, video_id, "ko")
+            
+            # 2. 대상 언어로 자막 번역
+            translated_transcript = await translate_video_transcript(task_db, video_id, "ko", target_lang)
+            
+            # 3. 원본 음성 생성 (추가적으로 원하는 경우)
+            # await generate_audio_from_transcript(task_db, video_id, "ko")
+            
+            # 4. 번역 음성 생성
+            await generate_audio_from_transcript(task_db, video_id, target_lang)
     
     background_tasks.add_task(process_all)
     
@@ -165,18 +173,14 @@ async def process_transcript_and_audio(
 async def get_transcript_by_language(
     video_id: int,
     language: str,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user = Depends(get_current_user)
 ):
     """
     특정 비디오의 특정 언어 자막을 조회합니다.
     """
     # 데이터베이스에서 자막 조회
-    statement = select(Transcript).where(
-        Transcript.video_id == video_id,
-        Transcript.language == language
-    )
-    transcript = db.exec(statement).first()
+    transcript = await get_transcript(db, video_id, language)
     
     # DB에 있고 처리 완료된 경우 반환
     if transcript and transcript.is_processed:
@@ -186,10 +190,7 @@ async def get_transcript_by_language(
     transcript_path = get_transcript_path(video_id, language)
     if os.path.exists(transcript_path):
         try:
-            with open(transcript_path, "r", encoding="utf-8") as f:
-                transcript_data = json.load(f)
-            
-            return transcript_data
+            return await read_json(transcript_path)
         except Exception as e:
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -1,18 +1,20 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query, BackgroundTasks
+from fastapi import APIRouter, Depends, HTTPException, status, Query, BackgroundTasks, Request
 from sqlmodel.ext.asyncio.session import AsyncSession
 from typing import List, Optional, Dict
-from sqlmodel import Session, select
-from sqlalchemy.orm import joinedload
 
 from src.db.database import get_db
-from src.models.video import VideoCreate, VideoRead, VideoReadDetailed, Video
+from src.models.video import VideoCreate, VideoRead, VideoReadDetailed
 from src.controllers.video_controller import (
     add_video, get_user_videos, get_video_detail, 
     get_available_videos, initialize_static_videos,
     update_video_visibility, update_video_processing_status
 )
-from src.controllers.media_controller import process_video_complete
+from src.controllers.media_controller import process_video_complete, run_media_task
+from src.repositories.common import save
+from src.repositories import videos as video_repository
+from src.core.settings import settings
 from src.services.auth import get_current_user
+from src.services.response_cache import AVAILABLE_VIDEOS, SUPPORTED_LANGUAGES, response_cache
 from src.services.tts_service import get_supported_languages
 from src import schemas
 
@@ -44,11 +46,30 @@ async def list_my_videos(
 # 학습 가능한 모든 영상 목록 조회 (인증 없이도 접근 가능)
 @router.get("/available", response_model=List[VideoRead])
 async def list_available_videos(
+    request: Request,
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=100),
     db: AsyncSession = Depends(get_db)
 ):
-    return await get_available_videos(db, skip, limit)
+    async def build():
+        videos = await get_available_videos(db, skip, limit)
+        return [VideoRead.model_validate(video).model_dump(mode="json") for video in videos]
+
+    # 영상 추가/공개 여부 변경/static 동기화 시 무효화
+    return await response_cache.respond(request, AVAILABLE_VIDEOS, f"{skip}:{limit}", build)
+
+# 사용 가능한 언어 목록 조회 (/{video_id}보다 먼저 등록해야 경로가 정수 변환에 걸리지 않음)
+@router.get("/languages", response_model=Dict[str, str])
+async def list_supported_languages(request: Request):
+    """
+    AI 처리에 지원되는 언어 목록을 반환합니다.
+    """
+    async def build():
+        return get_supported_languages()
+
+    return await response_cache.respond(
+        request, SUPPORTED_LANGUAGES, "videos", build, ttl=settings.response_cache_static_ttl
+    )
 
 # static 폴더의 영상 초기화 및 목록화 (관리자 전용)
 @router.post("/initialize-static", response_model=List[VideoRead])
@@ -85,11 +106,11 @@ async def process_video(
     video_id: int,
     target_language: Optional[str] = "ko",  # 기본 언어는 한국어
     background_tasks: BackgroundTasks = BackgroundTasks(),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user = Depends(get_current_user)
 ):
     # 영상 존재 및 소유자 확인
-    video = db.get(Video, video_id)
+    video = await video_repository.get_video(db, video_id)
     if not video:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -116,11 +137,10 @@ async def process_video(
     
     # 처리 상태 초기화
     video.processing_error = None
-    db.add(video)
-    db.commit()
+    await save(db, video)
     
-    # 백그라운드에서 AI 처리 시작
-    background_tasks.add_task(process_video_complete, db, video_id, target_language)
+    # 백그라운드에서 AI 처리 시작 (요청 세션은 응답 후 닫히므로 작업 전용 세션 사용)
+    background_tasks.add_task(run_media_task, process_video_complete, video_id, target_language)
     
     return {"status": "processing", "message": f"비디오 처리가 시작되었습니다. 대상 언어: {supported_langs[target_language]}"}
 
@@ -129,26 +149,17 @@ async def process_video(
 async def get_video_status(
     video_id: int,
     language: Optional[str] = None,  # 특정 언어 상태만 확인하고 싶을 때
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user = Depends(get_current_user)
 ):
-    # 영상 존재 및 소유자 확인
-    video = db.get(Video, video_id)
-    if not video:
+    # 영상 존재 확인 (자막/오디오 관계를 함께 로드)
+    video_with_relations = await video_repository.get_video_with_media(db, video_id)
+    if not video_with_relations:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="비디오를 찾을 수 없습니다."
         )
-    
-    # 관계 로드를 위한 쿼리
-    video_with_relations = db.exec(
-        select(Video)
-        .where(Video.id == video_id)
-        .options(
-            joinedload(Video.transcripts),
-            joinedload(Video.audios)
-        )
-    ).first()
+    video = video_with_relations
     
     # 특정 언어의 상태만 확인할 경우
     if language:
@@ -184,11 +195,3 @@ async def get_video_status(
         "has_tts": any(a.is_processed for a in video_with_relations.audios),
         "languages": language_statuses
     }
-
-# 사용 가능한 언어 목록 조회
-@router.get("/languages", response_model=Dict[str, str])
-async def list_supported_languages():
-    """
-    AI 처리에 지원되는 언어 목록을 반환합니다.
-    """
-    return get_supported_languages() 
\ No newline at end of file
@@ -10,11 +10,27 @@ import asyncio
 from scipy.signal import resample
 from datetime import datetime
 from sqlmodel import Session, select
-from ..db.database import get_db
-from ..models.user import User
+from ..db.database import get_read_db
 from ..models.lecture import Lecture, LectureParticipant
 from ..models.chat import ChatMessage
-from ..services.auth import decode_token
+from ..repositories.lectures import get_lecture_capacity, is_lecture_participant
+from ..services.auth import decode_token, get_current_user, principal_cache
+from ..services.ws_codec import (
+    event_encoder, negotiate_encoding, is_deflate_offered, send_payload, encoding_ack, JSON_ENCODING
+)
+from ..services.heartbeat import heartbeat_scheduler
+from ..services.replay_buffer import replay_buffer
+from ..services.outbox import PriorityOutbox, outbox_stats, lane_for, SIGNALING_LANE
+from ..services.sharding import shard_router, WRONG_SHARD_CLOSE_CODE
+from ..services.chat_persister import chat_persister
+from ..services.caption_persister import caption_persister
+from ..services.chat_history import chat_tail_cache, serialize_chat_row
+from ..services.participant_counter import participant_counter
+from ..services.rate_limit import (
+    chat_rate_limiter, stt_rate_limiter, admission_controller, reject_connection, OVERSIZED
+)
+from ..core.settings import settings
+from sqlalchemy import or_
 from sqlalchemy.ext.asyncio import AsyncSession
 
 # STT 관련 import 추가
@@ -34,8 +50,37 @@ class ConnectionManager:
         self.connection_info: Dict[WebSocket, Dict] = {}
         # 연결 메트릭 추적
         self.connection_metrics = {}
+        # 강의별 참가자 집합 (user_id -> 참가자 정보)과 버전
+        self.participants: Dict[int, Dict[int, Dict]] = {}
+        self.participant_versions: Dict[int, int] = {}
+        # 연결별 우선순위 송신 큐
+        self.outboxes: Dict[WebSocket, PriorityOutbox] = {}
 
-    async def connect(self, websocket: WebSocket, lecture_id: int, user_id: int, username: str):
+    def _participant_delta(self, lecture_id: int, op: str, participant: Dict) -> Dict:
+        """참가자 집합 변경을 반영하고 버전이 붙은 delta 메시지 생성"""
+        version = self.participant_versions.get(lecture_id, 0) + 1
+        self.participant_versions[lecture_id] = version
+        return {
+            "type": "participants_delta",
+            "op": op,
+            "participant": participant,
+            "version": version,
+            "timestamp": datetime.now().isoformat()
+        }
+
+    def get_participant_snapshot(self, lecture_id: int, user_id: int = None) -> Dict:
+        """현재 참가자 전체 목록과 버전 (입장 시 또는 클라이언트가 버전 누락을 감지했을 때)"""
+        return {
+            "type": "participants_snapshot",
+            "participants": list(self.participants.get(lecture_id, {}).values()),
+            "version": self.participant_versions.get(lecture_id, 0),
+            "currentUserId": user_id,
+            "timestamp": datetime.now().isoformat()
+        }
+
+    async def connect(self, websocket: WebSocket, lecture_id: int, user_id: int, username: str,
+                      encoding: str = JSON_ENCODING, deflate: bool = False, send_ack: bool = False):
+        """연결 등록 - send_ack이면 인코딩 협상 결과를 송신 큐의 첫 메시지로 등록"""
         start_time = time.time()
         await websocket.accept()
         
@@ -64,8 +109,28 @@ class ConnectionManager:
             "user_id": user_id,
             "username": username,
             "connected_at": datetime.now().isoformat(),
-            "message_count": 0
+            "message_count": 0,
+            "encoding": encoding,
+            "deflate": deflate
         }
+        # 소켓 쓰기는 송신 큐의 writer 태스크만 하도록 ping도 큐로 보냄
+        outbox = PriorityOutbox(websocket, self.disconnect)
+        self.outboxes[websocket] = outbox
+        if send_ack:
+            outbox.put(encoding_ack(encoding, deflate), SIGNALING_LANE)
+        heartbeat_scheduler.register(websocket, self.disconnect, encoding,
+                                     send=lambda payload: outbox.put(payload, SIGNALING_LANE))
+        
+        participant = {"user_id": user_id, "username": username, "connected_at": self.connection_info[websocket]["connected_at"]}
+        self.participants.setdefault(lecture_id, {})[user_id] = participant
+        # 버전 부여와 송신 큐 등록을 await 없이 한 번에 처리 (다른 입장/퇴장 delta와 순서가 뒤바뀌지 않도록)
+        # 입장한 사용자에게는 전체 목록, 나머지에게는 버전이 붙은 delta만 전송
+        join_delta = self._participant_delta(lecture_id, "join", participant)
+        snapshot = self.get_participant_snapshot(lecture_id, user_id)
+        outbox.put(event_encoder.encode(snapshot, encoding), lane_for(snapshot))
+        self._enqueue_broadcast(join_delta, lecture_id, exclude=websocket)
+        logger.info(f"👥 [채팅] 참가자 delta 브로드캐스트 - lecture_id: {lecture_id}, "
+                   f"참가자 수: {len(snapshot['participants'])}, version: {join_delta['version']}")
         
         # 연결 메트릭 업데이트
         if lecture_id not in self.connection_metrics:
@@ -78,6 +143,7 @@ class ConnectionManager:
                    f"연결 시간: {connection_time:.3f}s, 현재 참가자 수: {len(self.active_connections[lecture_id])}")
 
     def disconnect(self, websocket: WebSocket):
+        """연결 해제 - 해제된 연결 정보 반환 (이미 해제된 경우 None)"""
         connection_info = self.connection_info.get(websocket)
         if connection_info:
             lecture_id = connection_info["lecture_id"]
@@ -97,6 +163,7 @@ class ConnectionManager:
                     del self.active_connections[lecture_id]
                 else:
                     logger.info(f"📊 [채팅] 강의 {lecture_id} 남은 연결 수: {len(self.active_connections[lecture_id])}")
+            chat_rate_limiter.release(websocket, lecture_id, lecture_id not in self.active_connections)
             
             # 메트릭 업데이트
             if lecture_id in self.connection_metrics:
@@ -106,64 +173,97 @@ class ConnectionManager:
                     del self.connection_metrics[lecture_id]
             
             del self.connection_info[websocket]
+            
+            # 참가자 집합에서 제거하고 leave delta 전송
+            lecture_participants = self.participants.get(lecture_id, {})
+            participant = lecture_participants.pop(user_id, None)
+            if not lecture_participants:
+                self.participants.pop(lecture_id, None)
+                self.participant_versions.pop(lecture_id, None)
+            elif participant:
+                # 버전 부여와 같은 동기 구간에서 큐에 등록
+                self._enqueue_broadcast(self._participant_delta(lecture_id, "leave", participant), lecture_id)
+        heartbeat_scheduler.unregister(websocket)
+        outbox = self.outboxes.pop(websocket, None)
+        if outbox:
+            outbox.close()
+        return connection_info
 
-    async def send_personal_message(self, message: str, websocket: WebSocket):
-        try:
-            await websocket.send_text(message)
+    def _enqueue(self, websocket: WebSocket, payload, lane: int) -> bool:
+        """연결의 송신 큐에 추가 (실제 전송은 writer 태스크가 우선순위대로 처리)"""
+        outbox = self.outboxes.get(websocket)
+        if outbox is None:
+            return False
+        outbox.put(payload, lane)
+        return True
+
+    async def send_personal_message(self, message: dict, websocket: WebSocket):
+        info = self.connection_info.get(websocket, {})
+        payload = event_encoder.encode(message, info.get("encoding", JSON_ENCODING))
+        if self._enqueue(websocket, payload, lane_for(message)):
             # 개인 메시지 로깅 (민감한 정보 제외)
-            logger.debug(f"📤 [채팅] 개인 메시지 전송 성공 - 길이: {len(message)} chars")
-        except Exception as e:
-            logger.error(f"❌ [채팅] 개인 메시지 전송 실패 - error: {e}")
-            self.disconnect(websocket)
+            logger.debug(f"📤 [채팅] 개인 메시지 큐 등록 - 길이: {len(payload)} bytes")
+        else:
+            logger.warning(f"⚠️ [채팅] 개인 메시지 전송 대상 없음 - type: {message.get('type')}")
 
-    async def send_to_user(self, message: str, user_id: int, lecture_id: int):
+    async def send_to_user(self, message: dict, user_id: int, lecture_id: int):
         """특정 사용자에게 메시지 전송"""
         if lecture_id in self.active_connections:
             for websocket in self.active_connections[lecture_id]:
                 if websocket in self.connection_info:
                     info = self.connection_info[websocket]
                     if info["user_id"] == user_id and info["lecture_id"] == lecture_id:
-                        try:
-                            await websocket.send_text(message)
-                            logger.info(f"📧 [채팅] 개별 메시지 전송 성공 - user_id: {user_id}, lecture_id: {lecture_id}")
+                        payload = event_encoder.encode(message, info["encoding"])
+                        if self._enqueue(websocket, payload, lane_for(message)):
+                            logger.info(f"📧 [채팅] 개별 메시지 큐 등록 - user_id: {user_id}, lecture_id: {lecture_id}")
                             return True
-                        except Exception as e:
-                            logger.error(f"❌ [채팅] 개별 메시지 전송 실패 - user_id: {user_id}, error: {e}")
-                            # 연결이 끊어진 경우 정리
-                            self.disconnect(websocket)
-                            return False
+                        return False
         logger.warning(f"⚠️ [채팅] 사용자를 찾을 수 없음 - user_id: {user_id}, lecture_id: {lecture_id}")
         return False
 
-    async def broadcast_to_lecture(self, message: str, lecture_id: int):
-        """특정 강의실의 모든 사용자에게 메시지 브로드캐스트"""
+    async def broadcast_to_lecture(self, message: dict, lecture_id: int):
+        """특정 강의실의 모든 사용자에게 메시지 브로드캐스트 (연결별 송신 큐에 등록)"""
+        self._enqueue_broadcast(message, lecture_id)
+
+    def _enqueue_broadcast(self, message: dict, lecture_id: int, exclude: WebSocket = None):
+        """브로드캐스트를 송신 큐에 등록 - await 없이 끝나므로 동기 경로(disconnect)에서도 바로 호출"""
         start_time = time.time()
         if lecture_id not in self.active_connections:
             logger.warning(f"⚠️ [채팅] 브로드캐스트 대상 없음 - lecture_id: {lecture_id}")
             return
         
-        connections = self.active_connections[lecture_id].copy()
-        success_count = 0
-        fail_count = 0
+        connections = [websocket for websocket in self.active_connections[lecture_id] if websocket is not exclude]
+        lane = lane_for(message)
+        queued_count = 0
+        
+        # 인코딩별로 한 번만 직렬화
+        payloads = event_encoder.encode_for(message, (
+            self.connection_info[websocket]["encoding"]
+            for websocket in connections if websocket in self.connection_info
+        ))
         
         logger.info(f"📢 [채팅] 브로드캐스트 시작 - lecture_id: {lecture_id}, 대상: {len(connections)}명")
         
         for websocket in connections:
-            try:
-                await websocket.send_text(message)
-                success_count += 1
+            info = self.connection_info.get(websocket)
+            if info is None:
+                continue
+            if self._enqueue(websocket, payloads[info["encoding"]], lane):
+                queued_count += 1
                 # 메시지 카운트 업데이트
-                if websocket in self.connection_info:
-                    self.connection_info[websocket]["message_count"] += 1
-            except Exception as e:
-                fail_count += 1
-                logger.error(f"❌ [채팅] 브로드캐스트 개별 전송 실패 - error: {e}")
-                # 연결이 끊어진 경우 정리
-                self.disconnect(websocket)
+                info["message_count"] += 1
         
         broadcast_time = time.time() - start_time
         logger.info(f"✅ [채팅] 브로드캐스트 완료 - lecture_id: {lecture_id}, "
-                   f"성공: {success_count}, 실패: {fail_count}, 소요시간: {broadcast_time:.3f}s")
+                   f"큐 등록: {queued_count}, 소요시간: {broadcast_time:.3f}s")
+
+    def get_user_ids(self, lecture_id: int) -> set:
+        """특정 강의에 현재 연결된 사용자 ID 집합 (입장 제어용)"""
+        return {
+            self.connection_info[websocket]["user_id"]
+            for websocket in self.active_connections.get(lecture_id, [])
+            if websocket in self.connection_info
+        }
 
     def get_participants(self, lecture_id: int) -> List[Dict]:
         """특정 강의의 참가자 목록 반환"""
@@ -190,7 +290,19 @@ class ConnectionManager:
         stats = {
             "total_connections": total_connections,
             "active_lectures": active_lectures,
-            "lecture_details": {}
+            "lecture_details": {},
+            "encoding_stats": event_encoder.get_stats(),
+            "heartbeat": heartbeat_scheduler.get_stats(),
+            "replay": replay_buffer.get_stats(),
+            "outbox": outbox_stats.get_stats(),
+            "sharding": shard_router.get_stats(),
+            "persistence": chat_persister.get_stats(),
+            "caption_persistence": caption_persister.get_stats(),
+            "history_cache": chat_tail_cache.get_stats(),
+            "rate_limit": chat_rate_limiter.get_stats(),
+            "admission": admission_controller.get_stats(),
+            "principal_cache": principal_cache.get_stats(),
+            "participant_counter": participant_counter.get_stats()
         }
         
         for lecture_id, connections in self.active_connections.items():
@@ -233,12 +345,15 @@ class STTConnectionManager:
             "lecture_id": lecture_id,
             "user_id": user_id,
             "username": username,
-            "connected_at": datetime.now().isoformat()
+            "connected_at": datetime.now().isoformat(),
+            "encoding": JSON_ENCODING
         }
+        heartbeat_scheduler.register(websocket, self.disconnect)
         
         logger.info(f"✅ [STT] WebSocket 연결 완료 - lecture_id: {lecture_id}, user_id: {user_id}")
 
-    async def connect_without_accept(self, websocket: WebSocket, lecture_id: int, user_id: int, username: str):
+    async def connect_without_accept(self, websocket: WebSocket, lecture_id: int, user_id: int, username: str,
+                                     encoding: str = JSON_ENCODING):
         """WebSocket.accept() 호출 없이 연결 관리 (이미 accept된 연결에 사용)"""
         logger.info(f"🎙️ [STT] WebSocket 연결 관리 - lecture_id: {lecture_id}, user_id: {user_id}, username: {username}")
         
@@ -252,8 +367,10 @@ class STTConnectionManager:
             "lecture_id": lecture_id,
             "user_id": user_id,
             "username": username,
-            "connected_at": datetime.now().isoformat()
+            "connected_at": datetime.now().isoformat(),
+            "encoding": encoding
         }
+        heartbeat_scheduler.register(websocket, self.disconnect, encoding)
         
         logger.info(f"✅ [STT] WebSocket 연결 추적 완료 - lecture_id: {lecture_id}, user_id: {user_id}")
 
@@ -275,8 +392,18 @@ class STTConnectionManager:
                     logger.info(f"📝 [STT] 강의 {lecture_id}의 모든 연결이 종료됨 - STT 레코더 정리")
                     self.cleanup_stt_recorder(lecture_id)
                     del self.active_connections[lecture_id]
+            stt_rate_limiter.release(websocket, lecture_id, lecture_id not in self.active_connections)
             
             del self.connection_info[websocket]
+        heartbeat_scheduler.unregister(websocket)
+
+    def get_user_ids(self, lecture_id: int) -> set:
+        """특정 강의에 현재 연결된 STT 사용자 ID 집합 (입장 제어용)"""
+        return {
+            self.connection_info[websocket]["user_id"]
+            for websocket in self.active_connections.get(lecture_id, [])
+            if websocket in self.connection_info
+        }
 
     async def initialize_stt_recorder(self, lecture_id: int):
         """강의별 STT 레코더 초기화"""
@@ -374,18 +501,20 @@ class STTConnectionManager:
         """실시간 텍스트 콜백"""
         if self.main_loop:
             asyncio.run_coroutine_threadsafe(
-                self.broadcast_to_lecture(json.dumps({
+                self.broadcast_to_lecture({
                     'type': 'realtime',
                     'text': text
-                }), lecture_id),
+                }, lecture_id),
                 self.main_loop
             )
 
     async def on_full_sentence(self, lecture_id: int, text: str):
         """완성된 문장 콜백"""
-        await self.broadcast_to_lecture(json.dumps({
+        caption_persister.enqueue(lecture_id, text)
+        await self.broadcast_to_lecture(replay_buffer.append(lecture_id, {
             'type': 'fullSentence',
-            'text': text
+            'text': text,
+            'timestamp': datetime.now().isoformat()
         }), lecture_id)
         logger.info(f"📝 [STT] 강의 {lecture_id} 완성된 문장: {text}")
 
@@ -438,7 +567,7 @@ class STTConnectionManager:
             logger.error(f"❌ [STT] 오디오 리샘플링 오류: {e}")
             return audio_data
 
-    async def broadcast_to_lecture(self, message: str, lecture_id: int):
+    async def broadcast_to_lecture(self, message: dict, lecture_id: int):
         """특정 강의실의 모든 사용자에게 메시지 브로드캐스트"""
         if lecture_id not in self.active_connections:
             return
@@ -447,9 +576,17 @@ class STTConnectionManager:
         success_count = 0
         fail_count = 0
         
+        # 인코딩별로 한 번만 직렬화
+        payloads = event_encoder.encode_for(message, (
+            self.connection_info[websocket]["encoding"]
+            for websocket in connections if websocket in self.connection_info
+        ))
+        
         for websocket in connections:
             try:
-                await websocket.send_text(message)
+                encoding = self.connection_info.get(websocket, {}).get("encoding", JSON_ENCODING)
+                payload = payloads.get(encoding) or event_encoder.encode(message, encoding)
+                await send_payload(websocket, payload)
                 success_count += 1
             except Exception as e:
                 fail_count += 1
@@ -462,7 +599,18 @@ class STTConnectionManager:
 stt_manager = STTConnectionManager()
 
 @router.websocket("/ws/chat/{lecture_id}")
-async def websocket_endpoint(websocket: WebSocket, lecture_id: int, token: str = Query(None)):
+async def websocket_endpoint(
+    websocket: WebSocket,
+    lecture_id: int,
+    token: str = Query(None),
+    encoding: str = Query(None),
+    since: int = Query(None)
+):
+    # 다른 샤드 소유 강의는 거부 (프론트 리스너가 경로로 소유 샤드에 넘기므로 보통은 일어나지 않음)
+    if not shard_router.owns(lecture_id):
+        await reject_connection(websocket, WRONG_SHARD_CLOSE_CODE, shard_router.wrong_shard_reason(lecture_id))
+        return
+    
     # 쿼리 파라미터에서 토큰 가져오기 (수동으로)
     query_string = str(websocket.url.query)
     logger.info(f"🚀 [채팅] WebSocket 연결 시도 - lecture_id: {lecture_id}")
@@ -507,25 +655,34 @@ async def websocket_endpoint(websocket: WebSocket, lecture_id: int, token: str =
     
     try:
         
-        # 사용자 정보 확인 (역할 포함) - 토큰이 있는 경우만
+        # 사용자 정보 확인 (역할 포함) - 토큰이 있는 경우만, 재접속 폭주에 대비해 캐시 사용
         if token and user_id != 999:
-            from sqlmodel import select
-            from ..db.database import get_db
-            
-            # 실제 사용자 조회
-            async for db in get_db():
-                statement = select(User).where(User.id == user_id)
-                result = await db.exec(statement)
-                user = result.first()
-                if user:
-                    logger.info(f"✅ [채팅] WebSocket 연결 성공 - user_id: {user_id}, username: {username}, role: {user.role}, lecture_id: {lecture_id}")
-                else:
-                    logger.warning(f"⚠️ [채팅] WebSocket 연결 성공 - user_id: {user_id}, username: {username}, role: 알 수 없음, lecture_id: {lecture_id}")
-                break
+            user = await principal_cache.get(user_id)
+            if user:
+                logger.info(f"✅ [채팅] WebSocket 연결 성공 - user_id: {user_id}, username: {username}, role: {user.role}, lecture_id: {lecture_id}")
+            else:
+                logger.warning(f"⚠️ [채팅] WebSocket 연결 성공 - user_id: {user_id}, username: {username}, role: 알 수 없음, lecture_id: {lecture_id}")
         else:
             logger.info(f"🧪 [채팅] WebSocket 연결 성공 (테스트 모드) - user_id: {user_id}, username: {username}, lecture_id: {lecture_id}")
         
-        await manager.connect(websocket, lecture_id, user_id, username)
+        # 라이브 레지스트리 기준 정원 확인
+        rejection = await admission_controller.admit(lecture_id, user_id, lambda: manager.get_user_ids(lecture_id))
+        if rejection:
+            await reject_connection(websocket, 1013, rejection)
+            return
+        
+        # 인코딩 및 permessage-deflate 협상
+        negotiated_encoding = negotiate_encoding(encoding)
+        deflate = settings.ws_per_message_deflate and is_deflate_offered(websocket)
+        
+        # 레지스트리에 등록되면(또는 실패하면) 예약한 자리 해제
+        try:
+            await manager.connect(websocket, lecture_id, user_id, username, negotiated_encoding, deflate,
+                                  send_ack=bool(encoding))
+        finally:
+            admission_controller.release(lecture_id, user_id)
+        if encoding:
+            logger.info(f"🗜️ [채팅] 인코딩 협상 완료 - user_id: {user_id}, encoding: {negotiated_encoding}, deflate: {deflate}")
         
         # 입장 메시지 브로드캐스트
         join_message = {
@@ -535,29 +692,46 @@ async def websocket_endpoint(websocket: WebSocket, lecture_id: int, token: str =
             "timestamp": datetime.now().isoformat()
         }
         logger.info(f"📢 [채팅] 입장 메시지 브로드캐스트: username={username}, lecture_id={lecture_id}")
-        await manager.broadcast_to_lecture(json.dumps(join_message), lecture_id)
-        
-        # 참가자 목록 브로드캐스트
-        participants = manager.get_participants(lecture_id)
-        participants_message = {
-            "type": "participants_update",
-            "participants": participants,
-            "currentUserId": user_id,  # 현재 사용자 ID 추가
-            "timestamp": datetime.now().isoformat()
-        }
-        logger.info(f"👥 [채팅] 참가자 목록 브로드캐스트 - lecture_id: {lecture_id}, 참가자 수: {len(participants)}")
-        await manager.broadcast_to_lecture(json.dumps(participants_message), lecture_id)
+        await manager.broadcast_to_lecture(join_message, lecture_id)
+        
+        # 최근 자막/채팅을 한 프레임으로 전송 (since 이후만, DB 조회 없음)
+        replay = replay_buffer.replay_frame(lecture_id, since)
+        await manager.send_personal_message(replay, websocket)
+        logger.info(f"⏪ [채팅] 리플레이 전송 - user_id: {user_id}, since: {since}, "
+                   f"이벤트: {len(replay['events'])}개, last_seq: {replay['last_seq']}")
         
         while True:
             # 클라이언트로부터 메시지 수신
             data = await websocket.receive_text()
+            heartbeat_scheduler.touch(websocket)
+            
+            # JSON 파싱 전에 크기 제한
+            if chat_rate_limiter.check_size(len(data)) == OVERSIZED:
+                logger.warning(f"🚫 [채팅] 너무 큰 메시지로 연결 종료 - user_id: {user_id}, 크기: {len(data)}")
+                manager.disconnect(websocket)
+                await websocket.close(code=1009, reason="메시지가 너무 큽니다")
+                break
+            
             message_data = json.loads(data)
             
             message_type = message_data.get("type", "unknown")
+            if message_type == "pong":
+                continue
+            
+            # 브로드캐스트되는 메시지만 속도 제한 (시그널링은 그대로 통과)
+            throttled = chat_rate_limiter.check_type(websocket, lecture_id, message_type)
+            if throttled:
+                logger.debug(f"⏳ [채팅] 메시지 속도 제한 - user_id: {user_id}, type: {message_type}, 범위: {throttled}")
+                continue
             logger.info(f"📥 [채팅] 메시지 수신 - user_id: {user_id}, type: {message_type}, lecture_id: {lecture_id}")
             
             # 메시지 타입 처리
-            if message_data.get("type") == "chat_message":
+            if message_type == "participants_snapshot":
+                # 클라이언트가 버전 누락을 감지하면 전체 목록 재요청
+                logger.info(f"🔁 [채팅] 참가자 스냅샷 요청 - user_id: {user_id}, lecture_id: {lecture_id}")
+                await manager.send_personal_message(manager.get_participant_snapshot(lecture_id, user_id), websocket)
+                
+            elif message_data.get("type") == "chat_message":
                 chat_content = message_data.get("message", "")
                 is_private = message_data.get("is_private", False)
                 
@@ -573,8 +747,12 @@ async def websocket_endpoint(websocket: WebSocket, lecture_id: int, token: str =
                     "timestamp": datetime.now().isoformat()
                 }
                 
-                # 모든 강의 참가자에게 브로드캐스트
-                await manager.broadcast_to_lecture(json.dumps(chat_message), lecture_id)
+                # DB 저장은 write-behind 큐에 맡기고 바로 브로드캐스트 (테스트 사용자는 저장 안 함)
+                if user_id != 999:
+                    chat_persister.enqueue(lecture_id, user_id, username, chat_content, is_private)
+                
+                # 리플레이 버퍼에 기록 후 모든 강의 참가자에게 브로드캐스트
+                await manager.broadcast_to_lecture(replay_buffer.append(lecture_id, chat_message), lecture_id)
                 
             elif message_data.get("type") == "subtitle":
                 # STT 자막 메시지 처리
@@ -596,9 +774,15 @@ async def websocket_endpoint(websocket: WebSocket, lecture_id: int, token: str =
                     "timestamp": datetime.now().isoformat()
                 }
                 
+                # 테스트 사용자(토큰 없음)가 보낸 자막은 브로드캐스트만 하고 저장 안 함
+                if user_id != 999:
+                    caption_persister.enqueue(
+                        lecture_id, subtitle_text, subtitle_message["translatedText"], subtitle_message["language"]
+                    )
+                
                 logger.info(f"📢 [채팅] STT 자막 메시지 브로드캐스트 - 텍스트: '{subtitle_text[:50]}{'...' if len(subtitle_text) > 50 else ''}'")
-                # 모든 강의 참가자에게 브로드캐스트
-                await manager.broadcast_to_lecture(json.dumps(subtitle_message), lecture_id)
+                # 리플레이 버퍼에 기록 후 모든 강의 참가자에게 브로드캐스트
+                await manager.broadcast_to_lecture(replay_buffer.append(lecture_id, subtitle_message), lecture_id)
                 
             elif message_data.get("type") == "screen_share":
                 # 화면 공유 상태 변경 (기존 방식 유지)
@@ -613,7 +797,7 @@ async def websocket_endpoint(websocket: WebSocket, lecture_id: int, token: str =
                     "timestamp": datetime.now().isoformat()
                 }
                 logger.info(f"📢 [채팅] 화면공유 메시지 브로드캐스트: {screen_share_message}")
-                await manager.broadcast_to_lecture(json.dumps(screen_share_message), lecture_id)
+                await manager.broadcast_to_lecture(screen_share_message, lecture_id)
                 
             # WebRTC Signaling 메시지 처리
             elif message_data.get("type") == "screen_share_started":
@@ -626,7 +810,7 @@ async def websocket_endpoint(websocket: WebSocket, lecture_id: int, token: str =
                     "lectureId": lecture_id,
                     "timestamp": datetime.now().isoformat()
                 }
-                await manager.broadcast_to_lecture(json.dumps(signaling_message), lecture_id)
+                await manager.broadcast_to_lecture(signaling_message, lecture_id)
                 
             elif message_data.get("type") == "screen_share_stopped":
                 # 강사가 화면 공유를 중지했을 때
@@ -638,7 +822,7 @@ async def websocket_endpoint(websocket: WebSocket, lecture_id: int, token: str =
                     "lectureId": lecture_id,
                     "timestamp": datetime.now().isoformat()
                 }
-                await manager.broadcast_to_lecture(json.dumps(signaling_message), lecture_id)
+                await manager.broadcast_to_lecture(signaling_message, lecture_id)
                 
             elif message_data.get("type") == "request_connection":
                 # 학생이 강사에게 연결을 요청할 때
@@ -653,7 +837,7 @@ async def websocket_endpoint(websocket: WebSocket, lecture_id: int, token: str =
                     "timestamp": datetime.now().isoformat()
                 }
                 if target_instructor_id:
-                    await manager.send_to_user(json.dumps(connection_request), target_instructor_id, lecture_id)
+                    await manager.send_to_user(connection_request, target_instructor_id, lecture_id)
                 
             elif message_data.get("type") == "offer":
                 # WebRTC Offer 전달
@@ -670,7 +854,7 @@ async def websocket_endpoint(websocket: WebSocket, lecture_id: int, token: str =
                 }
                 # 특정 대상에게만 전달
                 if target_peer_id:
-                    await manager.send_to_user(json.dumps(offer_message), target_peer_id, lecture_id)
+                    await manager.send_to_user(offer_message, target_peer_id, lecture_id)
                     
             elif message_data.get("type") == "answer":
                 # WebRTC Answer 전달
@@ -687,7 +871,7 @@ async def websocket_endpoint(websocket: WebSocket, lecture_id: int, token: str =
                 }
                 # 특정 대상에게만 전달
                 if target_peer_id:
-                    await manager.send_to_user(json.dumps(answer_message), target_peer_id, lecture_id)
+                    await manager.send_to_user(answer_message, target_peer_id, lecture_id)
                     
             elif message_data.get("type") == "ice-candidate":
                 # ICE Candidate 전달
@@ -704,17 +888,16 @@ async def websocket_endpoint(websocket: WebSocket, lecture_id: int, token: str =
                 }
                 # 특정 대상에게만 전달
                 if target_peer_id:
-                    await manager.send_to_user(json.dumps(candidate_message), target_peer_id, lecture_id)
+                    await manager.send_to_user(candidate_message, target_peer_id, lecture_id)
             
             else:
                 logger.warning(f"⚠️ [채팅] 알 수 없는 메시지 타입 - type: {message_type}, user_id: {user_id}")
     
     except WebSocketDisconnect:
         logger.info(f"🔌 [채팅] WebSocket 정상 연결 해제 - user_id: {user_id}, lecture_id: {lecture_id}")
-        manager.disconnect(websocket)
-        # 퇴장 메시지 브로드캐스트
-        if websocket in manager.connection_info:
-            info = manager.connection_info[websocket]
+        # 퇴장 메시지 브로드캐스트 (참가자 leave delta는 disconnect에서 전송)
+        info = manager.disconnect(websocket)
+        if info:
             leave_message = {
                 "type": "user_left",
                 "username": info["username"],
@@ -722,17 +905,7 @@ async def websocket_endpoint(websocket: WebSocket, lecture_id: int, token: str =
                 "timestamp": datetime.now().isoformat()
             }
             logger.info(f"📢 [채팅] 퇴장 메시지 브로드캐스트 - username: {info['username']}")
-            await manager.broadcast_to_lecture(json.dumps(leave_message), lecture_id)
-            
-            # 업데이트된 참여자 목록 브로드캐스트
-            participants = manager.get_participants(lecture_id)
-            participants_update = {
-                "type": "participants_update",
-                "participants": participants,
-                "timestamp": datetime.now().isoformat()
-            }
-            logger.info(f"👥 [채팅] 참가자 목록 업데이트 브로드캐스트 - 남은 참가자: {len(participants)}명")
-            await manager.broadcast_to_lecture(json.dumps(participants_update), lecture_id)
+            await manager.broadcast_to_lecture(leave_message, lecture_id)
     except Exception as e:
         logger.error(f"💥 [채팅] WebSocket 예외 오류 - error: {e}, type: {type(e)}")
         import traceback
@@ -747,6 +920,11 @@ async def websocket_endpoint(websocket: WebSocket, lecture_id: int, token: str =
         stats = manager.get_connection_stats()
         logger.info(f"📊 [채팅] 현재 연결 통계 - 총 연결: {stats['total_connections']}, 활성 강의: {stats['active_lectures']}")
 
+@router.get("/ws/shard/{lecture_id}")
+async def get_lecture_shard(lecture_id: int):
+    """강의를 담당하는 샤드 조회 (디버깅용 - 클라이언트는 같은 주소로 접속하면 프론트 리스너가 넘겨줌)"""
+    return shard_router.shard_info(lecture_id)
+
 # 연결 상태 조회 엔드포인트 (디버깅용)
 @router.get("/ws/chat/stats")
 async def get_chat_stats():
@@ -774,32 +952,76 @@ async def get_chat_debug_info():
 @router.get("/api/chat/{lecture_id}/history")
 async def get_chat_history(
     lecture_id: int,
-    session: AsyncSession = Depends(get_db),
-    limit: int = 50
+    session: AsyncSession = Depends(get_read_db),
+    limit: int = 50,
+    before_id: int = Query(None),
+    current_user = Depends(get_current_user)
 ):
-    """강의 채팅 기록 조회"""
-    statement = (
-        select(ChatMessage, User.username)
-        .join(User)
-        .where(ChatMessage.lecture_id == lecture_id)
-        .order_by(ChatMessage.created_at.desc())
-        .limit(limit)
+    """
+    강의 채팅 기록 조회 - (lecture_id, id) 커서 페이지네이션, 최신 구간은 tail 캐시에서 제공
+    강사와 참석자만 볼 수 있고, 귓속말(is_private)은 작성자와 강사에게만 보입니다.
+    """
+    limit = max(1, min(limit, settings.chat_history_max_limit))
+    
+    capacity = await get_lecture_capacity(session, lecture_id)
+    if capacity is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="강의를 찾을 수 없습니다."
+        )
+    instructor_id = capacity[1]
+    if current_user.id != instructor_id and not await is_lecture_participant(session, lecture_id, current_user.id):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="강의 참석자만 채팅 기록을 볼 수 있습니다."
+        )
+    
+    # 강사는 모든 메시지, 그 외에는 공개 메시지와 본인이 쓴 귓속말만
+    visible = None if current_user.id == instructor_id else (
+        lambda row: not row["is_private"] or row["user_id"] == current_user.id
     )
     
-    results = await session.execute(statement)
+    # tail 캐시는 채팅 저장이 일어나는 소유 샤드에서만 최신 상태이므로 다른 샤드는 DB에서 읽음
+    use_cache = shard_router.owns(lecture_id)
+    cached = chat_tail_cache.page(lecture_id, before_id, limit, visible) if use_cache else None
+    if cached is None and use_cache and before_id is None:
+        # 첫 페이지는 캐시를 채울 만큼 (귓속말 포함) 읽어 이후 요청을 DB 없이 처리
+        statement = (
+            select(ChatMessage)
+            .where(ChatMessage.lecture_id == lecture_id)
+            .order_by(ChatMessage.id.desc())
+            .limit(chat_tail_cache.capacity + 1)
+        )
+        results = await session.exec(statement)
+        rows = [chat_message.model_dump() for chat_message in results.all()]
+        complete = len(rows) <= chat_tail_cache.capacity
+        chat_tail_cache.prime(lecture_id, list(reversed(rows[:chat_tail_cache.capacity])), complete=complete)
+        cached = chat_tail_cache.page(lecture_id, None, limit, visible)
+    if cached is not None:
+        messages = [serialize_chat_row(row) for row in cached]
+        return {
+            "messages": messages,
+            "next_before_id": messages[0]["id"] if len(messages) == limit else None,
+            "cached": True
+        }
     
-    messages = []
-    for chat_message, username in results:
-        messages.append({
-            "id": chat_message.id,
-            "user_id": chat_message.user_id,
-            "username": username,
-            "message": chat_message.message,
-            "is_private": chat_message.is_private,
-            "created_at": chat_message.created_at.isoformat()
-        })
+    statement = select(ChatMessage).where(ChatMessage.lecture_id == lecture_id)
+    if visible is not None:
+        statement = statement.where(or_(ChatMessage.is_private == False, ChatMessage.user_id == current_user.id))
+    if before_id is not None:
+        statement = statement.where(ChatMessage.id < before_id)
+    statement = statement.order_by(ChatMessage.id.desc()).limit(limit + 1)
+    
+    results = await session.exec(statement)
+    rows = [chat_message.model_dump() for chat_message in results.all()]
+    has_more = len(rows) > limit
     
-    return {"messages": list(reversed(messages))}
+    messages = [serialize_chat_row(row) for row in reversed(rows[:limit])]
+    return {
+        "messages": messages,
+        "next_before_id": messages[0]["id"] if messages and has_more else None,
+        "cached": False
+    }
 
 @router.get("/api/lectures/{lecture_id}/participants")
 async def get_lecture_participants(lecture_id: int):
@@ -808,8 +1030,17 @@ async def get_lecture_participants(lecture_id: int):
     return {"participants": participants}
 
 @router.websocket("/ws/stt/{lecture_id}")
-async def stt_websocket_endpoint(websocket: WebSocket, lecture_id: int, token: str = Query(None)):
+async def stt_websocket_endpoint(
+    websocket: WebSocket,
+    lecture_id: int,
+    token: str = Query(None),
+    encoding: str = Query(None)
+):
     """STT WebSocket 엔드포인트"""
+    if not shard_router.owns(lecture_id):
+        await reject_connection(websocket, WRONG_SHARD_CLOSE_CODE, shard_router.wrong_shard_reason(lecture_id))
+        return
+    
     # 웹소켓 연결 수락
     await websocket.accept()
     logger.info(f"🔌 [STT] 새 WebSocket 연결 수락 - lecture_id: {lecture_id}")
@@ -874,37 +1105,50 @@ async def stt_websocket_endpoint(websocket: WebSocket, lecture_id: int, token: s
                 await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
                 return
             
-            # 동기 세션으로 사용자 정보 조회
-            from sqlmodel import Session, create_engine
-            from ..db.database import DATABASE_URL
-            
-            sync_db_url = DATABASE_URL.replace("sqlite+aiosqlite://", "sqlite://")
-            sync_engine = create_engine(sync_db_url)
-            
-            with Session(sync_engine) as session:
-                user = session.get(User, user_id)
-                if not user:
-                    logger.error(f"❌ [STT] 사용자 없음 - user_id: {user_id}, lecture_id: {lecture_id}")
-                    await websocket.send_text(json.dumps({
-                        "type": "auth_response",
-                        "status": "error",
-                        "message": "사용자를 찾을 수 없습니다."
-                    }))
-                    await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
-                    return
-                
-                username = user.username
+            # 공유 async 엔진 기반 사용자 캐시로 조회 (연결마다 엔진/풀 생성 안 함)
+            user = await principal_cache.get(user_id)
+            if not user:
+                logger.error(f"❌ [STT] 사용자 없음 - user_id: {user_id}, lecture_id: {lecture_id}")
+                await websocket.send_text(json.dumps({
+                    "type": "auth_response",
+                    "status": "error",
+                    "message": "사용자를 찾을 수 없습니다."
+                }))
+                await websocket.close(code=status.WS_1008_POLICY_VIOLATION)
+                return
             
-            # 인증 성공 응답
-            await websocket.send_text(json.dumps({
-                "type": "auth_response",
-                "status": "success",
-                "message": "인증에 성공했습니다."
-            }))
-            logger.info(f"✅ [STT] 인증 성공 - user_id: {user_id}, username: {username}, lecture_id: {lecture_id}")
+            username = user.username
             
-            # STT 연결 관리자에 연결
-            await stt_manager.connect_without_accept(websocket, lecture_id, user_id, username)
+            # 라이브 레지스트리 기준 정원 확인
+            rejection = await admission_controller.admit(lecture_id, user_id, lambda: stt_manager.get_user_ids(lecture_id))
+            if rejection:
+                await websocket.send_text(json.dumps({
+                    "type": "auth_response",
+                    "status": "error",
+                    "message": rejection
+                }))
+                await reject_connection(websocket, 1013, rejection)
+                return
+            
+            # 레지스트리에 등록되면(또는 실패하면) 예약한 자리 해제
+            try:
+                # 인증 성공 응답
+                await websocket.send_text(json.dumps({
+                    "type": "auth_response",
+                    "status": "success",
+                    "message": "인증에 성공했습니다."
+                }))
+                logger.info(f"✅ [STT] 인증 성공 - user_id: {user_id}, username: {username}, lecture_id: {lecture_id}")
+                
+                # STT 연결 관리자에 연결 (인코딩 협상 포함)
+                # 협상 결과는 heartbeat 등록 전에 보내 ping과 동시에 소켓에 쓰지 않도록 함
+                negotiated_encoding = negotiate_encoding(encoding)
+                if encoding:
+                    deflate = settings.ws_per_message_deflate and is_deflate_offered(websocket)
+                    await websocket.send_text(encoding_ack(negotiated_encoding, deflate))
+                await stt_manager.connect_without_accept(websocket, lecture_id, user_id, username, negotiated_encoding)
+            finally:
+                admission_controller.release(lecture_id, user_id)
             
             try:
                 # WebSocket에서 메시지 받기 
@@ -912,6 +1156,19 @@ async def stt_websocket_endpoint(websocket: WebSocket, lecture_id: int, token: s
                     try:
                         # 메시지 수신 대기
                         message = await websocket.receive()
+                        heartbeat_scheduler.touch(websocket)
+                        
+                        # 디코딩/리샘플링 전에 속도/크기 제한
+                        frame = message.get("bytes") or message.get("text")
+                        if frame is not None:
+                            throttled = stt_rate_limiter.check(websocket, lecture_id, len(frame))
+                            if throttled == OVERSIZED:
+                                logger.warning(f"🚫 [STT] 너무 큰 프레임으로 연결 종료 - user_id: {user_id}, 크기: {len(frame)}")
+                                await websocket.close(code=1009, reason="프레임이 너무 큽니다")
+                                break
+                            if throttled:
+                                logger.debug(f"⏳ [STT] 프레임 속도 제한 - user_id: {user_id}, 범위: {throttled}")
+                                continue
                         
                         # 바이너리 메시지 처리 (오디오 데이터)
                         if "bytes" in message:
@@ -956,6 +1213,10 @@ async def stt_websocket_endpoint(websocket: WebSocket, lecture_id: int, token: s
                     except json.JSONDecodeError as e:
                         logger.error(f"❌ [STT] JSON 파싱 오류: {e}")
                         continue
+                    except RuntimeError as e:
+                        # 이미 닫힌 연결 (heartbeat 정리 등)
+                        logger.info(f"🔌 [STT] 닫힌 연결에서 수신 중단 - lecture_id: {lecture_id}, user_id: {user_id}, 사유: {e}")
+                        break
                     except Exception as e:
                         logger.error(f"❌ [STT] 메시지 처리 오류: {e}")
                         continue
@@ -991,7 +1252,10 @@ async def get_stt_stats():
     stats = {
         "total_stt_connections": total_connections,
         "active_stt_lectures": active_lectures,
-        "stt_lecture_details": {}
+        "stt_lecture_details": {},
+        "encoding_stats": event_encoder.get_stats(),
+        "rate_limit": stt_rate_limiter.get_stats(),
+        "admission": admission_controller.get_stats()
     }
     
     for lecture_id, connections in stt_manager.active_connections.items():
@@ -132,14 +132,29 @@ export default function LiveLectureRoom({
     lectureId
   });
 
+  // 채팅 리플레이 순번 (재접속 시 since로 전달)
+  const lastSeqRef = useRef<number | null>(null);
+
+  const toChatMessage = (data: any): ChatMessage => ({
+    id: data.seq !== undefined ? `seq-${data.seq}` : Date.now().toString(),
+    userId: data.userId,
+    username: data.username,
+    message: data.message,
+    timestamp: new Date(data.timestamp),
+    type: 'text'
+  });
+
   // 채팅 WebSocket 연결
   useEffect(() => {
     const connectWebSocket = () => {
       // 토큰 가져오기
       const token = localStorage.getItem('token');
-      const wsUrl = token 
-        ? `ws://localhost:8000/ws/chat/${lectureId}?token=${encodeURIComponent(token)}`
-        : `ws://localhost:8000/ws/chat/${lectureId}`;
+      const params = new URLSearchParams();
+      if (token) params.set('token', token);
+      // 재접속 시 마지막으로 받은 순번 이후의 메시지만 리플레이 요청
+      if (lastSeqRef.current !== null) params.set('since', String(lastSeqRef.current));
+      const query = params.toString();
+      const wsUrl = `ws://localhost:8000/ws/chat/${lectureId}${query ? `?${query}` : ''}`;
       
       const websocket = new WebSocket(wsUrl);
       
@@ -150,16 +165,26 @@ export default function LiveLectureRoom({
       
       websocket.onmessage = (event) => {
         const data = JSON.parse(event.data);
+        if (data.type === 'ping') {
+          websocket.send(JSON.stringify({ type: 'pong' }));
+          return;
+        }
+        if (data.type === 'replay') {
+          // 입장/재접속 시 서버 리플레이 버퍼의 최근 채팅
+          const replayed: ChatMessage[] = data.events
+            .filter((e: any) => e.type === 'chat_message')
+            .map((e: any) => toChatMessage(e));
+          if (replayed.length > 0) {
+            setChatMessages(prev => [...prev, ...replayed]);
+          }
+          lastSeqRef.current = data.last_seq;
+          return;
+        }
         if (data.type === 'chat_message') {
-          const newMsg: ChatMessage = {
-            id: Date.now().toString(),
-            userId: data.userId,
-            username: data.username,
-            message: data.message,
-            timestamp: new Date(data.timestamp),
-            type: 'text'
-          };
-          setChatMessages(prev => [...prev, newMsg]);
+          setChatMessages(prev => [...prev, toChatMessage(data)]);
+        }
+        if (typeof data.seq === 'number') {
+          lastSeqRef.current = data.seq;
         }
       };
       
@@ -232,6 +257,10 @@ export default function LiveLectureRoom({
       try {
         if (typeof event.data === 'string') {
           const data = JSON.parse(event.data);
+          if (data.type === 'ping') {
+            ws.send(JSON.stringify({ type: 'pong' }));
+            return;
+          }
           
           // 인증 응답 처리
           if (data.type === 'auth_response') {
@@ -327,6 +356,10 @@ export default function LiveLectureRoom({
         
         try {
           const data = JSON.parse(event.data);
+          if (data.type === 'ping') {
+            subtitleWs.send(JSON.stringify({ type: 'pong' }));
+            return;
+          }
           console.log('📺 *** 파싱된 자막 데이터 ***:', {
             messageNumber: subtitleMessageCount,
             type: data.type,
@@ -386,8 +419,6 @@ export default function LiveLectureRoom({
                 timestamp: new Date().toISOString()
               });
             }
-          } else if (data.type === 'ping') {
-            console.log('🏓 자막 WebSocket ping 수신:', subtitleMessageCount);
           } else {
             console.log('❓ *** 알 수 없는 메시지 타입 ***:', {
               messageNumber: subtitleMessageCount,
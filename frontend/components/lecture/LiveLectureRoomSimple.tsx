@@ -122,6 +122,10 @@ export default function LiveLectureRoomSimple({
       
       websocket.onmessage = (event) => {
         const data = JSON.parse(event.data);
+        if (data.type === 'ping') {
+          websocket.send(JSON.stringify({ type: 'pong' }));
+          return;
+        }
         if (data.type === 'chat_message') {
           const newMsg: ChatMessage = {
             id: Date.now().toString(),
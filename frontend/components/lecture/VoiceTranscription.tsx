@@ -9,7 +9,7 @@ interface VoiceTranscriptionProps {
 }
 
 interface TranscriptionMessage {
-  type: 'realtime' | 'fullSentence' | 'auth' | 'auth_response';
+  type: 'realtime' | 'fullSentence' | 'auth' | 'auth_response' | 'ping';
   text?: string;
   status?: string;
   message?: string;
@@ -70,6 +70,10 @@ export default function VoiceTranscription({ lectureId, className = '' }: VoiceT
       socketRef.current.onmessage = (event) => {
         try {
           const data: TranscriptionMessage = JSON.parse(event.data);
+          if (data.type === 'ping') {
+            socketRef.current?.send(JSON.stringify({ type: 'pong' }));
+            return;
+          }
           
           // 인증 응답 처리
           if (data.type === 'auth_response') {
@@ -22,6 +22,9 @@ export function useWebRTC({ wsConnection, isInstructor, lectureId }: UseWebRTCPr
   const [remoteStreams, setRemoteStreams] = useState<Map<string, MediaStream>>(new Map());
   const [isScreenSharing, setIsScreenSharing] = useState(false);
   const peerConnections = useRef<Map<string, PeerConnection>>(new Map());
+  // 참가자 목록 버전 (participants_delta 누락 감지용)과 내 user_id
+  const participantVersion = useRef<number | null>(null);
+  const selfUserId = useRef<number | null>(null);
 
   // webrtc-adapter 정보 로그
   useEffect(() => {
@@ -326,12 +329,15 @@ export function useWebRTC({ wsConnection, isInstructor, lectureId }: UseWebRTCPr
           }
           break;
 
-        case 'participants_update':
-          // 강사: 새 참가자가 들어왔고 화면 공유 중이면 offer 생성
+        case 'participants_snapshot':
+          // 전체 참가자 목록 (입장 시 또는 버전 누락 후 재요청)
+          participantVersion.current = data.version;
+          selfUserId.current = data.currentUserId;
+          // 강사: 화면 공유 중이면 아직 연결되지 않은 참가자에게 offer 생성
           if (isInstructor && isScreenSharing && data.participants) {
             const newParticipants = data.participants.filter((p: any) => !peerConnections.current.has(p.user_id));
             for (const participant of newParticipants) {
-              if (participant.user_id !== data.currentUserId) { // 자기 자신 제외
+              if (participant.user_id !== selfUserId.current) { // 자기 자신 제외
                 console.log('New participant joined, creating offer:', participant.user_id);
                 await createOffer(participant.user_id);
               }
@@ -339,6 +345,30 @@ export function useWebRTC({ wsConnection, isInstructor, lectureId }: UseWebRTCPr
           }
           break;
 
+        case 'participants_delta':
+          // 이미 반영된 버전은 무시, 버전이 건너뛰면 전체 목록 재요청
+          if (participantVersion.current === null || data.version <= participantVersion.current) {
+            break;
+          }
+          if (data.version !== participantVersion.current + 1) {
+            console.log('Participant version gap, requesting snapshot:', participantVersion.current, '->', data.version);
+            wsConnection.send(JSON.stringify({ type: 'participants_snapshot' }));
+            break;
+          }
+          participantVersion.current = data.version;
+
+          if (data.op === 'join') {
+            // 강사: 새 참가자가 들어왔고 화면 공유 중이면 offer 생성
+            const peerId = data.participant.user_id;
+            if (isInstructor && isScreenSharing && peerId !== selfUserId.current && !peerConnections.current.has(peerId)) {
+              console.log('New participant joined, creating offer:', peerId);
+              await createOffer(peerId);
+            }
+          } else if (data.op === 'leave') {
+            cleanupPeerConnection(data.participant.user_id);
+          }
+          break;
+
         case 'offer':
           // 학생: offer를 받았을 때 answer 생성
           if (!isInstructor && data.offer && data.fromPeerId) {